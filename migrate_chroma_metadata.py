@@ -0,0 +1,105 @@
+# python migrate_chroma_metadata.py
+"""
+Script para migrar os metadados do ChromaDB para IDs inteiros.
+
+Versões antigas gravavam `user_id` e `chat_id` como string nos metadados
+da coleção `messages`. O MemoryManager agora grava e filtra esses campos
+como inteiros, então registros antigos deixam de aparecer nas buscas até
+serem convertidos por este script.
+
+Uso:
+    python migrate_chroma_metadata.py [--dry-run]
+
+    --dry-run: Apenas conta os registros que seriam convertidos
+"""
+import os
+import sys
+import logging
+import argparse
+
+# Configuração de logging
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('migrate_chroma_metadata')
+
+INT_KEYS = ("user_id", "chat_id")
+BATCH_SIZE = 500
+
+
+def convert_metadata(metadata):
+    """
+    Converte os campos de ID de um metadado para inteiro.
+
+    Args:
+        metadata (dict): Metadado original
+
+    Returns:
+        dict | None: Metadado convertido, ou None se nada mudou
+    """
+    if not metadata:
+        return None
+
+    changed = False
+    converted = dict(metadata)
+    for key in INT_KEYS:
+        value = converted.get(key)
+        if isinstance(value, str) and value.lstrip("-").isdigit():
+            converted[key] = int(value)
+            changed = True
+
+    return converted if changed else None
+
+
+def migrate(dry_run=False, persist_directory="./data/chroma_db"):
+    """
+    Converte `user_id`/`chat_id` de string para inteiro na coleção `messages`.
+
+    Args:
+        dry_run (bool): Se True, não grava nada
+        persist_directory (str): Diretório do ChromaDB
+
+    Returns:
+        int: Número de registros convertidos (ou a converter, em dry-run)
+    """
+    from src.bot.memory.chroma_manager import ChromaManager
+
+    collection = ChromaManager(persist_directory).get_or_create_collection("messages")
+    results = collection.get(include=["metadatas"])
+
+    ids, metadatas = [], []
+    for doc_id, metadata in zip(results["ids"], results["metadatas"]):
+        converted = convert_metadata(metadata)
+        if converted is not None:
+            ids.append(doc_id)
+            metadatas.append(converted)
+
+    logger.info(f"🔍 {len(ids)} de {len(results['ids'])} registros com IDs em string")
+
+    if dry_run or not ids:
+        return len(ids)
+
+    for start in range(0, len(ids), BATCH_SIZE):
+        collection.update(
+            ids=ids[start:start + BATCH_SIZE],
+            metadatas=metadatas[start:start + BATCH_SIZE]
+        )
+        logger.info(f"✅ Convertidos {min(start + BATCH_SIZE, len(ids))}/{len(ids)}")
+
+    return len(ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migra metadados do ChromaDB para IDs inteiros")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas conta os registros a converter")
+    args = parser.parse_args()
+
+    try:
+        # Adiciona o diretório do projeto ao path
+        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+        total = migrate(dry_run=args.dry_run)
+        print(f"\n✨ Migração concluída: {total} registros {'a converter' if args.dry_run else 'convertidos'}")
+    except KeyboardInterrupt:
+        print("\n\n❌ Operação cancelada pelo usuário.")
+    except Exception as e:
+        print(f"\n\n❌ Erro fatal: {str(e)}")
@@ -27,6 +27,9 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('repair_memory')
 
+# Número de mensagens reprocessadas por lote
+BATCH_SIZE = 100
+
 def print_progress_bar(iteration, total, prefix='', suffix='', length=50, fill='█'):
     """Imprime uma barra de progresso no terminal"""
     percent = ("{0:.1f}").format(100 * (iteration / float(total)))
@@ -322,31 +325,19 @@ def repair_memory(force_rebuild=False):
     # Inicializar barra de progresso
     print_progress_bar(0, total_messages, prefix='Progresso:', suffix='Completo', length=40)
     
-    # Processar mensagens
-    for i, msg in enumerate(messages):
+    # Processar mensagens em lotes (uma transação SQLite e um add no ChromaDB por lote)
+    for start in range(0, total_messages, BATCH_SIZE):
+        batch = messages[start:start + BATCH_SIZE]
         try:
-            # Aplica valores padrão para campos nulos
-            if msg["category"] is None:
-                msg["category"] = "geral"
-            if msg["importance"] is None:
-                msg["importance"] = 3
-                
-            memory.add_message_sync(
-                user_id=msg["user_id"],
-                chat_id=msg["chat_id"],
-                content=msg["content"],
-                role=msg["role"],
-                category=msg["category"],
-                importance=msg["importance"]
-            )
-            count += 1
-            
+            ids = memory.add_messages_batch_sync(batch)
+            count += len(ids)
+            errors += len(batch) - len(ids)
         except Exception as e:
-            errors += 1
-            logger.error(f"❌ Erro na mensagem {i+1}: {str(e)[:100]}...")
+            errors += len(batch)
+            logger.error(f"❌ Erro no lote {start + 1}-{start + len(batch)}: {str(e)[:100]}...")
         
         # Atualiza a barra de progresso
-        print_progress_bar(i + 1, total_messages, 
+        print_progress_bar(start + len(batch), total_messages, 
                          prefix='Progresso:', 
                          suffix=f'Completo ({count} ok, {errors} erros)', 
                          length=40)
@@ -0,0 +1,59 @@
+# python scripts/freeze_config.py
+"""
+Congela as variáveis do .env em src/config/_configdata.py.
+
+Com o arquivo gerado, o config.py não precisa abrir e parsear o .env a cada
+inicialização: os valores vêm de um módulo Python já compilado (.pyc).
+Se o .env for alterado depois, ele fica mais novo que o arquivo congelado e
+o config.py volta a ler o .env até este script ser rodado de novo.
+
+O arquivo gerado contém as mesmas chaves do .env e não deve ser versionado.
+
+Uso:
+    python scripts/freeze_config.py [--env CAMINHO_DO_ENV]
+"""
+import argparse
+import pprint
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+ENV_FILE = BASE_DIR / ".env"
+OUTPUT_FILE = BASE_DIR / "src" / "config" / "_configdata.py"
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.config import _fastenv
+
+
+def freeze(env_file=ENV_FILE, output_file=OUTPUT_FILE):
+    """
+    Gera o módulo com as variáveis do .env.
+
+    Args:
+        env_file (Path): Arquivo .env de origem
+        output_file (Path): Módulo Python a ser gerado
+
+    Returns:
+        int: Número de variáveis congeladas
+    """
+    # Mesmo leitor usado pelo config.py: o congelado bate com o .env lido em execução
+    values = _fastenv.parse(Path(env_file).read_text(encoding="utf-8"))
+
+    tmp_file = Path(output_file).with_suffix(".tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write("# Gerado por scripts/freeze_config.py - não editar nem versionar\n")
+        f.write(f"build_time_vars = {pprint.pformat(values, indent=4)}\n")
+    tmp_file.replace(output_file)
+
+    return len(values)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Congela o .env em src/config/_configdata.py")
+    parser.add_argument("--env", default=str(ENV_FILE), help="Caminho do arquivo .env")
+    args = parser.parse_args()
+
+    total = freeze(Path(args.env))
+    print(f"✅ {total} variáveis congeladas em {OUTPUT_FILE}")
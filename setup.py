@@ -6,6 +6,7 @@ setup(
     version="0.1",
     packages=find_packages("src"),
     package_dir={"": "src"},
+    package_data={"config": ["prompts/*.txt"]},
     python_requires=">=3.8",
     test_suite="tests"
 )
\ No newline at end of file
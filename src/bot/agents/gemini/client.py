@@ -8,7 +8,7 @@ oferecendo funcionalidades como processamento de texto, gerenciamento de chat
 e configuração flexível.
 
 Attributes:
-    load_dotenv: Carrega variáveis de ambiente do arquivo .env
+    load_env: Carrega variáveis de ambiente do arquivo .env
 
 Example:
     >>> from src.bot.agents.gemini import GeminiClient
@@ -18,12 +18,13 @@ Example:
 
 import os
 import time
+import asyncio
 import google.generativeai as genai
-from dotenv import load_dotenv
+from src.config.config import load_env
 from .config import GeminiConfig  # Importa do mesmo diretório
 
-# Carrega as variáveis de ambiente do arquivo .env
-load_dotenv()
+# Carrega as variáveis de ambiente do arquivo .env (uma vez por processo)
+load_env()
 
 
 class GeminiClient:
@@ -186,6 +187,37 @@ class GeminiClient:
         print("\nArquivo processado e ativo!")
         return current_file
 
+    async def wait_for_file_active_async(self, file, polling_interval=10):
+        """
+        Versão assíncrona de wait_for_file_active.
+
+        A consulta de estado roda numa thread e a espera usa asyncio.sleep,
+        então vários arquivos podem aguardar o processamento ao mesmo tempo.
+
+        Args:
+            file: Objeto retornado pelo upload
+            polling_interval: Intervalo entre as verificações (em segundos)
+            
+        Returns:
+            O objeto de arquivo atualizado quando estiver ativo
+        """
+        print(f"Aguardando o processamento do arquivo: {file.display_name}")
+        current_file = await asyncio.to_thread(genai.get_file, file.name)
+        
+        while current_file.state.name == "PROCESSING":
+            print(".", end="", flush=True)
+            await asyncio.sleep(polling_interval)
+            current_file = await asyncio.to_thread(genai.get_file, file.name)
+            
+        if current_file.state.name != "ACTIVE":
+            raise Exception(
+                f"O arquivo {file.name} falhou ao processar "
+                f"(estado: {current_file.state.name})."
+            )
+            
+        print(f"\nArquivo {file.display_name} processado e ativo!")
+        return current_file
+
     def start_chat_session(self, history=None):
         """
         Inicia uma nova sessão de chat com histórico opcional.
@@ -217,13 +249,35 @@ class GeminiClient:
         Returns:
             Resposta do modelo
         """
+        self._validate_message(message)
+        return chat_session.send_message(message)
+
+    async def send_message_async(self, chat_session, message):
+        """
+        Versão assíncrona de send_message (API async do SDK).
+
+        Permite disparar várias mensagens em paralelo com asyncio.gather,
+        desde que cada uma use sua própria sessão de chat (o histórico de
+        uma sessão só avança uma mensagem por vez).
+
+        Args:
+            chat_session: Objeto da sessão de chat
+            message: Mensagem a ser enviada
+            
+        Returns:
+            Resposta do modelo
+        """
+        self._validate_message(message)
+        return await chat_session.send_message_async(message)
+
+    @staticmethod
+    def _validate_message(message):
+        """Rejeita mensagens vazias ou que não sejam texto."""
         if not message or not isinstance(message, str):
             raise ValueError(f"Mensagem inválida. Recebido: {repr(message)}")
         
         if not message.strip():
             raise ValueError("A mensagem não pode estar vazia")
-            
-        return chat_session.send_message(message)
 
     @staticmethod
     def token_cost(response):
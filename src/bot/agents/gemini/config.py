@@ -11,17 +11,18 @@ Example:
     >>> print(config.to_dict())
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Optional, Dict, Any
 
 
-@dataclass
+@dataclass(frozen=True)
 class GeminiConfig:
     """
     Classe para gerenciar a configuração do cliente Gemini.
 
     Esta classe utiliza dataclasses para definir e validar os parâmetros
-    de configuração do modelo Gemini.
+    de configuração do modelo Gemini. As instâncias são imutáveis (e
+    hasháveis): para mudar um parâmetro, use with_changes.
 
     Args:
         temperature (float): Controla a aleatoriedade das respostas (0.0 a 1.0)
@@ -85,6 +86,18 @@ class GeminiConfig:
             "response_mime_type": self.response_mime_type
         }
 
+    def with_changes(self, **changes) -> 'GeminiConfig':
+        """
+        Cria uma cópia com alguns parâmetros alterados (validada de novo).
+        
+        Args:
+            **changes: Parâmetros a alterar (ex: temperature=0.5)
+            
+        Returns:
+            GeminiConfig: Nova instância configurada
+        """
+        return replace(self, **changes)
+
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'GeminiConfig':
         """
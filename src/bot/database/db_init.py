@@ -11,12 +11,53 @@ import sqlite3
 import os
 from datetime import datetime
 import logging
+import threading
+import weakref
 from contextlib import contextmanager
 from src.config.config import Config
 
 # Configura o logger para o módulo de banco de dados
 logger = logging.getLogger(__name__)
 
+# PRAGMAs aplicados a cada conexão (o journal_mode=WAL fica no arquivo: initialize_db).
+# O cache de páginas é por conexão, e há uma conexão por thread: 8 MB cada
+_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-8192;
+PRAGMA mmap_size=268435456;
+"""
+
+# Triggers que mantêm messages_fts em sincronia com messages (initialize_db)
+_FTS_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF content ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+)
+
+
+class _ThreadConnection:
+    """Guarda a conexão de uma thread; quando a thread termina, é coletado e a conexão fechada."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _close_connection(conn: sqlite3.Connection, connections: list, lock: threading.Lock):
+    """Fecha a conexão de uma thread encerrada e a tira da lista do Database."""
+    with lock:
+        if conn in connections:
+            connections.remove(conn)
+    conn.close()
+
+
 class Database:
     """
     Classe para gerenciar conexões e operações no banco de dados SQLite.
@@ -31,16 +72,46 @@ class Database:
 
         Parâmetros:
             db_name (str): Nome do arquivo do banco de dados. O padrão é Config.DB_NAME.
+                ':memory:' cria um banco só em memória (para testes), visível
+                apenas na thread que criou o Database.
         """
         self.db_name = db_name
+        # Uma conexão por thread, aberta (e com os PRAGMAs aplicados) uma única vez
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
         self.initialize_db()  # Garante que a estrutura do banco esteja criada
         logger.info(f"Database inicializado: {db_name}")
     
-    # Em src/bot/database/db_init.py, método connect():
+    def _get_connection(self) -> sqlite3.Connection:
+        """Retorna a conexão desta thread, abrindo-a na primeira chamada."""
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            conn = sqlite3.connect(self.db_name, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            # Por conexão: com WAL, NORMAL faz um fsync por checkpoint em vez de
+            # dois por commit; temporários e cache de páginas ficam em memória e
+            # as leituras usam mmap (até 256 MB) em vez de read()
+            conn.executescript(_PRAGMAS)
+            holder = _ThreadConnection(conn)
+            # Ao fim da thread o threading.local descarta o holder e a conexão
+            # é fechada, em vez de ficar aberta (com seu cache) até o close()
+            weakref.finalize(holder, _close_connection, conn, self._connections, self._connections_lock)
+            self._local.holder = holder
+            with self._connections_lock:
+                self._connections.append(conn)
+            logger.debug(f"Conexão aberta: {self.db_name}")
+        return holder.conn
+
     @contextmanager
     def connect(self):
-        conn = sqlite3.connect(self.db_name, check_same_thread=False)  # Adicione esse parâmetro aqui
-        conn.row_factory = sqlite3.Row
+        """
+        Transação na conexão desta thread: commit no fim, rollback em erro.
+
+        A conexão é reaproveitada entre chamadas (sem o custo de abrir o
+        arquivo e reaplicar os PRAGMAs a cada query); use close() para fechá-las.
+        """
+        conn = self._get_connection()
         try:
             yield conn
             conn.commit()
@@ -49,9 +120,16 @@ class Database:
             conn.rollback()
             logger.error(f"Erro na transação, realizando rollback: {e}")
             raise
-        finally:
+
+    def close(self):
+        """Fecha as conexões abertas por todas as threads."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
             conn.close()
-            logger.debug("Conexão fechada")
+        self._local = threading.local()
+        logger.debug("Conexões fechadas")
 
     def execute_query(self, query: str, params: tuple = ()):
         """
@@ -76,11 +154,32 @@ class Database:
             # Se for INSERT/UPDATE/DELETE, retorna o número de linhas afetadas
             return cursor.rowcount
 
+    def execute_many(self, query: str, params_seq) -> int:
+        """
+        Executa a mesma query para vários conjuntos de parâmetros
+
+        Todas as linhas são gravadas em uma única transação (um único
+        commit), reaproveitando o statement preparado pelo SQLite.
+
+        Args:
+            query (str): Query SQL (INSERT/UPDATE/DELETE) a ser executada
+            params_seq (iterable): Sequência de tuplas de parâmetros
+
+        Returns:
+            int: Número de linhas afetadas
+        """
+        with self.connect() as conn:
+            cursor = conn.executemany(query, params_seq)
+            return cursor.rowcount
+
     def initialize_db(self):
         """Inicializa o banco de dados com todas as tabelas necessárias"""
         with self.connect() as conn:
             cursor = conn.cursor()
             
+            # WAL fica gravado no arquivo do banco: basta ativar uma vez
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Tabela messages
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS messages (
@@ -112,13 +211,41 @@ class Database:
             ''')
             
             # Índices para a tabela messages
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_user_chat ON messages(user_id, chat_id)')
+            # (user_id, chat_id, timestamp) atende o filtro por usuário/chat e o
+            # ORDER BY timestamp DESC LIMIT N sem ordenar em memória; substitui
+            # o antigo índice (user_id, chat_id), que é prefixo deste
+            cursor.execute('DROP INDEX IF EXISTS idx_messages_user_chat')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_user_chat_ts ON messages(user_id, chat_id, timestamp DESC)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_category ON messages(category)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_importance ON messages(importance)')
             
+            # Busca textual em messages.content: FTS5 com conteúdo externo
+            # (o índice invertido aponta para messages.id, sem duplicar o texto),
+            # mantido em sincronia pelos triggers abaixo. MATCH por termo usa o
+            # índice, enquanto LIKE '%termo%' varre a tabela inteira
+            try:
+                fts_exists = cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='messages_fts'"
+                ).fetchone()
+                cursor.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts "
+                    "USING fts5(content, content='messages', content_rowid='id')"
+                )
+                # execute um a um: o executescript faria commit da transação
+                # do connect() no meio da inicialização
+                for trigger in _FTS_TRIGGERS:
+                    cursor.execute(trigger)
+                if not fts_exists:
+                    # Banco já existente: indexa as mensagens gravadas antes do FTS
+                    cursor.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+            except sqlite3.OperationalError as e:
+                logger.warning(f"FTS5 indisponível, busca textual em messages sem índice: {e}")
+            
             # Índices para a tabela documents
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_doc_id ON documents(doc_id)')
+            # doc_id é UNIQUE: o SQLite já mantém um índice para ele, então o
+            # antigo idx_documents_doc_id só duplicava o custo de cada escrita
+            cursor.execute('DROP INDEX IF EXISTS idx_documents_doc_id')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(doc_type)')
             
             logger.info("Tabelas e índices inicializados com sucesso")
\ No newline at end of file
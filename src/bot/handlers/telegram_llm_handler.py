@@ -2,15 +2,17 @@
 from telegram import Update
 from telegram.ext import Application, ContextTypes
 from telegram.constants import ChatAction
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputFile
 from telegram.ext import ContextTypes, ConversationHandler, CallbackQueryHandler, CommandHandler, MessageHandler, filters, CallbackQueryHandler
 from src.bot.utils.config_manager import ConfigManager, EDITABLE_CONFIGS
 from src.bot.agents.llm_agent import LLMAgent
 from src.bot.utils.audio_utils import transcribe_audio  # mantenha só o que realmente é de áudio
-from src.bot.utils.cnpj import busca_CNPJ, format_cnpj_info, CNPJError, validar_cnpj, escape_markdown # import das funções de CNPJ
+from src.bot.utils.cnpj import lookup_cnpj, format_cnpj_info, CNPJError, validar_cnpj, escape_markdown # import das funções de CNPJ
 from src.bot.utils.token_tracker import TokenTracker
 import logging
 import asyncio
+import re
+from io import BytesIO
 import os
 import json
 import datetime
@@ -21,6 +23,9 @@ logger = logging.getLogger('TelegramLLMHandler')
 # Estados para o ConversationHandler
 ESPERANDO_CNPJ = 0
 
+# callback_data dos botões de CNPJ: cnpj_formato_<14 dígitos>_<formato> ou cnpj_detalhe_<14 dígitos>
+_CB_CNPJ = re.compile(r'^cnpj_(formato|detalhe)_(\d{14})(?:_(\w+))?$')
+
 # Estados para a conversa de configuração
 CONFIG_SELECT, CONFIG_EDIT = range(2)
 
@@ -692,7 +697,7 @@ async def processar_cnpj(update: Update, context: ContextTypes.DEFAULT_TYPE, cnp
         cnpj_limpo = validar_cnpj(cnpj_texto)
         
         # Faz a busca
-        dados = busca_CNPJ(cnpj_limpo)
+        dados = await lookup_cnpj(cnpj_limpo)
         
         # Formatar para o Telegram (modifiquei o formato HTML para funcionar bem no Telegram)
         texto = format_cnpj_info(dados, formato="markdown")
@@ -726,18 +731,15 @@ async def botao_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await query.answer()
     
     # Exemplo: cnpj_formato_43836352000194_text
-    dados = query.data.split('_')
-    
-    if len(dados) < 4:
+    m = _CB_CNPJ.match(query.data)
+    if not m:
         return
     
-    tipo = dados[1]  # formato ou detalhe
-    cnpj = dados[2]  # o CNPJ
+    tipo, cnpj, formato = m.groups()  # formato: text, html, etc (só em "formato")
     
     try:
         if tipo == "formato":
-            formato = dados[3]  # text, html, etc
-            resultado = busca_CNPJ(cnpj)
+            resultado = await lookup_cnpj(cnpj)
             texto = format_cnpj_info(resultado, formato=formato)
             
             # Para texto, não usamos parse_mode
@@ -779,27 +781,16 @@ async def cnpj_html(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     
     try:
         cnpj = validar_cnpj(args[0])
-        dados = busca_CNPJ(cnpj)
+        dados = await lookup_cnpj(cnpj)
         html = format_cnpj_info(dados, formato="html")
         
-        # Criar arquivo temporário
-        import tempfile
-        temp = tempfile.NamedTemporaryFile(delete=False, suffix='.html', mode='w', encoding='utf-8')
-        temp.write(html)
-        temp.close()
-        
-        # Enviar o arquivo
+        # Enviar o arquivo direto da memória (sem arquivo temporário em disco)
         await context.bot.send_document(
             chat_id=update.effective_chat.id,
-            document=open(temp.name, 'rb'),
-            filename=f"cnpj_{cnpj}.html",
+            document=InputFile(BytesIO(html.encode('utf-8')), filename=f"cnpj_{cnpj}.html"),
             caption=f"Dados do CNPJ {cnpj} em formato HTML"
         )
         
-        # Limpar
-        import os
-        os.unlink(temp.name)
-        
     except Exception as e:
         await update.message.reply_text(f"❌ Erro: {str(e)}")
 
@@ -813,27 +804,16 @@ async def cnpj_json(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     
     try:
         cnpj = validar_cnpj(args[0])
-        dados = busca_CNPJ(cnpj)
+        dados = await lookup_cnpj(cnpj)
         json_str = format_cnpj_info(dados, formato="json")
         
-        # Criar arquivo temporário
-        import tempfile
-        temp = tempfile.NamedTemporaryFile(delete=False, suffix='.json', mode='w', encoding='utf-8')
-        temp.write(json_str)
-        temp.close()
-        
-        # Enviar o arquivo
+        # Enviar o arquivo direto da memória (sem arquivo temporário em disco)
         await context.bot.send_document(
             chat_id=update.effective_chat.id,
-            document=open(temp.name, 'rb'),
-            filename=f"cnpj_{cnpj}.json",
+            document=InputFile(BytesIO(json_str.encode('utf-8')), filename=f"cnpj_{cnpj}.json"),
             caption=f"Dados do CNPJ {cnpj} em formato JSON"
         )
         
-        # Limpar
-        import os
-        os.unlink(temp.name)
-        
     except Exception as e:
         await update.message.reply_text(f"❌ Erro: {str(e)}")
 
@@ -14,21 +14,21 @@ Este módulo realiza as seguintes ações:
 
 import logging
 import os
-from dotenv import load_dotenv
 from telegram import Update
 from telegram.ext import Application, MessageHandler, CommandHandler, filters
 from src.bot.handlers.telegram_llm_handler import telegram_llm_handler
 from src.bot.handlers.telegram_llm_handler import registrar_cnpj_handlers
+from src.bot.utils.cnpj import close_async_client
 import sys
-from src.config.config import Config
+from src.config.config import Config, load_env
 from src.bot.google_auth_helper import GoogleAuthHelper
 from src.bot.utils.log_config import setup_logging
 from src.bot.handlers.telegram_llm_handler import setup_config_handlers
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-# Carrega variáveis de ambiente
-load_dotenv()
+# Carrega variáveis de ambiente (já carregadas pelo Config; não relê o .env)
+load_env()
 
 # Configuração do logging: define o formato e o nível de mensagens que serão exibidas
 logging.basicConfig(
@@ -95,7 +95,13 @@ def main():
         logger.error("Token do Telegram não encontrado.")
         return
 
-    application = Application.builder().token(telegram_token).build()
+    # post_shutdown: fecha o cliente HTTP das consultas de CNPJ junto com o bot
+    application = (
+        Application.builder()
+        .token(telegram_token)
+        .post_shutdown(lambda app: close_async_client())
+        .build()
+    )
     setup_config_handlers(application)
     
     # # Handler para comando /start
@@ -8,6 +8,7 @@ de mensagens, documentos e contexto usando ChromaDB e SQLite.
 Modules:
     memory_manager: Gerenciamento principal de memória e contexto
     document_manager: Gerenciamento de documentos e chunks de texto
+    embedding_cache: Cache em disco de embeddings
 
 Classes:
     MemoryManager: Gerenciador principal de memória
@@ -19,9 +20,10 @@ Example:
     >>> await memory.add_message(user_id=1, chat_id=1, content="Olá", role="user")
 """
 
-import dotenv
+from src.config.config import load_env
 
-dotenv.load_dotenv()
+# Carrega o .env uma vez por processo (compartilhado com o Config)
+load_env()
 
 from .memory_manager import MemoryManager
 
@@ -1,11 +1,17 @@
 # src/bot/memory/chroma_manager.py
 import chromadb
+from chromadb.api import ClientAPI
+from chromadb.api.client import SharedSystemClient
+from chromadb.config import Settings
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
 import threading
 import logging
 import os
 import time
 from pathlib import Path
 from functools import wraps
+from typing import Dict
 
 logger = logging.getLogger("ChromaManager")
 
@@ -30,6 +36,28 @@ def retry_on_exception(max_retries=3, retry_delay=0.5):
         return wrapper
     return decorator
 
+class SharedEmbeddingFunction(DefaultEmbeddingFunction):
+    """
+    Embedding padrão do Chroma (all-MiniLM-L6-v2 em ONNX) com o modelo carregado uma vez.
+
+    O DefaultEmbeddingFunction cria um ONNXMiniLM_L6_V2 novo a cada chamada,
+    ou seja, recarrega tokenizer e sessão ONNX a cada add/query. Aqui a
+    instância é criada na primeira chamada e reaproveitada. O nome continua
+    "default", então coleções já gravadas com o padrão abrem sem conflito.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._onnx = None
+        self._onnx_lock = threading.Lock()
+
+    def __call__(self, input):
+        if self._onnx is None:
+            with self._onnx_lock:
+                if self._onnx is None:
+                    self._onnx = ONNXMiniLM_L6_V2()
+        return self._onnx(input)
+
 class ChromaManager:
     """
     Gerenciador de conexão com ChromaDB usando padrão Singleton thread-safe.
@@ -43,6 +71,16 @@ class ChromaManager:
     _lock = threading.Lock()
     _initialized = False  # Atributo de classe para controle real
 
+    # Cache de clientes por processo, indexado pelo caminho real do diretório
+    _clients: Dict[str, ClientAPI] = {}
+
+    # "Diretório" especial: cliente só em memória (testes), sem nada em disco
+    EPHEMERAL = ":memory:"
+    _clients_lock = threading.Lock()
+
+    # Função de embedding única do processo (ver get_embedding_function)
+    _embedding_function = None
+
     def __new__(cls, *args, **kwargs):
         """Implementa o padrão Singleton thread-safe."""
         with cls._lock:  # Protege toda a criação de instância
@@ -62,24 +100,56 @@ class ChromaManager:
             if ChromaManager._initialized:
                 return
 
-            self.persist_directory = persist_directory
-
-            # Garante que o diretório existe
-            os.makedirs(Path(persist_directory), exist_ok=True)
+            self.persist_directory = os.path.realpath(persist_directory)
+            # Coleções já abertas, por nome (evita refazer a checagem a cada chamada)
+            self._collections = {}
 
             try:
-                self._client = self._connect_with_retry()
-                logger.info(f"ChromaDB inicializado em {persist_directory}")
+                self._client = self._client_for(self.persist_directory)
             except Exception as e:
                 logger.error(f"Falha ao inicializar ChromaDB: {e}")
                 raise
 
             ChromaManager._initialized = True
     
+    @staticmethod
     @retry_on_exception(max_retries=3)
-    def _connect_with_retry(self):
+    def _connect_with_retry(path: str) -> ClientAPI:
         """Conecta ao ChromaDB com retries."""
-        return chromadb.PersistentClient(path=self.persist_directory)
+        return chromadb.PersistentClient(
+            path=path,
+            settings=Settings(anonymized_telemetry=False)
+        )
+
+    @classmethod
+    def _client_for(cls, persist_directory: str) -> ClientAPI:
+        """
+        Retorna o cliente do diretório, criando-o apenas na primeira chamada.
+
+        O caminho é normalizado com ``os.path.realpath`` para que variações
+        como caminho relativo/absoluto ou barra final não abram um segundo
+        cliente para o mesmo diretório. ``EPHEMERAL`` devolve um cliente só
+        em memória, compartilhado pelo processo.
+        """
+        if persist_directory == cls.EPHEMERAL:
+            with cls._clients_lock:
+                client = cls._clients.get(cls.EPHEMERAL)
+                if client is None:
+                    client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False))
+                    cls._clients[cls.EPHEMERAL] = client
+                    logger.info("ChromaDB inicializado em memória")
+                return client
+
+        key = os.path.realpath(persist_directory)
+        with cls._clients_lock:
+            client = cls._clients.get(key)
+            if client is None:
+                # Garante que o diretório existe
+                os.makedirs(Path(key), exist_ok=True)
+                client = cls._connect_with_retry(key)
+                cls._clients[key] = client
+                logger.info(f"ChromaDB inicializado em {key}")
+            return client
     
     @property
     def client(self):
@@ -87,7 +157,48 @@ class ChromaManager:
         return self._client
     
     @classmethod
-    def get_client(cls, persist_directory="./data/chroma_db"):
+    def get_embedding_function(cls) -> SharedEmbeddingFunction:
+        """Função de embedding compartilhada por todas as coleções do processo."""
+        with cls._clients_lock:
+            if cls._embedding_function is None:
+                cls._embedding_function = SharedEmbeddingFunction()
+            return cls._embedding_function
+
+    @classmethod
+    def share_embedding_function(cls, collection):
+        """
+        Troca a função de embedding padrão da coleção pela compartilhada.
+
+        O Chroma reconstrói a função a partir da configuração gravada da
+        coleção (ignorando a passada no get_or_create_collection), então a
+        troca é feita no objeto já aberto. Funções que não são a padrão ficam
+        como estão.
+
+        Returns:
+            A própria coleção
+        """
+        if isinstance(getattr(collection, "_embedding_function", None), DefaultEmbeddingFunction):
+            collection._embedding_function = cls.get_embedding_function()
+        return collection
+
+    @classmethod
+    def reset_cache(cls):
+        """
+        Descarta o singleton e os clientes em cache (não a função de embedding).
+
+        Só para testes que simulam um reinício do bot no mesmo processo: o
+        próximo ChromaManager/get_client reabre os clientes do disco. Clientes
+        obtidos antes da chamada não devem mais ser usados.
+        """
+        with cls._lock, cls._clients_lock:
+            cls._clients.clear()
+            cls._instance = None
+            cls._initialized = False
+            SharedSystemClient.clear_system_cache()
+        logger.info("Cache de clientes do ChromaDB descartado")
+
+    @classmethod
+    def get_client(cls, persist_directory="./data/chroma_db") -> ClientAPI:
         """
         Método de classe para obter o cliente ChromaDB.
         
@@ -97,14 +208,15 @@ class ChromaManager:
         Returns:
             Cliente ChromaDB inicializado
         """
-        # Garante que o singleton está inicializado
-        instance = cls(persist_directory)
-        return instance.client
+        return cls._client_for(persist_directory)
     
     def get_or_create_collection(self, name, metadata=None):
         """
         Obtém ou cria uma coleção no ChromaDB.
         
+        A coleção é aberta uma vez por nome e reaproveitada nas chamadas
+        seguintes.
+        
         Args:
             name: Nome da coleção
             metadata: Metadados da coleção (opcional)
@@ -112,8 +224,15 @@ class ChromaManager:
         Returns:
             Coleção do ChromaDB
         """
+        collection = self._collections.get(name)
+        if collection is not None:
+            return collection
         try:
-            return self._client.get_or_create_collection(name=name, metadata=metadata)
+            collection = self.share_embedding_function(
+                self._client.get_or_create_collection(name=name, metadata=metadata)
+            )
+            self._collections[name] = collection
+            return collection
         except Exception as e:
             logger.error(f"Erro ao criar coleção {name}: {e}")
             raise
@@ -143,7 +262,11 @@ class ChromaManager:
         with self._lock:
             try:
                 logger.warning("Resetando cliente ChromaDB")
-                self._client = self._connect_with_retry()
+                self._client = self._connect_with_retry(self.persist_directory)
+                # Coleções abertas pelo cliente antigo não servem mais
+                self._collections.clear()
+                with self._clients_lock:
+                    self._clients[self.persist_directory] = self._client
                 return self._client
             except Exception as e:
                 logger.error(f"Falha ao resetar cliente ChromaDB: {e}")
@@ -1,12 +1,20 @@
 # src/bot/memory/document_manager.py
 import logging
+import math
+from functools import lru_cache
 from typing import List, Dict, Optional
 import chromadb
+import numpy as np
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
 from datetime import datetime
 from bot.database.db_init import Database
 
 logger = logging.getLogger('DocumentManager')
 
+# Máximo de chunks por chamada de collection.add: documentos comuns vão numa
+# chamada só; documentos enormes são divididos para respeitar o limite do Chroma
+ADD_BATCH_SIZE = 1000
+
 """
 Gerenciador de documentos do sistema.
 
@@ -54,6 +62,14 @@ class DocumentManager:
             name="documents",
             metadata={"description": "Documentos e textos longos processados"}
         )
+        # Mesma função de embedding (e modelo já carregado) da coleção de mensagens
+        # (ver ChromaManager.share_embedding_function)
+        shared = getattr(self.memory.messages_collection, "_embedding_function", None)
+        if isinstance(self.documents_collection._embedding_function, DefaultEmbeddingFunction) \
+                and isinstance(shared, DefaultEmbeddingFunction):
+            self.documents_collection._embedding_function = shared
+        # Cache do embedding das queries: buscas repetidas não rodam o modelo de novo
+        self._embed_query = lru_cache(maxsize=1024)(self._embed_query_uncached)
         logger.info("DocumentManager inicializado")
     
     async def add_document(
@@ -97,12 +113,18 @@ class DocumentManager:
                 chunk_metadatas.append(chunk_metadata)
                 chunk_ids.append(chunk_id)
             
-            # Adiciona os chunks ao ChromaDB
-            self.documents_collection.add(
-                documents=chunks,
-                metadatas=chunk_metadatas,
-                ids=chunk_ids
-            )
+            # Gera os embeddings de todos os chunks numa única chamada ao modelo
+            embeddings = self._embed(chunks)
+            
+            # Adiciona os chunks ao ChromaDB em lotes (uma chamada por lote)
+            for inicio in range(0, len(chunks), ADD_BATCH_SIZE):
+                fim = inicio + ADD_BATCH_SIZE
+                self.documents_collection.add(
+                    documents=chunks[inicio:fim],
+                    metadatas=chunk_metadatas[inicio:fim],
+                    ids=chunk_ids[inicio:fim],
+                    embeddings=embeddings[inicio:fim] if embeddings is not None else None
+                )
             
             # Registra o documento no SQLite
             self.db.execute_query(
@@ -148,12 +170,20 @@ class DocumentManager:
                 for key, value in filters.items():
                     where_filter[key] = {"$eq": value}
             
-            # Realiza a busca
-            results = self.documents_collection.query(
-                query_texts=[query],
-                n_results=limit,
-                where=where_filter
-            )
+            # Realiza a busca (com o embedding da query em cache, se disponível)
+            query_embedding = self._embed_query(query)
+            if query_embedding is not None:
+                results = self.documents_collection.query(
+                    query_embeddings=[list(query_embedding)],
+                    n_results=limit,
+                    where=where_filter
+                )
+            else:
+                results = self.documents_collection.query(
+                    query_texts=[query],
+                    n_results=limit,
+                    where=where_filter
+                )
             
             # Organiza os resultados
             documents = []
@@ -173,6 +203,34 @@ class DocumentManager:
             logger.error(f"Erro na busca de documentos: {str(e)}")
             raise
 
+    def _embed(self, chunks: List[str]):
+        """
+        Calcula os embeddings de todos os chunks com uma chamada ao modelo.
+        
+        Com os vetores prontos, o Chroma não roda o modelo de novo a cada
+        lote do add. Os vetores vão como um array float32 contíguo (N, D):
+        o Chroma recebe o ndarray direto, sem converter cada float para objeto
+        Python.
+        Retorna None se a coleção não tiver função de embedding (o Chroma
+        então segue com o comportamento padrão).
+        """
+        embedding_function = getattr(self.documents_collection, "_embedding_function", None)
+        if embedding_function is None or not chunks:
+            return None
+        return np.ascontiguousarray(embedding_function(chunks), dtype=np.float32)
+
+    def _embed_query_uncached(self, query: str):
+        """
+        Calcula o embedding de uma query (usado através do cache _embed_query).
+        
+        Retorna uma tupla de floats (hashável e imutável, segura para o cache)
+        ou None se a coleção não tiver função de embedding.
+        """
+        embeddings = self._embed([query])
+        if embeddings is None:
+            return None
+        return tuple(float(x) for x in embeddings[0])
+
     def _split_text(
         self,
         text: str,
@@ -180,42 +238,32 @@ class DocumentManager:
         overlap: int
     ) -> List[str]:
         """
-        Divide um texto em chunks menores com sobreposição.
+        Divide um texto em chunks menores com sobreposição (janela deslizante).
+        
+        O texto é quebrado em palavras uma única vez; cada chunk é uma janela
+        de chunk_size palavras e a janela avança stride = chunk_size - overlap.
+        Para N palavras são gerados ceil((N - chunk_size) / stride) + 1 chunks
+        (ou 1, se o texto couber numa janela), e o último chega ao fim do texto.
         
         Args:
             text: Texto a ser dividido
-            chunk_size: Tamanho de cada chunk
-            overlap: Sobreposição entre chunks
+            chunk_size: Tamanho de cada chunk (em palavras)
+            overlap: Sobreposição entre chunks (em palavras)
             
         Returns:
             Lista de chunks de texto
         """
-        words = text.split()
-        chunks = []
-        start = 0
+        stride = chunk_size - overlap
+        if stride <= 0:
+            raise ValueError("chunk_overlap deve ser menor que chunk_size")
         
-        while start < len(words):
-            # Define o fim do chunk atual
-            end = start + chunk_size
-            
-            # Se não é o último chunk, ajusta para não cortar palavras
-            if end < len(words):
-                # Procura um ponto final ou espaço próximo ao tamanho desejado
-                while end > start and not (
-                    words[end-1].endswith('.') or 
-                    words[end-1].endswith('!') or 
-                    words[end-1].endswith('?')
-                ):
-                    end -= 1
-                # Se não encontrou pontuação, usa espaço
-                if end == start:
-                    end = start + chunk_size
-            
-            # Cria o chunk
-            chunk = ' '.join(words[start:end])
-            chunks.append(chunk)
-            
-            # Atualiza o início do próximo chunk considerando a sobreposição
-            start = end - overlap
+        words = text.split()
+        if not words:
+            return []
         
-        return chunks
\ No newline at end of file
+        # Número de janelas necessárias para cobrir todas as palavras
+        total = 1 if len(words) <= chunk_size else math.ceil((len(words) - chunk_size) / stride) + 1
+        return [
+            ' '.join(words[inicio:inicio + chunk_size])
+            for inicio in range(0, total * stride, stride)
+        ]
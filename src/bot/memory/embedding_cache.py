@@ -0,0 +1,116 @@
+# src/bot/memory/embedding_cache.py
+"""
+Cache em disco de embeddings.
+
+Guarda num SQLite os vetores já calculados, com chave sha256(modelo + texto),
+para que textos repetidos (ex.: as mensagens fixas dos testes rodando de novo
+no CI) não passem pelo modelo de embedding outra vez.
+
+Example:
+    >>> cache = EmbeddingCache("./data/embedding_cache.db")
+    >>> vetores = cache.embed(["olá", "mundo"], collection._embedding_function)
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger('EmbeddingCache')
+
+
+def model_name(embedding_function) -> str:
+    """Identifica o modelo de uma função de embedding (parte da chave do cache)."""
+    cls = type(embedding_function)
+    model = getattr(embedding_function, "MODEL_NAME", None) or getattr(embedding_function, "model_name", "")
+    return f"{cls.__module__}.{cls.__qualname__}:{model}"
+
+
+class EmbeddingCache:
+    """
+    Cache de embeddings em SQLite.
+
+    Os vetores são gravados como bytes float32. Só os textos que faltam no
+    cache são enviados ao modelo, numa única chamada.
+
+    Args:
+        path: Caminho do arquivo SQLite do cache
+
+    Attributes:
+        path: Caminho do arquivo do cache
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        logger.info(f"Cache de embeddings em {path}")
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """Chave do cache: sha256 do modelo + texto."""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def lookup_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Busca vários vetores de uma vez; None onde não houver no cache."""
+        found = {}
+        with self._lock:
+            # Respeita o limite de parâmetros por consulta do SQLite
+            for inicio in range(0, len(keys), 500):
+                lote = keys[inicio:inicio + 500]
+                placeholders = ",".join("?" * len(lote))
+                found.update(self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", lote
+                ).fetchall())
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
+
+    def store_many(self, keys: Sequence[str], vectors) -> None:
+        """Grava vários vetores numa única transação."""
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in zip(keys, vectors)]
+        with self._lock:
+            # Conexão em autocommit (isolation_level=None): a transação é
+            # explícita, e um erro precisa de ROLLBACK para não deixá-la aberta
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def embed(self, texts: Sequence[str], embedding_function) -> np.ndarray:
+        """
+        Retorna os embeddings dos textos, calculando só os que faltam no cache.
+
+        Args:
+            texts: Textos a embutir
+            embedding_function: Função de embedding (ex: a da coleção do Chroma)
+
+        Returns:
+            np.ndarray: Matriz float32 (len(texts), dim)
+        """
+        model = model_name(embedding_function)
+        keys = [self.key(model, text) for text in texts]
+        vectors = self.lookup_many(keys)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = embedding_function([texts[i] for i in missing])
+            self.store_many([keys[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = np.asarray(vector, dtype=np.float32)
+
+        logger.debug(f"Embeddings: {len(texts) - len(missing)} do cache, {len(missing)} calculados")
+        return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
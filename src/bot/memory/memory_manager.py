@@ -9,12 +9,63 @@ from typing import List, Dict, Any, Optional, Tuple
 from contextlib import contextmanager
 
 import chromadb
+import numpy as np
 from src.config.config import Config
 from src.bot.database.db_init import Database
 from src.bot.memory.chroma_manager import ChromaManager, retry_on_exception
+from src.bot.memory.embedding_cache import EmbeddingCache
 
 logger = logging.getLogger('MemoryManager')
 
+INSERT_MESSAGE_SQL = """
+    INSERT INTO messages 
+    (user_id, chat_id, role, content, category, importance, embedding_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Lotes do add_messages_batch: padrão e teto de mensagens por chamada ao ChromaDB
+BATCH_SIZE = 100
+MAX_BATCH_SIZE = 250
+
+def _where_matches(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Avalia um filtro where do ChromaDB ($and/$or, $eq/$ne/$in) sobre metadados."""
+    if not where:
+        return True
+    if "$and" in where:
+        return all(_where_matches(metadata, clause) for clause in where["$and"])
+    if "$or" in where:
+        return any(_where_matches(metadata, clause) for clause in where["$or"])
+    for key, condition in where.items():
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, value in condition.items():
+            if op == "$eq":
+                ok = metadata.get(key) == value
+            elif op == "$ne":
+                ok = metadata.get(key) != value
+            elif op == "$in":
+                ok = metadata.get(key) in value
+            else:
+                raise ValueError(f"Operador não suportado na busca em memória: {op}")
+            if not ok:
+                return False
+    return True
+
+def quantize_int8(vectors) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantiza vetores float32 para int8 com uma escala por vetor.
+
+    Cada vetor x vira round(x / s) com s = max(|x|) / 127, então x ≈ q * s.
+
+    Returns:
+        tuple: (matriz int8 (n, dim), escalas float32 (n,))
+    """
+    x = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scales = np.abs(x).max(axis=1) / 127.0 if x.size else np.ones(len(x), dtype=np.float32)
+    scales[scales == 0] = 1.0
+    quantized = np.round(x / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
 class MemoryManager:
     """
     Gerenciador de memória usando ChromaDB e SQLite.
@@ -24,6 +75,7 @@ class MemoryManager:
 
     Args:
         persist_directory (str): Diretório para persistência do ChromaDB
+        test_mode (bool): Usa um ChromaDB só em memória (nada em disco)
 
     Attributes:
         chroma_manager: Gerenciador do ChromaDB
@@ -34,22 +86,43 @@ class MemoryManager:
         >>> memory = MemoryManager("./data/chroma_db")
         >>> stats = await memory.get_category_stats(1, 1)
     """
-    def __init__(self, persist_directory="./data/chroma_db"):
+    def __init__(self, persist_directory="./data/chroma_db", test_mode=False):
         """
         Inicializa o gerenciador de memória usando ChromaDB e SQLite
         """
+        if test_mode:
+            persist_directory = ChromaManager.EPHEMERAL
         logger.info(f"Inicializando MemoryManager com diretório: {persist_directory}")
         
         try:
-            # Inicializa o gerenciador de ChromaDB
-            self.chroma_manager = ChromaManager(persist_directory)
-            self.client = self.chroma_manager.client
-            self.messages_collection = self.chroma_manager.get_or_create_collection(
-                name="messages",
-                metadata={"description": "Histórico de mensagens do chatbot"}
-            )
+            if test_mode:
+                # Cliente em memória, fora do singleton persistente
+                self.chroma_manager = None
+                self.client = ChromaManager.get_client(persist_directory)
+                self.messages_collection = ChromaManager.share_embedding_function(
+                    self.client.get_or_create_collection(
+                        name="messages",
+                        metadata={"description": "Histórico de mensagens do chatbot"}
+                    )
+                )
+            else:
+                # Inicializa o gerenciador de ChromaDB
+                self.chroma_manager = ChromaManager(persist_directory)
+                self.client = self.chroma_manager.client
+                self.messages_collection = self.chroma_manager.get_or_create_collection(
+                    name="messages",
+                    metadata={"description": "Histórico de mensagens do chatbot"}
+                )
             self.db = Database()
             
+            # Cache de embeddings em disco (opcional, via EMBEDDING_CACHE_PATH)
+            cache_path = Config.EMBEDDING_CACHE_PATH
+            self._embedding_cache = EmbeddingCache(cache_path) if cache_path else None
+            
+            # Índice em memória (ids, matriz de embeddings, metadados) para a
+            # busca com MEMORY_MANAGER_INMEMORY; montado na primeira busca
+            self._in_memory_index = None
+            
             # Trava para operações críticas
             self._lock = threading.Lock()
             self._async_lock = asyncio.Lock()
@@ -144,8 +217,8 @@ class MemoryManager:
             # Constrói o filtro para ChromaDB
             where_filter = {
                 "$and": [
-                    {"user_id": {"$eq": str(user_id)}},
-                    {"chat_id": {"$eq": str(chat_id)}}
+                    {"user_id": {"$eq": int(user_id)}},
+                    {"chat_id": {"$eq": int(chat_id)}}
                 ]
             }
             
@@ -156,78 +229,243 @@ class MemoryManager:
                 limit=limit * 2  # Busca mais para filtrar por relevância depois
             )
             
-            if not results['ids'] or len(results['ids'][0]) == 0:
-                logger.debug("Nenhum resultado encontrado no ChromaDB")
-                return []
+            messages = self._context_from_results(
+                results['ids'][0] if results['ids'] else [],
+                results['distances'][0] if results.get('distances') else None,
+                limit, time_window, min_relevance_score
+            )
             
-            # Recupera os IDs dos embeddings com seus scores
-            embedding_ids = results['ids'][0]
-            distances = results['distances'][0] if 'distances' in results else None
+            logger.debug(f"Contexto recuperado: {len(messages)} mensagens")
+            return messages
             
-            # Se temos distâncias (scores de similaridade), filtra por relevância
-            if distances:
-                # Converte distâncias para scores de similaridade (quanto menor a distância, maior a similaridade)
-                similarity_scores = [1.0 - min(dist, 1.0) for dist in distances]
-                
-                # Filtra ids com base no score mínimo de relevância
-                filtered_ids_with_scores = [
-                    (id, score) for id, score in zip(embedding_ids, similarity_scores)
-                    if score >= min_relevance_score
+        except Exception as e:
+            logger.error(f"Erro ao buscar contexto: {str(e)}", exc_info=True)
+            # Não deixa a execução quebrar completamente
+            return []
+
+    async def get_relevant_context_batch(
+        self,
+        queries: List[str],
+        user_id: int,
+        chat_id: int,
+        limit: int = 5,
+        time_window: int = 60,
+        min_relevance_score: float = 0.3
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Versão do get_relevant_context para várias queries de uma vez.
+
+        Todas as queries vão numa única consulta ao ChromaDB (o modelo de
+        embedding processa todas num só lote); a filtragem por relevância e a
+        busca no SQLite continuam por query.
+
+        Args:
+            queries: Textos para buscar similaridade
+            user_id: ID do usuário
+            chat_id: ID do chat
+            limit: Número máximo de resultados por query
+            time_window: Janela de tempo em minutos (0 = sem limite)
+            min_relevance_score: Score mínimo de relevância (0-1)
+
+        Returns:
+            list: Uma lista de mensagens por query, na ordem recebida
+        """
+        contexts = [[] for _ in queries]
+        try:
+            # Queries curtas ficam de fora (resultado vazio), como no get_relevant_context
+            valid = [i for i, query in enumerate(queries) if query and len(query.strip()) >= 3]
+            if not valid:
+                return contexts
+
+            where_filter = {
+                "$and": [
+                    {"user_id": {"$eq": int(user_id)}},
+                    {"chat_id": {"$eq": int(chat_id)}}
                 ]
-                
-                if not filtered_ids_with_scores:
-                    logger.debug(f"Nenhum resultado com score >= {min_relevance_score}")
-                    return []
-                    
-                # Ordena por relevância
-                filtered_ids_with_scores.sort(key=lambda x: x[1], reverse=True)
-                
-                # Extrai apenas os IDs após a filtragem
-                embedding_ids = [id for id, _ in filtered_ids_with_scores]
-                
-                # Limita ao número de resultados desejados
-                embedding_ids = embedding_ids[:limit]
-            
-            # Prepara a consulta SQL
-            placeholders = ','.join('?' * len(embedding_ids))
-            time_condition = ""
+            }
+            results = await self._query_chromadb_batch_with_retry(
+                query_texts=[queries[i] for i in valid],
+                where_filter=where_filter,
+                limit=limit * 2  # Busca mais para filtrar por relevância depois
+            )
+
+            distances = results.get('distances') or [None] * len(valid)
+            for row, i in enumerate(valid):
+                contexts[i] = self._context_from_results(
+                    results['ids'][row], distances[row],
+                    limit, time_window, min_relevance_score
+                )
+            return contexts
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar contexto em lote: {str(e)}", exc_info=True)
+            return contexts
+
+    def _context_from_results(
+        self,
+        embedding_ids: List[str],
+        distances: Optional[List[float]],
+        limit: int,
+        time_window: int,
+        min_relevance_score: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Filtra os resultados de uma consulta do ChromaDB por relevância e
+        busca as mensagens correspondentes no SQLite.
+
+        Usado pelo get_relevant_context e, por consulta, pelo
+        get_relevant_context_batch.
+        """
+        if not embedding_ids:
+            logger.debug("Nenhum resultado encontrado no ChromaDB")
+            return []
+        
+        # Se temos distâncias (scores de similaridade), filtra por relevância
+        if distances:
+            # Converte distâncias para scores de similaridade (quanto menor a distância, maior a similaridade)
+            similarity_scores = [1.0 - min(dist, 1.0) for dist in distances]
             
-            params = list(embedding_ids)
+            # Filtra ids com base no score mínimo de relevância
+            filtered_ids_with_scores = [
+                (id, score) for id, score in zip(embedding_ids, similarity_scores)
+                if score >= min_relevance_score
+            ]
             
-            # Adiciona condição de tempo se necessário
-            if time_window > 0:
-                time_condition = "AND timestamp >= datetime('now', '-' || ? || ' minutes')"
-                params.append(time_window)
+            if not filtered_ids_with_scores:
+                logger.debug(f"Nenhum resultado com score >= {min_relevance_score}")
+                return []
                 
-            query_sql = f"""
-                SELECT * FROM messages 
-                WHERE embedding_id IN ({placeholders})
-                {time_condition}
-                ORDER BY importance DESC, timestamp DESC
-            """
+            # Ordena por relevância
+            filtered_ids_with_scores.sort(key=lambda x: x[1], reverse=True)
             
-            # Executa a query
-            messages = self.db.execute_query(query_sql, tuple(params))
+            # Extrai apenas os IDs após a filtragem
+            embedding_ids = [id for id, _ in filtered_ids_with_scores]
             
-            logger.debug(f"Contexto recuperado: {len(messages)} mensagens")
-            return messages
+            # Limita ao número de resultados desejados
+            embedding_ids = embedding_ids[:limit]
+        
+        # Prepara a consulta SQL
+        placeholders = ','.join('?' * len(embedding_ids))
+        time_condition = ""
+        
+        params = list(embedding_ids)
+        
+        # Adiciona condição de tempo se necessário
+        if time_window > 0:
+            time_condition = "AND timestamp >= datetime('now', '-' || ? || ' minutes')"
+            params.append(time_window)
             
-        except Exception as e:
-            logger.error(f"Erro ao buscar contexto: {str(e)}", exc_info=True)
-            # Não deixa a execução quebrar completamente
-            return []
+        query_sql = f"""
+            SELECT * FROM messages 
+            WHERE embedding_id IN ({placeholders})
+            {time_condition}
+            ORDER BY importance DESC, timestamp DESC
+        """
+        
+        # Executa a query
+        return self.db.execute_query(query_sql, tuple(params))
+
+    def _embed(self, texts: List[str]):
+        """
+        Embeddings dos textos via cache em disco, se configurado.
+
+        Retorna None sem cache (ou sem função de embedding na coleção): o
+        ChromaDB então calcula os embeddings como de costume.
+        """
+        embedding_function = getattr(self.messages_collection, "_embedding_function", None)
+        if self._embedding_cache is None or embedding_function is None or not texts:
+            return None
+        return self._embedding_cache.embed(texts, embedding_function)
+
+    def _query_in_memory(self, query_text, where_filter=None, limit=5):
+        """
+        Busca vetorial por varredura NumPy sobre todos os embeddings da coleção.
+
+        Para coleções pequenas (testes), uma multiplicação de matriz contígua
+        float32 sai mais barata que uma consulta ao índice do ChromaDB. Usa a
+        mesma distância do ChromaDB (L2 ao quadrado) e devolve o mesmo formato
+        do query, então o resto do fluxo não muda. O índice é montado com um
+        único get na primeira busca e descartado a cada nova mensagem.
+
+        Com MEMORY_MANAGER_INMEMORY_INT8 a matriz fica em int8 (quantize_int8)
+        e a distância sai de ||m||² - 2·m·q + ||q||², com o produto interno
+        calculado em inteiros e as normas guardadas do float32 original.
+        """
+        if self._in_memory_index is None:
+            data = self.messages_collection.get(include=["embeddings", "metadatas"])
+            ids = list(data["ids"])
+            matrix = (
+                np.ascontiguousarray(data["embeddings"], dtype=np.float32) if ids
+                else np.empty((0, 0), dtype=np.float32)
+            )
+            scales = sq_norms = None
+            if Config.MEMORY_MANAGER_INMEMORY_INT8:
+                sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+                matrix, scales = quantize_int8(matrix)
+            self._in_memory_index = (ids, matrix, scales, sq_norms, list(data["metadatas"]))
+        ids, matrix, scales, sq_norms, metadatas = self._in_memory_index
+
+        rows = [i for i, metadata in enumerate(metadatas) if _where_matches(metadata, where_filter)]
+        if not rows or limit <= 0:
+            return {"ids": [[]], "distances": [[]], "metadatas": [[]]}
+
+        query_embedding = self._embed([query_text])
+        if query_embedding is None:
+            query_embedding = self.messages_collection._embedding_function([query_text])
+        query_vector = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+
+        if scales is None:
+            diff = matrix[rows] - query_vector
+            distances = np.einsum("ij,ij->i", diff, diff)
+        else:
+            query_int8, query_scale = quantize_int8(query_vector)
+            dots = matrix[rows].astype(np.int32) @ query_int8[0].astype(np.int32)
+            dots = dots * (scales[rows] * query_scale[0])
+            distances = sq_norms[rows] - 2.0 * dots + float(query_vector @ query_vector)
+
+        k = min(limit, len(rows))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        return {
+            "ids": [[ids[rows[i]] for i in top]],
+            "distances": [[float(distances[i]) for i in top]],
+            "metadatas": [[metadatas[rows[i]] for i in top]],
+        }
 
     async def _query_chromadb_with_retry(self, query_text, where_filter=None, limit=5):
         """
         Executa query no ChromaDB com retry em caso de falhas.
         """
+        return await self._query_chromadb_batch_with_retry([query_text], where_filter, limit)
+
+    async def _query_chromadb_batch_with_retry(self, query_texts, where_filter=None, limit=5):
+        """
+        Várias queries numa única chamada ao ChromaDB (embeddings calculados
+        de uma vez), com retry em caso de falhas. O resultado tem uma lista
+        por query, na ordem recebida.
+        """
+        if Config.MEMORY_MANAGER_INMEMORY:
+            per_query = [self._query_in_memory(text, where_filter, limit) for text in query_texts]
+            return {
+                key: [result[key][0] for result in per_query]
+                for key in ("ids", "distances", "metadatas")
+            }
+        
         max_retries = 3
         retry_delay = 0.5
         
         for attempt in range(max_retries):
             try:
+                query_embeddings = self._embed(list(query_texts))
+                if query_embeddings is not None:
+                    return self.messages_collection.query(
+                        query_embeddings=query_embeddings,
+                        n_results=limit,
+                        where=where_filter,
+                        include=["metadatas", "distances"]
+                    )
                 return self.messages_collection.query(
-                    query_texts=[query_text],
+                    query_texts=list(query_texts),
                     n_results=limit,
                     where=where_filter,
                     include=["metadatas", "distances"]
@@ -239,7 +477,7 @@ class MemoryManager:
                 if attempt == max_retries - 1:  # Última tentativa
                     logger.error(f"Falha em todas as tentativas de consulta ChromaDB")
                     # Retorna um objeto vazio compatível com o formato esperado
-                    return {"ids": [[]], "distances": [[]], "metadatas": [[]]}
+                    return {key: [[] for _ in query_texts] for key in ("ids", "distances", "metadatas")}
                     
                 # Tenta reiniciar o cliente
                 if hasattr(self.chroma_manager, 'reset_client'):
@@ -276,60 +514,12 @@ class MemoryManager:
         Returns:
             str: ID do embedding ou None em caso de erro
         """
-        async with self._async_lock:  # Trava assíncrona
-            transaction_successful = False
-            embedding_id = None
-            
-            try:
-                # 1. Gera ID único
-                timestamp = int(time.time() * 1000)
-                embedding_id = f"msg_{user_id}_{timestamp}"
-                
-                # 2. Categoriza a mensagem se necessário
-                if category is None or importance is None:
-                    category, importance = await self.categorize_message(content, role=="user")
-                
-                # 3. PRIMEIRO salva no SQLite (mais fácil de recuperar em caso de erro)
-                self.db.execute_query(
-                    """
-                    INSERT INTO messages 
-                    (user_id, chat_id, role, content, category, importance, embedding_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (user_id, chat_id, role, content, category, importance, embedding_id)
-                )
-                
-                # 4. DEPOIS salva no ChromaDB
-                self.messages_collection.add(
-                    documents=[content],
-                    metadatas=[{
-                        "user_id": str(user_id),
-                        "chat_id": str(chat_id),
-                        "role": role,
-                        "category": category,
-                        "timestamp": datetime.now().isoformat()
-                    }],
-                    ids=[embedding_id]
-                )
-                
-                transaction_successful = True
-                logger.debug(f"Mensagem {embedding_id} salva com sucesso")
-                return embedding_id
-                
-            except Exception as e:
-                # Se houve erro e já inserimos no SQLite, tenta remover
-                if embedding_id and not transaction_successful:
-                    try:
-                        logger.warning(f"Revertendo inserção falha no SQLite: {embedding_id}")
-                        self.db.execute_query(
-                            "DELETE FROM messages WHERE embedding_id = ?",
-                            (embedding_id,)
-                        )
-                    except Exception as cleanup_err:
-                        logger.error(f"Erro ao limpar inserção em SQLite: {cleanup_err}")
-                
-                logger.error(f"Erro ao salvar mensagem: {e}", exc_info=True)
-                return None
+        # Um lote de uma mensagem: mesmo caminho (e rollback) do add_messages_batch
+        ids = await self.add_messages_batch([{
+            "user_id": user_id, "chat_id": chat_id, "content": content,
+            "role": role, "category": category, "importance": importance
+        }])
+        return ids[0] if ids else None
 
     def add_message_sync(
         self,
@@ -354,62 +544,151 @@ class MemoryManager:
         Returns:
             str: ID do embedding ou None em caso de erro
         """
-        with self._lock:  # Trava para operações críticas
-            transaction_successful = False
-            embedding_id = None
-            
+        # Sem categorização: o lote aplica os padrões ('geral', 3)
+        ids = self.add_messages_batch_sync([{
+            "user_id": user_id, "chat_id": chat_id, "content": content,
+            "role": role, "category": category, "importance": importance
+        }])
+        return ids[0] if ids else None
+
+    def _flush_sqlite(self, rows: List[Tuple]) -> int:
+        """
+        Grava um lote de mensagens no SQLite com um único executemany.
+
+        Args:
+            rows: Tuplas no formato de INSERT_MESSAGE_SQL
+
+        Returns:
+            int: Número de linhas inseridas
+        """
+        return self.db.execute_many(INSERT_MESSAGE_SQL, rows)
+
+    async def add_messages_batch(
+        self,
+        messages: List[Dict[str, Any]],
+        batch_size: int = BATCH_SIZE
+    ) -> List[str]:
+        """
+        Versão assíncrona do add_messages_batch_sync, em lotes.
+
+        Mensagens sem categoria/importância são categorizadas como no
+        add_message. Cada lote (no máximo MAX_BATCH_SIZE mensagens) vira uma
+        transação no SQLite e uma chamada ``add`` no ChromaDB, com os
+        embeddings do lote calculados de uma vez.
+
+        Args:
+            messages: Dicionários com user_id, chat_id, content, role e,
+                opcionalmente, category e importance
+            batch_size: Mensagens por lote (limitado a MAX_BATCH_SIZE)
+
+        Returns:
+            list: IDs de embedding gerados (lotes com erro não entram)
+        """
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        ids = []
+
+        async with self._async_lock:
+            # Cópias: a categorização não altera os dicionários de quem chamou
+            messages = list(messages)
+            for i, msg in enumerate(messages):
+                if msg.get('category') is None or msg.get('importance') is None:
+                    category, importance = await self.categorize_message(
+                        msg['content'], msg['role'] == "user"
+                    )
+                    messages[i] = {**msg, 'category': category, 'importance': importance}
+
+            for inicio in range(0, len(messages), batch_size):
+                ids.extend(self.add_messages_batch_sync(
+                    messages[inicio:inicio + batch_size], id_offset=inicio
+                ))
+
+        return ids
+
+    def add_messages_batch_sync(self, messages: List[Dict[str, Any]], id_offset: int = 0) -> List[str]:
+        """
+        Adiciona várias mensagens de uma vez (SQLite + ChromaDB).
+
+        O lote inteiro vai para o SQLite em uma única transação e para o
+        ChromaDB em uma única chamada ``add``. Se o ChromaDB falhar, as
+        linhas do lote são removidas do SQLite.
+
+        Args:
+            messages: Dicionários com user_id, chat_id, content, role e,
+                opcionalmente, category e importance
+            id_offset: Deslocamento do índice no ID (evita IDs repetidos
+                entre lotes gerados no mesmo milissegundo)
+
+        Returns:
+            list: IDs de embedding gerados (vazio em caso de erro)
+        """
+        if not messages:
+            return []
+
+        with self._lock:
+            timestamp = int(time.time() * 1000)
+            now = datetime.now().isoformat()
+            rows, ids, documents, metadatas = [], [], [], []
+
+            for i, msg in enumerate(messages):
+                category = msg.get('category') or 'geral'
+                importance = msg.get('importance') or 3
+                embedding_id = f"msg_{msg['user_id']}_{timestamp}_{id_offset + i}"
+
+                rows.append((
+                    msg['user_id'], msg['chat_id'], msg['role'], msg['content'],
+                    category, importance, embedding_id
+                ))
+                ids.append(embedding_id)
+                documents.append(msg['content'])
+                metadatas.append({
+                    "user_id": int(msg['user_id']),
+                    "chat_id": int(msg['chat_id']),
+                    "role": msg['role'],
+                    "category": category,
+                    "timestamp": now
+                })
+
+            try:
+                self._flush_sqlite(rows)
+            except Exception as e:
+                logger.error(f"Erro ao inserir lote no SQLite: {e}", exc_info=True)
+                return []
+
             try:
-                # 1. Gera ID único
-                timestamp = int(time.time() * 1000)
-                embedding_id = f"msg_{user_id}_{timestamp}"
-                
-                # 2. Define valores padrão para categoria/importância se não fornecidos
-                if category is None:
-                    category = 'geral'
-                if importance is None:
-                    importance = 3
-                
-                # 3. PRIMEIRO salva no SQLite
-                self.db.execute_query(
-                    """
-                    INSERT INTO messages 
-                    (user_id, chat_id, role, content, category, importance, embedding_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (user_id, chat_id, role, content, category, importance, embedding_id)
-                )
-                
-                # 4. DEPOIS salva no ChromaDB
                 self.messages_collection.add(
-                    documents=[content],
-                    metadatas=[{
-                        "user_id": str(user_id),
-                        "chat_id": str(chat_id),
-                        "role": role,
-                        "category": category,
-                        "timestamp": datetime.now().isoformat()
-                    }],
-                    ids=[embedding_id]
+                    documents=documents, metadatas=metadatas, ids=ids,
+                    embeddings=self._embed(documents)
                 )
-                
-                transaction_successful = True
-                logger.debug(f"Mensagem {embedding_id} adicionada com sucesso (sync)")
-                return embedding_id
-                
             except Exception as e:
-                # Se houve erro e já inserimos no SQLite, tenta remover
-                if embedding_id and not transaction_successful:
-                    try:
-                        logger.warning(f"Revertendo inserção falha no SQLite: {embedding_id}")
-                        self.db.execute_query(
-                            "DELETE FROM messages WHERE embedding_id = ?",
-                            (embedding_id,)
-                        )
-                    except Exception as cleanup_err:
-                        logger.error(f"Erro ao limpar inserção em SQLite: {cleanup_err}")
-                
-                logger.error(f"Erro ao adicionar mensagem (sync): {e}", exc_info=True)
-                return None
+                logger.error(f"Erro ao inserir lote no ChromaDB, revertendo SQLite: {e}", exc_info=True)
+                try:
+                    self.db.execute_many(
+                        "DELETE FROM messages WHERE embedding_id = ?",
+                        [(embedding_id,) for embedding_id in ids]
+                    )
+                except Exception as cleanup_err:
+                    logger.error(f"Erro ao limpar lote no SQLite: {cleanup_err}")
+                return []
+
+            self._in_memory_index = None
+            logger.debug(f"Lote de {len(ids)} mensagens adicionado com sucesso (sync)")
+            return ids
+
+    def delete_user_messages(self, user_id: int) -> None:
+        """
+        Remove todas as mensagens de um usuário (SQLite + ChromaDB).
+
+        Invalida o índice em memória, para que buscas seguintes não
+        encontrem os IDs apagados.
+
+        Args:
+            user_id: ID do usuário
+        """
+        with self._lock:
+            self.db.execute_query("DELETE FROM messages WHERE user_id = ?", (user_id,))
+            self.messages_collection.delete(where={"user_id": {"$eq": int(user_id)}})
+            self._in_memory_index = None
+            logger.debug(f"Mensagens do usuário {user_id} removidas")
 
     async def get_recent_messages(self, user_id: int, chat_id: int, limit: int = 20) -> List[Dict[str, Any]]:
         """
@@ -710,14 +989,15 @@ class MemoryManager:
                     self.messages_collection.add(
                         documents=[msg['content']],
                         metadatas=[{
-                            "user_id": str(msg['user_id']),
-                            "chat_id": str(msg['chat_id']),
+                            "user_id": int(msg['user_id']),
+                            "chat_id": int(msg['chat_id']),
                             "role": msg['role'],
                             "category": msg['category'] or 'geral',
                             "timestamp": datetime.now().isoformat()
                         }],
                         ids=[embedding_id]
                     )
+                    self._in_memory_index = None
                     
                     # Atualiza o SQLite
                     self.db.execute_query(
@@ -740,13 +1020,15 @@ class MemoryManager:
             stats["error_message"] = str(e)
             return stats
 
-    def debug_memory_state(self, user_id: int, chat_id: int) -> Dict[str, Any]:
+    def debug_memory_state(self, user_id: int, chat_id: int, *, quick: bool = False) -> Dict[str, Any]:
         """
         Retorna o estado atual da memória para depuração.
         
         Args:
             user_id: ID do usuário
             chat_id: ID do chat
+            quick: Só conta as mensagens nos dois bancos (sem amostras nem
+                busca vetorial); basta para saber o "health"
             
         Returns:
             dict: Estado da memória
@@ -766,33 +1048,43 @@ class MemoryManager:
             state["sqlite"]["count"] = sql_results[0]['count'] if sql_results else 0
             
             # Amostras do SQLite
-            samples = self.db.execute_query(
-                """
-                SELECT id, role, embedding_id, substr(content, 1, 50) as content_preview
-                FROM messages 
-                WHERE user_id=? AND chat_id=?
-                ORDER BY timestamp DESC LIMIT 5
-                """,
-                (user_id, chat_id)
-            )
-            state["sqlite"]["samples"] = samples
+            if not quick:
+                samples = self.db.execute_query(
+                    """
+                    SELECT id, role, embedding_id, substr(content, 1, 50) as content_preview
+                    FROM messages 
+                    WHERE user_id=? AND chat_id=?
+                    ORDER BY timestamp DESC LIMIT 5
+                    """,
+                    (user_id, chat_id)
+                )
+                state["sqlite"]["samples"] = samples
             
             # Verifica ChromaDB
             try:
-                results = self.messages_collection.query(
-                    query_texts=[""],
-                    where={
-                        "user_id": {"$eq": str(user_id)},
-                        "chat_id": {"$eq": str(chat_id)}
-                    },
-                    include=["metadatas"],
-                    n_results=999
-                )
+                where = {
+                    "$and": [
+                        {"user_id": {"$eq": int(user_id)}},
+                        {"chat_id": {"$eq": int(chat_id)}}
+                    ]
+                }
+                if quick:
+                    # Contagem só pelos metadados, sem embutir query nem trazer payload
+                    found = self.messages_collection.get(where=where, include=[])
+                    # Mesmo formato do query() abaixo (uma lista por consulta)
+                    results = {"ids": [found['ids']], "metadatas": [[]]}
+                else:
+                    results = self.messages_collection.query(
+                        query_texts=[""],
+                        where=where,
+                        include=["metadatas"],
+                        n_results=999
+                    )
                 
                 state["chromadb"]["count"] = len(results['ids'][0]) if results['ids'] else 0
                 
                 # Amostras do ChromaDB
-                if results['ids'] and len(results['ids'][0]) > 0:
+                if not quick and results['ids'] and len(results['ids'][0]) > 0:
                     samples = []
                     for i in range(min(5, len(results['ids'][0]))):
                         samples.append({
@@ -1,6 +1,8 @@
 # src/bot/models/authorization_data.py
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 from typing import Optional
 
 """
@@ -22,6 +24,28 @@ Example:
     >>> print(f"Valor líquido: {auth.valor_liquido}")
 """
 
+@lru_cache(maxsize=1024)
+def _fmt_date(d: date) -> str:
+    """Formata uma data como dd/mm/yyyy (memoizado por data)."""
+    return f"{d.day:02d}/{d.month:02d}/{d.year:04d}"
+
+
+def to_cents(valor: float) -> int:
+    """
+    Converte um valor em reais para centavos inteiros.
+
+    Arredonda meio-centavo para cima (ROUND_HALF_UP), a mesma regra das
+    retenções do APProcessor; ``round`` arredondaria meio-para-par. O float
+    passa por str para que 2.675 seja 2.675, e não 2.67499999...
+    """
+    return int((Decimal(str(valor)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _as_date(value) -> date:
+    """Reduz datetime a date para compartilhar a entrada do cache."""
+    return value.date() if isinstance(value, datetime) else value
+
+
 @dataclass
 class AuthorizationData:
     """
@@ -101,17 +125,19 @@ class AuthorizationData:
             >>> auth = AuthorizationData(...)
             >>> print(f"Valor líquido: R$ {auth.valor_liquido:.2f}")
         """
-        valor_bruto = self.valor_bruto_material + self.valor_bruto_servico
+        # Soma em centavos inteiros: o resultado sai exato em duas casas,
+        # sem acumular erro de ponto flutuante entre as parcelas
+        valor_bruto = to_cents(self.valor_bruto_material) + to_cents(self.valor_bruto_servico)
         retencoes = (
-            self.retencao_seguridade +
-            self.retencao_ir_fonte +
-            self.retencao_contratual +
-            self.retencao_pis_cofins_csll +
-            self.retencao_iss +
-            (self.retencao_outros or 0.0) +
-            self.adiantamento
+            to_cents(self.retencao_seguridade) +
+            to_cents(self.retencao_ir_fonte) +
+            to_cents(self.retencao_contratual) +
+            to_cents(self.retencao_pis_cofins_csll) +
+            to_cents(self.retencao_iss) +
+            to_cents(self.retencao_outros or 0.0) +
+            to_cents(self.adiantamento)
         )
-        return valor_bruto - retencoes
+        return (valor_bruto - retencoes) / 100
 
     def to_dict(self) -> dict:
         """
@@ -131,8 +157,8 @@ class AuthorizationData:
         return {
             "ficha_numero": self.ficha_numero,
             "nf_doc_numero": self.nf_doc_numero,
-            "emissao": self.emissao.strftime("%d/%m/%Y"),
-            "vencimento": self.vencimento.strftime("%d/%m/%Y"),
+            "emissao": _fmt_date(_as_date(self.emissao)),
+            "vencimento": _fmt_date(_as_date(self.vencimento)),
             "fornecedor": self.fornecedor,
             "valor_bruto_material": f"{self.valor_bruto_material:.2f}",
             "valor_bruto_servico": f"{self.valor_bruto_servico:.2f}",
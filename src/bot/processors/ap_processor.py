@@ -3,11 +3,20 @@ from datetime import datetime, timedelta
 import re
 import logging
 from typing import Optional, Tuple
-from bot.models.authorization_data import AuthorizationData
+from bot.models.authorization_data import AuthorizationData, to_cents
 from bot.processors.document_processor import DocumentProcessor, NFSeData
 
 logger = logging.getLogger('APProcessor')
 
+# Alíquotas de retenção em pontos-base (1/100 de 1%): o cálculo é feito em
+# centavos inteiros, sem arredondamento de ponto flutuante no meio do caminho
+RETENCAO_BPS = {
+    'inss': 1100,  # 11%
+    'ir': 150,     # 1.5%
+    'pcc': 350,    # 3.5%
+    'iss': 500,    # 5%
+}
+
 class APProcessor(DocumentProcessor):
     """
     Processa NFSe e gera dados para Autorização de Pagamento.
@@ -88,17 +97,12 @@ class APProcessor(DocumentProcessor):
         Returns:
             dict: Dicionário com valores de retenção
         """
-        # Valores base para cálculo (podem ser configuráveis)
-        inss_rate = 0.11  # 11%
-        ir_rate = 0.015   # 1.5%
-        pcc_rate = 0.035  # 3.5%
-        iss_rate = 0.05   # 5%
-        
+        # Conta em centavos inteiros (arredondamento meio-para-cima no centavo)
+        # e só converte de volta para reais no fim
+        bruto_cents = to_cents(valor_bruto)
         return {
-            'inss': valor_bruto * inss_rate,
-            'ir': valor_bruto * ir_rate,
-            'pcc': valor_bruto * pcc_rate,
-            'iss': valor_bruto * iss_rate
+            nome: (bruto_cents * bps + 5000) // 10000 / 100
+            for nome, bps in RETENCAO_BPS.items()
         }
     
     def _get_codigo_insumo(self, nfse: NFSeData) -> Optional[str]:
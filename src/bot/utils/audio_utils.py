@@ -1,20 +1,150 @@
 # utils/audio_utils.py
 from openai import OpenAI
+import httpx
+import hashlib
 import logging
+import mimetypes
+import os
+from collections import OrderedDict
 from pathlib import Path
 import tempfile
 import asyncio
 from src.config.config import Config
 
+try:
+    import webrtcvad
+    from pydub import AudioSegment
+except ImportError:  # VAD é opcional: sem as libs, o áudio vai inteiro
+    webrtcvad = None
+    AudioSegment = None
+
 logger = logging.getLogger('AudioUtils')
 
+WHISPER_MODEL = "whisper-1"
+
+# Parâmetros do VAD (webrtcvad só aceita 8/16/32/48 kHz e frames de 10/20/30 ms)
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30
+VAD_PADDING_MS = 300
+VAD_AGGRESSIVENESS = 2
+
+# Cache de transcrições: (sha256 do arquivo, modelo) -> texto
+TRANSCRIPTION_CACHE_SIZE = 128
+_transcription_cache = OrderedDict()
+
+# Cliente HTTP compartilhado: mantém conexões keep-alive entre transcrições
+_openai_http = httpx.Client(
+    timeout=300,
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+)
+
 # Inicializa o cliente OpenAI
-client = OpenAI(api_key=Config.OPENAI_API_KEY)
+client = OpenAI(api_key=Config.OPENAI_API_KEY, http_client=_openai_http)
+
+_vad = webrtcvad.Vad(VAD_AGGRESSIVENESS) if webrtcvad else None
+
+
+def _file_sha256(path: str) -> str:
+    """Calcula o sha256 de um arquivo lendo em blocos."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _strip_silence(path: str) -> str:
+    """
+    Remove trechos de silêncio do áudio antes do upload.
+
+    Mantém apenas os frames marcados como fala pelo VAD, com uma margem de
+    ``VAD_PADDING_MS`` em volta de cada trecho, e exporta o resultado para
+    um WAV temporário.
+
+    Args:
+        path (str): Caminho do arquivo de áudio original.
+
+    Returns:
+        str: Caminho do WAV sem silêncio, ou o caminho original se o VAD
+        não estiver disponível, nenhum trecho de fala for detectado ou o
+        processamento falhar (decodificação, ffmpeg, VAD).
+    """
+    if _vad is None:
+        return path
+
+    try:
+        return _voiced_wav(path)
+    except Exception as e:
+        # Remover silêncio é só otimização: em caso de erro, envia o áudio original
+        logger.warning(f"VAD falhou, enviando áudio sem cortes ({path}): {e}")
+        return path
+
+
+def _voiced_wav(path: str) -> str:
+    """Corpo do _strip_silence: exporta só os trechos de fala para um WAV temporário."""
+    audio = (
+        AudioSegment.from_file(path)
+        .set_frame_rate(VAD_SAMPLE_RATE)
+        .set_channels(1)
+        .set_sample_width(2)
+    )
+    frames = [
+        audio[start:start + VAD_FRAME_MS]
+        for start in range(0, len(audio) - VAD_FRAME_MS + 1, VAD_FRAME_MS)
+    ]
+    speech = [_vad.is_speech(frame.raw_data, VAD_SAMPLE_RATE) for frame in frames]
+    if not any(speech):
+        return path
+
+    # Expande cada frame de fala com a margem de contexto
+    padding = VAD_PADDING_MS // VAD_FRAME_MS
+    keep = [False] * len(frames)
+    for i, is_speech in enumerate(speech):
+        if is_speech:
+            for j in range(max(0, i - padding), min(len(frames), i + padding + 1)):
+                keep[j] = True
+
+    # Junta os bytes uma única vez (somar AudioSegments copia o acumulado a cada frame)
+    voiced = audio._spawn(b"".join(frame.raw_data for frame, kept in zip(frames, keep) if kept))
+
+    fd, out_path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        voiced.export(out_path, format="wav")
+    except Exception:
+        os.remove(out_path)
+        raise
+    logger.debug(f"VAD: {len(audio)}ms -> {len(voiced)}ms ({path})")
+    return out_path
+
+
+def _transcribe_sync(audio_file_path: str) -> str:
+    """Remove o silêncio e envia o áudio para a API (execução bloqueante)."""
+    upload_path = _strip_silence(audio_file_path)
+    try:
+        # Arquivo aberto (e não Path): com Path o SDK faz read_bytes() e
+        # carrega o áudio inteiro; com o handle o multipart do httpx lê em blocos
+        mime = mimetypes.guess_type(upload_path)[0] or "application/octet-stream"
+        with open(upload_path, "rb") as fh:
+            return client.audio.transcriptions.create(
+                model=WHISPER_MODEL,
+                file=(Path(upload_path).name, fh, mime),
+                response_format="text"
+            )
+    finally:
+        if upload_path != audio_file_path:
+            os.remove(upload_path)
+
 
 async def transcribe_audio(audio_file_path: str) -> str:
     """
     Transcreve um arquivo de áudio usando a API da OpenAI.
 
+    O silêncio é removido localmente via VAD (quando disponível) e o arquivo
+    é enviado como handle aberto ``(nome, arquivo, mime)``: o corpo multipart
+    é lido do disco em blocos durante o upload, sem carregar o áudio inteiro
+    na memória. Áudios reenviados são respondidos a partir de um cache LRU.
+
     Args:
         audio_file_path (str): Caminho para o arquivo de áudio.
 
@@ -26,22 +156,23 @@ async def transcribe_audio(audio_file_path: str) -> str:
     """
     try:
         logger.info(f"Iniciando transcrição com API do OpenAI: {audio_file_path}")
+
+        cache_key = (await asyncio.to_thread(_file_sha256, audio_file_path), WHISPER_MODEL)
+        if cache_key in _transcription_cache:
+            _transcription_cache.move_to_end(cache_key)
+            logger.debug("Transcrição recuperada do cache.")
+            return _transcription_cache[cache_key]
         
-        # Usa run_in_executor para executar a operação de I/O de forma assíncrona
-        loop = asyncio.get_event_loop()
-        with open(audio_file_path, "rb") as audio_file:
-            response = await loop.run_in_executor(
-                None,
-                lambda: client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
-            )
+        # Executa a chamada bloqueante em uma thread separada
+        response = await asyncio.to_thread(_transcribe_sync, audio_file_path)
+
+        _transcription_cache[cache_key] = response
+        if len(_transcription_cache) > TRANSCRIPTION_CACHE_SIZE:
+            _transcription_cache.popitem(last=False)
             
         logger.debug("Transcrição com API do OpenAI realizada com sucesso.")
         return response
 
     except Exception as e:
         logger.error(f"Erro ao transcrever áudio com API: {e}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
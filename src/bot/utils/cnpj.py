@@ -6,29 +6,115 @@ Usa a API pública https://publica.cnpj.ws/
 """
 
 import argparse
+import asyncio
+import atexit
 import datetime
+import httpx
 import json
-import locale
+import numpy as np
 import os
-import re
 import requests
 import sys
+import threading
+import time
+import weakref
+from cachetools import TTLCache
 from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
-from typing import Dict, Any, Optional
+from string import Template
+from typing import Dict, Any, List, Optional, Tuple
 
-# Configurar locale BR para formatação de números
 try:
-    locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-except locale.Error:
-    try:
-        locale.setlocale(locale.LC_ALL, 'Portuguese_Brazil.1252')
-    except locale.Error:
-        pass  # Foda-se, vai sem formatação brasileira mesmo
+    from numba import njit
+except ImportError:  # numba é opcional: sem ele, o lote usa o caminho NumPy
+    njit = None
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele, usa o json da stdlib
+    orjson = None
 
 # Constantes
 API_BASE_URL = "https://publica.cnpj.ws/cnpj"
 CACHE_DIR = Path(os.path.expanduser("~/.cache/cnpj_consulta"))
+CACHE_INDEX_FILE = CACHE_DIR / "_index.json"
+CACHE_TTL_SECONDS = int(os.getenv("CNPJ_CACHE_TTL", 30 * 24 * 3600))
+CACHE_MAX_BYTES = int(os.getenv("CNPJ_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+CACHE_LRU_K = 2  # Despejo pelo k-ésimo acesso mais recente (LRU-k)
+CACHE_INDEX_SAVE_INTERVAL = 60  # Leituras gravam o índice no máximo a cada N segundos
+MEMORY_CACHE_SIZE = 1024
+MEMORY_CACHE_TTL = 3600
+
+# Pesos dos dígitos verificadores
+_CNPJ_W1 = (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+_CNPJ_W2 = (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)
+_W1 = np.array(_CNPJ_W1, dtype=np.int64)  # Versões NumPy para validação em lote
+_W2 = np.array(_CNPJ_W2, dtype=np.int64)
+
+# Sessão síncrona compartilhada (keep-alive + retries em erros 5xx)
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+))
+_session.headers.update({'Accept-Encoding': 'gzip', 'User-Agent': 'cnpj-bot/1.0'})
+
+# Clientes assíncronos (pool de conexões + retries de conexão), um por event
+# loop: o pool do httpx fica preso ao loop em que foi usado pela primeira vez
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Retorna o AsyncClient do loop em execução, criando-o na primeira chamada."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=10.0,
+            transport=httpx.AsyncHTTPTransport(
+                retries=3,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=8, keepalive_expiry=60)
+            )
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Fecha o AsyncClient do loop em execução (chamar no desligamento do bot)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+# Cache em memória das consultas (sync e async): CNPJ limpo -> dados
+_memoria = TTLCache(maxsize=MEMORY_CACHE_SIZE, ttl=MEMORY_CACHE_TTL)
+_cache_lock = threading.Lock()
+
+# Índice do cache em disco, lido uma vez e mantido em memória (protegido por
+# _cache_lock). Leituras só marcam o índice como alterado; ele é gravado nas
+# escritas/despejos, a cada CACHE_INDEX_SAVE_INTERVAL e na saída do processo
+_indice: Optional[Dict[str, Dict[str, Any]]] = None
+_indice_alterado = False
+_indice_salvo_em = 0.0
+
+
+class _TabelaDigitos(dict):
+    """Tabela para str.translate que mantém apenas os dígitos ASCII 0-9."""
+
+    def __missing__(self, codigo: int) -> Optional[int]:
+        # Preenchida sob demanda, cobre qualquer caractere Unicode
+        valor = codigo if 0x30 <= codigo <= 0x39 else None
+        self[codigo] = valor
+        return valor
+
+
+_SO_DIGITOS = _TabelaDigitos()
+
+# Tabela de escape do MarkdownV2 do Telegram (uma única passada por string)
+_MD2_ESCAPE = str.maketrans({c: '\\' + c for c in '_*[]()~`>#+-=|{}.!'})
 
 
 class CNPJError(Exception):
@@ -36,10 +122,16 @@ class CNPJError(Exception):
     pass
 
 
+@lru_cache(maxsize=2048)
 def validar_cnpj(cnpj: str) -> str:
-    """Valida e limpa o formato do CNPJ."""
+    """
+    Valida e limpa o formato do CNPJ.
+
+    Memoizado: o mesmo texto volta a cada clique nos botões de formato.
+    Entradas inválidas não entram no cache (a exceção é relançada).
+    """
     # Remove caracteres não numéricos
-    cnpj_limpo = re.sub(r'[^0-9]', '', cnpj)
+    cnpj_limpo = cnpj.translate(_SO_DIGITOS)
     
     # Verifica se o CNPJ tem 14 dígitos
     if len(cnpj_limpo) != 14:
@@ -49,34 +141,135 @@ def validar_cnpj(cnpj: str) -> str:
     if len(set(cnpj_limpo)) == 1:
         raise CNPJError("CNPJ inválido: todos os dígitos são iguais")
     
-    # Calcula dígitos verificadores
-    numeros = [int(digit) for digit in cnpj_limpo]
+    # Calcula dígitos verificadores direto sobre os bytes ASCII ('0' == 0x30)
+    numeros = cnpj_limpo.encode('ascii')
     
     # Cálculo do primeiro dígito verificador
-    soma = sum(a * b for a, b in zip(numeros[:12], [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+    soma = sum((b - 0x30) * w for b, w in zip(numeros, _CNPJ_W1))
     resto = soma % 11
     dv1 = 0 if resto < 2 else 11 - resto
     
-    if numeros[12] != dv1:
-        raise CNPJError(f"CNPJ inválido: primeiro dígito verificador errado. Esperado {dv1}, obtido {numeros[12]}")
+    if numeros[12] - 0x30 != dv1:
+        raise CNPJError(f"CNPJ inválido: primeiro dígito verificador errado. Esperado {dv1}, obtido {numeros[12] - 0x30}")
     
     # Cálculo do segundo dígito verificador
-    soma = sum(a * b for a, b in zip(numeros[:13], [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+    soma = sum((b - 0x30) * w for b, w in zip(numeros, _CNPJ_W2))
     resto = soma % 11
     dv2 = 0 if resto < 2 else 11 - resto
     
-    if numeros[13] != dv2:
-        raise CNPJError(f"CNPJ inválido: segundo dígito verificador errado. Esperado {dv2}, obtido {numeros[13]}")
+    if numeros[13] - 0x30 != dv2:
+        raise CNPJError(f"CNPJ inválido: segundo dígito verificador errado. Esperado {dv2}, obtido {numeros[13] - 0x30}")
     
     return cnpj_limpo
 
 
+def _empilhar_cnpjs(cnpjs) -> Tuple[np.ndarray, List[int], int]:
+    """
+    Limpa um lote de CNPJs e empilha os de 14 dígitos numa matriz ASCII.
+
+    Returns:
+        Tupla (matriz uint8 (M, 14), índices originais dessas M linhas, N total).
+    """
+    limpos = [cnpj.translate(_SO_DIGITOS).encode('ascii') for cnpj in cnpjs]
+    indices = [i for i, cnpj in enumerate(limpos) if len(cnpj) == 14]
+    matriz = np.frombuffer(b''.join(limpos[i] for i in indices), dtype=np.uint8).reshape(-1, 14)
+    return matriz, indices, len(limpos)
+
+
+def validar_cnpj_array(cnpjs) -> np.ndarray:
+    """
+    Valida um lote de CNPJs de uma vez, sem laço Python por dígito.
+
+    Os CNPJs limpos são empilhados numa matriz (N, 14) e os dígitos
+    verificadores são calculados com um produto matricial contra os pesos.
+
+    Args:
+        cnpjs: Sequência de CNPJs (com ou sem pontuação).
+
+    Returns:
+        np.ndarray: Máscara booleana, True para cada CNPJ válido.
+    """
+    matriz, indices, total = _empilhar_cnpjs(cnpjs)
+    validos = np.zeros(total, dtype=bool)
+    
+    # Apenas CNPJs com 14 dígitos seguem para o cálculo
+    if not indices:
+        return validos
+    
+    digitos = matriz.astype(np.int64) - ord('0')
+    
+    resto1 = (digitos[:, :12] @ _W1) % 11
+    dv1 = np.where(resto1 < 2, 0, 11 - resto1)
+    resto2 = (digitos[:, :13] @ _W2) % 11
+    dv2 = np.where(resto2 < 2, 0, 11 - resto2)
+    
+    # Todos os dígitos iguais é inválido
+    repetidos = (digitos == digitos[:, :1]).all(axis=1)
+    
+    validos[indices] = (digitos[:, 12] == dv1) & (digitos[:, 13] == dv2) & ~repetidos
+    return validos
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _verificar_digitos(matriz):
+        """Kernel compilado: verifica os dígitos de uma matriz ASCII (M, 14)."""
+        validos = np.zeros(matriz.shape[0], dtype=np.bool_)
+        for i in range(matriz.shape[0]):
+            soma1 = 0
+            soma2 = 0
+            iguais = True
+            for j in range(12):
+                d = matriz[i, j] - 48
+                soma1 += d * _W1[j]
+                soma2 += d * _W2[j]
+                iguais &= matriz[i, j] == matriz[i, 0]
+            d12 = matriz[i, 12] - 48
+            soma2 += d12 * _W2[12]
+            iguais &= (matriz[i, 12] == matriz[i, 0]) & (matriz[i, 13] == matriz[i, 0])
+            # Sem desvio: (11 - r) zerado quando r < 2
+            resto1 = soma1 % 11
+            resto2 = soma2 % 11
+            dv1 = (11 - resto1) * (resto1 >= 2)
+            dv2 = (11 - resto2) * (resto2 >= 2)
+            validos[i] = (d12 == dv1) & (matriz[i, 13] - 48 == dv2) & (not iguais)
+        return validos
+
+
+def validar_cnpj_fast_batch(cnpjs) -> np.ndarray:
+    """
+    Valida lotes grandes de CNPJs (importações, ETL) com kernel compilado.
+
+    Usa numba quando disponível; caso contrário, cai para
+    ``validar_cnpj_array``. Para validar um único CNPJ use ``validar_cnpj``.
+
+    Args:
+        cnpjs: Sequência de CNPJs (com ou sem pontuação).
+
+    Returns:
+        np.ndarray: Máscara booleana, True para cada CNPJ válido.
+    """
+    if njit is None:
+        return validar_cnpj_array(cnpjs)
+    
+    matriz, indices, total = _empilhar_cnpjs(cnpjs)
+    validos = np.zeros(total, dtype=bool)
+    if indices:
+        validos[indices] = _verificar_digitos(matriz.astype(np.int64))
+    return validos
+
+
+# Máscaras pré-compiladas: cada dígito é um argumento posicional
+_CNPJ_FMT = '{0}{1}.{2}{3}{4}.{5}{6}{7}/{8}{9}{10}{11}-{12}{13}'.format
+_CEP_FMT = '{0}{1}{2}{3}{4}-{5}{6}{7}'.format
+
+
 def formatar_cnpj(cnpj: str) -> str:
     """Formata o CNPJ no padrão XX.XXX.XXX/XXXX-XX."""
     if len(cnpj) != 14:
         return cnpj
     
-    return f"{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}"
+    return _CNPJ_FMT(*cnpj)
 
 
 def formatar_data(data_str: Optional[str]) -> str:
@@ -86,11 +279,17 @@ def formatar_data(data_str: Optional[str]) -> str:
     
     try:
         data = datetime.datetime.fromisoformat(data_str)
-        return data.strftime("%d/%m/%Y")
+        # Formatação por inteiros: sem passar pelo strftime/locale
+        return f"{data.day:02d}/{data.month:02d}/{data.year:04d}"
     except ValueError:
         return data_str
 
 
+def _format_money_br(valor: float) -> str:
+    """R$ no padrão brasileiro sem depender de locale: 1_234.50 -> 1.234,50."""
+    return f"R$ {valor:_.2f}".replace('.', ',').replace('_', '.')
+
+
 def formatar_dinheiro(valor: Any) -> str:
     """Formata um valor monetário no padrão brasileiro."""
     if valor is None:
@@ -98,48 +297,263 @@ def formatar_dinheiro(valor: Any) -> str:
     
     # CORREÇÃO: Garantir que valor seja um número
     try:
-        # Se for string, converter para float
+        # Se for string, remover pontos de milhar e trocar a vírgula decimal
         if isinstance(valor, str):
-            # Remover possíveis pontos e vírgulas
-            valor_limpo = valor.replace('.', '').replace(',', '.')
-            valor = float(valor_limpo)
+            valor = float(valor.replace('.', '').replace(',', '.'))
         else:
-            valor = float(valor)  # Garantir que seja float
-        
-        try:
-            return locale.currency(valor, grouping=True, symbol=True)
-        except (ValueError, locale.Error):
-            # Fallback maneiro se o locale não estiver configurado
-            return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            valor = float(valor)
+        return _format_money_br(valor)
     except (ValueError, TypeError):
         # Se não conseguir converter para número, retorna como texto
         return f"R$ {valor}" if valor else "Não informado"
 
 
+_AUSENTE = object()
+
+
+def _compilar_caminho(caminho: str):
+    """
+    Compila um caminho pontilhado em uma função de acesso.
+    
+    O split('.') acontece uma única vez; a função retornada devolve o padrão
+    se algum nível não existir, não for dict ou se o valor final for None.
+    """
+    chaves = tuple(caminho.split('.'))
+    
+    def obter(dicionario: Dict[str, Any], padrao: Any = "Não informado") -> Any:
+        atual = dicionario
+        for chave in chaves:
+            if not isinstance(atual, dict):
+                return padrao
+            atual = atual.get(chave, _AUSENTE)
+            if atual is _AUSENTE:
+                return padrao
+        return atual if atual is not None else padrao
+    
+    return obter
+
+
+@lru_cache(maxsize=256)
+def _acessor(caminho: str):
+    """Acessor compilado e memoizado para caminhos avulsos."""
+    return _compilar_caminho(caminho)
+
+
 def obter_valor_seguro(dicionario: Dict[str, Any], caminho: str, padrao: Any = "Não informado") -> Any:
     """
     Obtém um valor de um dicionário aninhado de forma segura.
     Ex: obter_valor_seguro(dados, "estabelecimento.cidade.nome", "N/A")
     """
-    partes = caminho.split('.')
-    atual = dicionario
+    return _acessor(caminho)(dicionario, padrao)
+
+
+# Acessores pré-compilados usados por format_cnpj_info
+_GET_RAZAO = _compilar_caminho('razao_social')
+_GET_CNPJ = _compilar_caminho('estabelecimento.cnpj')
+_GET_NATUREZA = _compilar_caminho('natureza_juridica.descricao')
+_GET_PORTE = _compilar_caminho('porte.descricao')
+_GET_CAPITAL = _compilar_caminho('capital_social')
+_GET_SITUACAO = _compilar_caminho('estabelecimento.situacao_cadastral')
+_GET_INICIO = _compilar_caminho('estabelecimento.data_inicio_atividade')
+_GET_TIPO_LOGRADOURO = _compilar_caminho('estabelecimento.tipo_logradouro')
+_GET_LOGRADOURO = _compilar_caminho('estabelecimento.logradouro')
+_GET_NUMERO = _compilar_caminho('estabelecimento.numero')
+_GET_COMPLEMENTO = _compilar_caminho('estabelecimento.complemento')
+_GET_BAIRRO = _compilar_caminho('estabelecimento.bairro')
+_GET_CIDADE = _compilar_caminho('estabelecimento.cidade.nome')
+_GET_ESTADO = _compilar_caminho('estabelecimento.estado.sigla')
+_GET_CEP = _compilar_caminho('estabelecimento.cep')
+_GET_ATIVIDADE_PRINCIPAL = _compilar_caminho('estabelecimento.atividade_principal.descricao')
+_GET_ATIVIDADES_SECUNDARIAS = _compilar_caminho('estabelecimento.atividades_secundarias')
+_GET_DESCRICAO = _compilar_caminho('descricao')
+_GET_CODIGO = _compilar_caminho('codigo')
+_GET_SOCIOS = _compilar_caminho('socios')
+_GET_NOME = _compilar_caminho('nome')
+_GET_QUALIFICACAO = _compilar_caminho('qualificacao.descricao')
+_GET_SIMPLES = _compilar_caminho('simples.simples')
+_GET_MEI = _compilar_caminho('simples.mei')
+
+
+def _json_loads(conteudo: bytes) -> Any:
+    """Decodifica JSON com orjson quando disponível."""
+    if orjson is not None:
+        return orjson.loads(conteudo)
+    return json.loads(conteudo)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serializa para JSON em UTF-8 (bytes), com orjson quando disponível."""
+    if orjson is not None:
+        opcoes = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=opcoes)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+
+def _carregar_indice() -> Dict[str, Dict[str, Any]]:
+    """Carrega o índice do cache em disco: CNPJ -> acessos, tamanho e etag."""
+    try:
+        with open(CACHE_INDEX_FILE, 'rb') as f:
+            return _json_loads(f.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _salvar_indice(indice: Dict[str, Dict[str, Any]]) -> None:
+    """Grava o índice de forma atômica (arquivo temporário + os.replace)."""
+    global _indice_alterado, _indice_salvo_em
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_file = CACHE_INDEX_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(_json_dumps(indice))
+    os.replace(tmp_file, CACHE_INDEX_FILE)
+    _indice_alterado = False
+    _indice_salvo_em = time.monotonic()
+
+
+def _obter_indice() -> Dict[str, Dict[str, Any]]:
+    """Índice em memória, carregado do disco no primeiro uso (chamar com _cache_lock)."""
+    global _indice, _indice_salvo_em
+    if _indice is None:
+        _indice = _carregar_indice()
+        _indice_salvo_em = time.monotonic()
+    return _indice
+
+
+@atexit.register
+def _salvar_indice_pendente() -> None:
+    """Grava os acessos de leitura ainda não salvos (na saída do processo)."""
+    with _cache_lock:
+        if _indice is not None and _indice_alterado:
+            try:
+                _salvar_indice(_indice)
+            except OSError:
+                pass
+
+
+def _registrar_acesso(entrada: Dict[str, Any]) -> None:
+    """Guarda os últimos CACHE_LRU_K horários de acesso de uma entrada."""
+    entrada['acessos'] = (entrada.get('acessos', []) + [time.time()])[-CACHE_LRU_K:]
+
+
+def _despejar_excedente(indice: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Remove entradas até o cache caber em CACHE_MAX_BYTES.
+
+    Usa LRU-k: despeja primeiro quem tem o k-ésimo acesso mais antigo.
+    Entradas acessadas menos de k vezes contam como 0, então uma enxurrada
+    de consultas únicas não expulsa os CNPJs consultados com frequência.
+    """
+    total = sum(entrada.get('tamanho', 0) for entrada in indice.values())
+    if total <= CACHE_MAX_BYTES:
+        return
+    
+    def kesimo_acesso(item):
+        acessos = item[1].get('acessos', [])
+        return acessos[0] if len(acessos) >= CACHE_LRU_K else 0.0
     
+    for cnpj_limpo, entrada in sorted(indice.items(), key=kesimo_acesso):
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(CACHE_DIR / f"{cnpj_limpo}.json")
+        except FileNotFoundError:
+            pass
+        total -= entrada.get('tamanho', 0)
+        del indice[cnpj_limpo]
+
+
+def _ler_cache(cnpj_limpo: str) -> Tuple[Optional[Dict[str, Any]], bool, Optional[str]]:
+    """
+    Lê os dados de um CNPJ do cache em disco.
+
+    Returns:
+        Tupla (dados, fresco, etag). ``dados`` é None se não houver cache;
+        ``fresco`` indica se a entrada ainda está dentro do TTL; ``etag``
+        permite revalidar uma entrada vencida com If-None-Match.
+    """
+    cache_file = CACHE_DIR / f"{cnpj_limpo}.json"
     try:
-        for parte in partes:
-            if isinstance(atual, dict) and parte in atual:
-                atual = atual[parte]
-            else:
-                return padrao
-        return atual if atual is not None else padrao
-    except Exception:
-        return padrao
+        idade = time.time() - cache_file.stat().st_mtime
+        with open(cache_file, 'rb') as f:
+            dados = _json_loads(f.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        # Se o cache tá zoado, ignora e segue o baile
+        return None, False, None
+    
+    entrada = _marcar_leitura(cnpj_limpo, cache_file)
+    return dados, idade < CACHE_TTL_SECONDS, entrada.get('etag')
+
+
+def _marcar_leitura(cnpj_limpo: str, cache_file: Path) -> Dict[str, Any]:
+    """
+    Registra no índice um acesso de leitura a uma entrada do cache.
+
+    Só altera o índice em memória; a gravação fica para a próxima escrita,
+    para o fim do intervalo CACHE_INDEX_SAVE_INTERVAL ou para a saída.
+    """
+    global _indice_alterado
+    with _cache_lock:
+        indice = _obter_indice()
+        entrada = indice.get(cnpj_limpo)
+        if entrada is None:
+            entrada = indice[cnpj_limpo] = {'tamanho': cache_file.stat().st_size}
+        _registrar_acesso(entrada)
+        _indice_alterado = True
+        if time.monotonic() - _indice_salvo_em > CACHE_INDEX_SAVE_INTERVAL:
+            _salvar_indice(indice)
+    return entrada
+
+
+def _gravar_cache(cnpj_limpo: str, dados: Dict[str, Any], etag: Optional[str] = None) -> None:
+    """Grava os dados de um CNPJ no cache em disco e aplica o limite de tamanho."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache_file = CACHE_DIR / f"{cnpj_limpo}.json"
+    with open(cache_file, 'wb') as f:
+        f.write(_json_dumps(dados, indent=True))
+    
+    with _cache_lock:
+        indice = _obter_indice()
+        entrada = indice.setdefault(cnpj_limpo, {})
+        entrada['tamanho'] = cache_file.stat().st_size
+        entrada['etag'] = etag
+        _registrar_acesso(entrada)
+        _despejar_excedente(indice)
+        _salvar_indice(indice)
+
+
+def _renovar_cache(cnpj_limpo: str) -> None:
+    """Marca uma entrada revalidada (304) como fresca novamente."""
+    os.utime(CACHE_DIR / f"{cnpj_limpo}.json")
+
+
+def _processar_resposta(response, cnpj_limpo: str) -> Dict[str, Any]:
+    """Valida a resposta da API (requests ou httpx) e retorna o JSON."""
+    if response.status_code == 404:
+        raise CNPJError(f"CNPJ {formatar_cnpj(cnpj_limpo)} não encontrado na base")
+    
+    response.raise_for_status()  # Levanta exceção para outros erros
+    
+    try:
+        return _json_loads(response.content)
+    except json.JSONDecodeError:
+        raise CNPJError("Erro ao processar resposta da API: formato inválido")
+
+
+def _memorizar(cnpj_limpo: str, dados: Dict[str, Any]) -> Dict[str, Any]:
+    """Guarda o resultado no cache em memória e o devolve."""
+    with _cache_lock:
+        _memoria[cnpj_limpo] = dados
+    return dados
 
 
-@lru_cache(maxsize=128)
 def busca_CNPJ(cnpj: str, usar_cache: bool = True) -> Dict[str, Any]:
     """
     Busca informações de um CNPJ na API pública.
     
+    Os resultados ficam em um cache em memória com TTL e em um cache em
+    disco com TTL e limite de tamanho (LRU-k). Entradas vencidas em disco
+    são revalidadas com If-None-Match.
+    
     Args:
         cnpj: CNPJ a ser consultado (com ou sem pontuação).
         usar_cache: Se True, usa cache local para consultas repetidas.
@@ -150,55 +564,238 @@ def busca_CNPJ(cnpj: str, usar_cache: bool = True) -> Dict[str, Any]:
     Raises:
         CNPJError: Se houver erro na consulta ou CNPJ inválido.
     """
-    try:
-        cnpj_limpo = validar_cnpj(cnpj)
-    except CNPJError as e:
-        raise e
+    cnpj_limpo = validar_cnpj(cnpj)
     
     # Verifica cache
+    dados, fresco, etag = None, False, None
     if usar_cache:
-        os.makedirs(CACHE_DIR, exist_ok=True)
-        cache_file = CACHE_DIR / f"{cnpj_limpo}.json"
+        with _cache_lock:
+            dados = _memoria.get(cnpj_limpo)
+        if dados is not None:
+            return dados
         
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                # Se o cache tá zoado, ignora e segue o baile
-                pass
+        dados, fresco, etag = _ler_cache(cnpj_limpo)
+        if dados is not None and fresco:
+            return _memorizar(cnpj_limpo, dados)
     
     # Faz a requisição à API
     url = f"{API_BASE_URL}/{cnpj_limpo}"
+    headers = {'If-None-Match': etag} if etag else {}
     
     try:
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 404:
-            raise CNPJError(f"CNPJ {formatar_cnpj(cnpj_limpo)} não encontrado na base")
-        
-        response.raise_for_status()  # Levanta exceção para outros erros
-        
-        dados = response.json()
-        
-        # Salva no cache
-        if usar_cache:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(dados, f, ensure_ascii=False, indent=2)
-        
+        response = _session.get(url, headers=headers, timeout=(3.05, 10))
+        if response.status_code == 304 and dados is not None:
+            _renovar_cache(cnpj_limpo)
+            return _memorizar(cnpj_limpo, dados)
+        dados = _processar_resposta(response, cnpj_limpo)
+    except requests.exceptions.RequestException as e:
+        raise CNPJError(f"Erro ao consultar CNPJ: {str(e)}")
+    
+    # Salva no cache em disco; a memória recebe sempre o resultado mais
+    # novo, para uma consulta forçada (usar_cache=False) não deixar uma
+    # entrada antiga valendo até o TTL expirar
+    if usar_cache:
+        _gravar_cache(cnpj_limpo, dados, response.headers.get('ETag'))
+    
+    return _memorizar(cnpj_limpo, dados)
+
+
+def busca_CNPJ_raw(cnpj: str) -> bytes:
+    """
+    Retorna o JSON completo do CNPJ como bytes, sem parse.
+    
+    Se houver entrada fresca no cache em disco, os bytes do arquivo são
+    devolvidos direto, sem json.loads/json.dumps. Caso contrário, consulta
+    via ``busca_CNPJ`` (que grava o cache) e serializa o resultado.
+    
+    Raises:
+        CNPJError: Se houver erro na consulta ou CNPJ inválido.
+    """
+    cnpj_limpo = validar_cnpj(cnpj)
+    cache_file = CACHE_DIR / f"{cnpj_limpo}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime < CACHE_TTL_SECONDS:
+            bruto = cache_file.read_bytes()
+            _marcar_leitura(cnpj_limpo, cache_file)
+            return bruto
+    except FileNotFoundError:
+        pass
+    
+    return _json_dumps(busca_CNPJ(cnpj_limpo), indent=True)
+
+
+async def lookup_cnpj(cnpj: str) -> Dict[str, Any]:
+    """
+    Versão assíncrona de ``busca_CNPJ`` para uso nos handlers do bot.
+
+    Reaproveita o ``httpx.AsyncClient`` do event loop entre chamadas (sem
+    novo handshake TLS por consulta) e compartilha os caches em memória e em
+    disco com ``busca_CNPJ``.
+
+    Args:
+        cnpj: CNPJ a ser consultado (com ou sem pontuação).
+
+    Returns:
+        Dicionário com os dados do CNPJ.
+
+    Raises:
+        CNPJError: Se houver erro na consulta ou CNPJ inválido.
+    """
+    cnpj_limpo = validar_cnpj(cnpj)
+    
+    with _cache_lock:
+        dados = _memoria.get(cnpj_limpo)
+    if dados is not None:
         return dados
     
-    except requests.exceptions.RequestException as e:
+    # O cache em disco é síncrono: roda numa thread para não travar o loop
+    dados, fresco, etag = await asyncio.to_thread(_ler_cache, cnpj_limpo)
+    if dados is not None and fresco:
+        return _memorizar(cnpj_limpo, dados)
+    
+    headers = {'If-None-Match': etag} if etag else {}
+    try:
+        response = await _get_async_client().get(f"{API_BASE_URL}/{cnpj_limpo}", headers=headers)
+        if response.status_code == 304 and dados is not None:
+            await asyncio.to_thread(_renovar_cache, cnpj_limpo)
+            return _memorizar(cnpj_limpo, dados)
+        dados = _processar_resposta(response, cnpj_limpo)
+    except httpx.HTTPError as e:
         raise CNPJError(f"Erro ao consultar CNPJ: {str(e)}")
-    except json.JSONDecodeError:
-        raise CNPJError("Erro ao processar resposta da API: formato inválido")
+    
+    await asyncio.to_thread(_gravar_cache, cnpj_limpo, dados, response.headers.get('ETag'))
+    return _memorizar(cnpj_limpo, dados)
+
+
+async def lookup_cnpjs(cnpjs: List[str]) -> List[Any]:
+    """
+    Consulta vários CNPJs em paralelo.
+    
+    As consultas rodam concorrentemente sobre o mesmo ``httpx.AsyncClient``,
+    então N CNPJs levam mais ou menos o tempo da consulta mais lenta em vez
+    da soma de todas. CNPJs repetidos são consultados uma única vez.
+    
+    Args:
+        cnpjs: Lista de CNPJs (com ou sem pontuação).
+        
+    Returns:
+        Lista na mesma ordem da entrada; cada item é o dicionário com os
+        dados do CNPJ ou a exceção (CNPJError) daquela consulta.
+    """
+    unicos = list(dict.fromkeys(cnpjs))
+    resultados = await asyncio.gather(
+        *(lookup_cnpj(cnpj) for cnpj in unicos),
+        return_exceptions=True
+    )
+    por_cnpj = dict(zip(unicos, resultados))
+    return [por_cnpj[cnpj] for cnpj in cnpjs]
 
 def escape_markdown(text):
     """Escapa caracteres especiais para MarkdownV2 do Telegram."""
-    special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-    for char in special_chars:
-        text = text.replace(char, f"\\{char}")
-    return text
+    return text.translate(_MD2_ESCAPE)
+
+
+# Templates de saída de format_cnpj_info, compilados uma única vez
+_HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Informações de CNPJ - $razao</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        h1 { color: #2c3e50; }
+        h2 { color: #3498db; margin-top: 20px; }
+        .container { max-width: 800px; margin: 0 auto; }
+        .section { margin-bottom: 20px; border-bottom: 1px solid #eee; padding-bottom: 10px; }
+        .label { font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>$razao</h1>
+        
+        <div class="section">
+            <p><span class="label">CNPJ:</span> $cnpj_formatado</p>
+            <p><span class="label">Natureza Jurídica:</span> $natureza</p>
+            <p><span class="label">Porte:</span> $porte</p>
+            <p><span class="label">Capital Social:</span> $capital</p>
+            <p><span class="label">Situação Cadastral:</span> $situacao</p>
+            <p><span class="label">Início das Atividades:</span> $inicio</p>
+        </div>
+        
+        <div class="section">
+            <h2>Endereço</h2>
+            <p>$endereco</p>
+        </div>
+        
+        <div class="section">
+            <h2>Atividade Principal</h2>
+            <p>$atividade_principal</p>
+        </div>
+        
+        <div class="section">
+            <h2>Atividades Secundárias</h2>
+            $atividades_secundarias
+        </div>
+        
+        <div class="section">
+            <h2>Sócios</h2>
+            $socios
+        </div>
+        
+        <div class="section">
+            <h2>Simples Nacional</h2>
+            <p>$simples_str</p>
+        </div>
+    </div>
+</body>
+</html>""")
+
+_TEXT_TEMPLATE = Template("""$razao
+CNPJ: $cnpj_formatado
+Natureza Jurídica: $natureza
+Porte: $porte
+Capital Social: $capital
+Situação Cadastral: $situacao
+Início das Atividades: $inicio
+
+Endereço:
+$endereco
+
+Atividade Principal:
+$atividade_principal
+
+Atividades Secundárias:
+$atividades_secundarias
+
+Sócios:
+$socios
+
+Simples Nacional:
+$simples_str""")
+
+_MD_TEMPLATE = Template("""🏢 **$razao**
+CNPJ: `$cnpj_formatado`
+Natureza Jurídica: $natureza
+Porte: $porte
+Capital Social: $capital
+Situação Cadastral: $situacao
+Início das Atividades: $inicio
+
+📍 **Endereço:**
+$endereco
+
+🛠️ **Atividade Principal:**
+$atividade_principal
+
+📋 **Atividades Secundárias:**
+$atividades_secundarias
+
+👥 **Sócios:**
+$socios
+
+📊 **Simples Nacional:**
+$simples_str""")
 
 
 def format_cnpj_info(data: Dict[str, Any], formato: str = 'markdown') -> str:
@@ -212,28 +809,30 @@ def format_cnpj_info(data: Dict[str, Any], formato: str = 'markdown') -> str:
     Returns:
         String formatada com os dados do CNPJ.
     """
+    formato = formato.lower()
+    
     # Extrai os dados principais
-    razao = obter_valor_seguro(data, 'razao_social')
-    cnpj_bruto = obter_valor_seguro(data, 'estabelecimento.cnpj')
+    cnpj_bruto = _GET_CNPJ(data)
+    razao = _GET_RAZAO(data)
     cnpj_formatado = formatar_cnpj(cnpj_bruto) if cnpj_bruto != "Não informado" else cnpj_bruto
-    natureza = obter_valor_seguro(data, 'natureza_juridica.descricao')
-    porte = obter_valor_seguro(data, 'porte.descricao')
-    capital = formatar_dinheiro(obter_valor_seguro(data, 'capital_social', None))
-    situacao = obter_valor_seguro(data, 'estabelecimento.situacao_cadastral')
-    inicio = formatar_data(obter_valor_seguro(data, 'estabelecimento.data_inicio_atividade', None))
+    natureza = _GET_NATUREZA(data)
+    porte = _GET_PORTE(data)
+    capital = formatar_dinheiro(_GET_CAPITAL(data, None))
+    situacao = _GET_SITUACAO(data)
+    inicio = formatar_data(_GET_INICIO(data, None))
     
     # Constrói o endereço completo
-    tipo_logradouro = obter_valor_seguro(data, 'estabelecimento.tipo_logradouro', '')
-    logradouro = obter_valor_seguro(data, 'estabelecimento.logradouro', '')
-    numero = obter_valor_seguro(data, 'estabelecimento.numero', '')
-    complemento = obter_valor_seguro(data, 'estabelecimento.complemento', '')
-    bairro = obter_valor_seguro(data, 'estabelecimento.bairro', '')
-    cidade = obter_valor_seguro(data, 'estabelecimento.cidade.nome', '')
-    estado = obter_valor_seguro(data, 'estabelecimento.estado.sigla', '')
-    cep_bruto = obter_valor_seguro(data, 'estabelecimento.cep', '')
+    tipo_logradouro = _GET_TIPO_LOGRADOURO(data, '')
+    logradouro = _GET_LOGRADOURO(data, '')
+    numero = _GET_NUMERO(data, '')
+    complemento = _GET_COMPLEMENTO(data, '')
+    bairro = _GET_BAIRRO(data, '')
+    cidade = _GET_CIDADE(data, '')
+    estado = _GET_ESTADO(data, '')
+    cep_bruto = _GET_CEP(data, '')
     
     # Formata o CEP
-    cep = f"{cep_bruto[:5]}-{cep_bruto[5:]}" if len(cep_bruto) == 8 else cep_bruto
+    cep = _CEP_FMT(*cep_bruto) if len(cep_bruto) == 8 else cep_bruto
     
     # Monta o endereço completo
     partes_endereco = []
@@ -270,13 +869,13 @@ def format_cnpj_info(data: Dict[str, Any], formato: str = 'markdown') -> str:
         endereco = "Não informado"
     
     # Atividades
-    atividade_principal = obter_valor_seguro(data, 'estabelecimento.atividade_principal.descricao', "Não informada")
+    atividade_principal = _GET_ATIVIDADE_PRINCIPAL(data, "Não informada")
     atividades_secundarias = []
     
-    for atividade in obter_valor_seguro(data, 'estabelecimento.atividades_secundarias', []):
-        descricao = obter_valor_seguro(atividade, 'descricao')
+    for atividade in _GET_ATIVIDADES_SECUNDARIAS(data, []):
+        descricao = _GET_DESCRICAO(atividade)
         if descricao != "Não informado":
-            codigo = obter_valor_seguro(atividade, 'codigo', '')
+            codigo = _GET_CODIGO(atividade, '')
             if codigo:
                 atividades_secundarias.append(f"{codigo} - {descricao}")
             else:
@@ -284,9 +883,9 @@ def format_cnpj_info(data: Dict[str, Any], formato: str = 'markdown') -> str:
     
     # Formata lista de sócios (corrigindo o bug principal da função original)
     socios_lista = []
-    for socio in obter_valor_seguro(data, 'socios', []):
-        nome = obter_valor_seguro(socio, 'nome')
-        qualificacao = obter_valor_seguro(socio, 'qualificacao.descricao', '')
+    for socio in _GET_SOCIOS(data, []):
+        nome = _GET_NOME(socio)
+        qualificacao = _GET_QUALIFICACAO(socio, '')
         
         if qualificacao:
             socios_lista.append(f"{nome} ({qualificacao})")
@@ -294,8 +893,8 @@ def format_cnpj_info(data: Dict[str, Any], formato: str = 'markdown') -> str:
             socios_lista.append(nome)
     
     # Informações do Simples Nacional
-    simples = obter_valor_seguro(data, 'simples.simples', None)
-    mei = obter_valor_seguro(data, 'simples.mei', None)
+    simples = _GET_SIMPLES(data, None)
+    mei = _GET_MEI(data, None)
     
     simples_info = []
     if simples is not None:
@@ -310,8 +909,21 @@ def format_cnpj_info(data: Dict[str, Any], formato: str = 'markdown') -> str:
         simples_str = "Não informado"
     
     # Formatação em diferentes formatos
-    if formato.lower() == 'json':
-        return json.dumps({
+    campos = {
+        "razao": razao,
+        "cnpj_formatado": cnpj_formatado,
+        "natureza": natureza,
+        "porte": porte,
+        "capital": capital,
+        "situacao": situacao,
+        "inicio": inicio,
+        "endereco": endereco,
+        "atividade_principal": atividade_principal,
+        "simples_str": simples_str,
+    }
+    
+    if formato == 'json':
+        texto = _json_dumps({
             "razao_social": razao,
             "cnpj": cnpj_formatado,
             "natureza_juridica": natureza,
@@ -324,136 +936,30 @@ def format_cnpj_info(data: Dict[str, Any], formato: str = 'markdown') -> str:
             "atividades_secundarias": atividades_secundarias,
             "socios": socios_lista,
             "simples_nacional": simples_str
-        }, ensure_ascii=False, indent=2)
+        }, indent=True).decode('utf-8')
     
-    elif formato.lower() == 'html':
-        atividades_secundarias_html = ""
+    elif formato == 'html':
         if atividades_secundarias:
-            atividades_secundarias_html = "<ul>\n" + "\n".join([f"  <li>{a}</li>" for a in atividades_secundarias]) + "\n</ul>"
+            campos["atividades_secundarias"] = "<ul>\n" + "\n".join(f"  <li>{a}</li>" for a in atividades_secundarias) + "\n</ul>"
         else:
-            atividades_secundarias_html = "<p>Não informadas</p>"
+            campos["atividades_secundarias"] = "<p>Não informadas</p>"
         
-        socios_html = ""
         if socios_lista:
-            socios_html = "<ul>\n" + "\n".join([f"  <li>{s}</li>" for s in socios_lista]) + "\n</ul>"
+            campos["socios"] = "<ul>\n" + "\n".join(f"  <li>{s}</li>" for s in socios_lista) + "\n</ul>"
         else:
-            socios_html = "<p>Não informados</p>"
-        
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Informações de CNPJ - {razao}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; }}
-        h1 {{ color: #2c3e50; }}
-        h2 {{ color: #3498db; margin-top: 20px; }}
-        .container {{ max-width: 800px; margin: 0 auto; }}
-        .section {{ margin-bottom: 20px; border-bottom: 1px solid #eee; padding-bottom: 10px; }}
-        .label {{ font-weight: bold; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>{razao}</h1>
+            campos["socios"] = "<p>Não informados</p>"
         
-        <div class="section">
-            <p><span class="label">CNPJ:</span> {cnpj_formatado}</p>
-            <p><span class="label">Natureza Jurídica:</span> {natureza}</p>
-            <p><span class="label">Porte:</span> {porte}</p>
-            <p><span class="label">Capital Social:</span> {capital}</p>
-            <p><span class="label">Situação Cadastral:</span> {situacao}</p>
-            <p><span class="label">Início das Atividades:</span> {inicio}</p>
-        </div>
-        
-        <div class="section">
-            <h2>Endereço</h2>
-            <p>{endereco}</p>
-        </div>
-        
-        <div class="section">
-            <h2>Atividade Principal</h2>
-            <p>{atividade_principal}</p>
-        </div>
-        
-        <div class="section">
-            <h2>Atividades Secundárias</h2>
-            {atividades_secundarias_html}
-        </div>
-        
-        <div class="section">
-            <h2>Sócios</h2>
-            {socios_html}
-        </div>
-        
-        <div class="section">
-            <h2>Simples Nacional</h2>
-            <p>{simples_str}</p>
-        </div>
-    </div>
-</body>
-</html>"""
-        return html
+        texto = _HTML_TEMPLATE.substitute(campos)
     
-    elif formato.lower() == 'text':
-        # Formatação para texto simples
-        atividades_sec_texto = "\n".join([f"- {a}" for a in atividades_secundarias]) if atividades_secundarias else "Não informadas"
-        socios_texto = "\n".join([f"- {s}" for s in socios_lista]) if socios_lista else "Não informados"
+    else:
+        # Texto simples e Markdown (padrão) usam a mesma estrutura de listas
+        campos["atividades_secundarias"] = "\n".join(f"- {a}" for a in atividades_secundarias) if atividades_secundarias else "Não informadas"
+        campos["socios"] = "\n".join(f"- {s}" for s in socios_lista) if socios_lista else "Não informados"
         
-        return f"""
-{razao}
-CNPJ: {cnpj_formatado}
-Natureza Jurídica: {natureza}
-Porte: {porte}
-Capital Social: {capital}
-Situação Cadastral: {situacao}
-Início das Atividades: {inicio}
-
-Endereço:
-{endereco}
-
-Atividade Principal:
-{atividade_principal}
-
-Atividades Secundárias:
-{atividades_sec_texto}
-
-Sócios:
-{socios_texto}
-
-Simples Nacional:
-{simples_str}
-""".strip()
+        template = _TEXT_TEMPLATE if formato == 'text' else _MD_TEMPLATE
+        texto = template.substitute(campos).strip()
     
-    else:  # Markdown (padrão)
-        # Formatação em markdown
-        atividades_sec_md = "\n".join([f"- {a}" for a in atividades_secundarias]) if atividades_secundarias else "Não informadas"
-        socios_md = "\n".join([f"- {s}" for s in socios_lista]) if socios_lista else "Não informados"
-        
-        return f"""
-🏢 **{razao}**
-CNPJ: `{cnpj_formatado}`
-Natureza Jurídica: {natureza}
-Porte: {porte}
-Capital Social: {capital}
-Situação Cadastral: {situacao}
-Início das Atividades: {inicio}
-
-📍 **Endereço:**
-{endereco}
-
-🛠️ **Atividade Principal:**
-{atividade_principal}
-
-📋 **Atividades Secundárias:**
-{atividades_sec_md}
-
-👥 **Sócios:**
-{socios_md}
-
-📊 **Simples Nacional:**
-{simples_str}
-""".strip()
+    return texto
 
 
 def salvar_resultado(dados: str, cnpj: str, formato: str, diretorio: Optional[str] = None) -> str:
@@ -477,7 +983,7 @@ def salvar_resultado(dados: str, cnpj: str, formato: str, diretorio: Optional[st
     os.makedirs(dir_path, exist_ok=True)
     
     # Define o nome do arquivo
-    cnpj_limpo = re.sub(r'[^0-9]', '', cnpj)
+    cnpj_limpo = cnpj.translate(_SO_DIGITOS)
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"cnpj_{cnpj_limpo}_{timestamp}.{extensao}"
     
@@ -490,24 +996,40 @@ def salvar_resultado(dados: str, cnpj: str, formato: str, diretorio: Optional[st
     return str(filepath)
 
 
+_PARSER: Optional[argparse.ArgumentParser] = None
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """Monta o parser da linha de comando uma única vez e o reaproveita."""
+    global _PARSER
+    if _PARSER is None:
+        parser = argparse.ArgumentParser(description="Consulta e formata dados de CNPJ.")
+        parser.add_argument("cnpj", help="CNPJ a ser consultado (com ou sem pontuação)")
+        parser.add_argument("--formato", "-f", choices=["markdown", "text", "html", "json"], 
+                           default="markdown", help="Formato de saída (padrão: markdown)")
+        parser.add_argument("--salvar", "-s", action="store_true", 
+                           help="Salvar resultado em arquivo")
+        parser.add_argument("--diretorio", "-d", 
+                           help="Diretório para salvar o arquivo (se --salvar for usado)")
+        parser.add_argument("--nocache", action="store_true", 
+                           help="Não usar cache (sempre consultar a API)")
+        parser.add_argument("--bruto", action="store_true",
+                           help="Com --formato json, imprime o JSON completo da API sem reformatar")
+        _PARSER = parser
+    return _PARSER
+
+
 def main() -> None:
     """Função principal para execução como script."""
-    parser = argparse.ArgumentParser(description="Consulta e formata dados de CNPJ.")
-    parser.add_argument("cnpj", help="CNPJ a ser consultado (com ou sem pontuação)")
-    parser.add_argument("--formato", "-f", choices=["markdown", "text", "html", "json"], 
-                       default="markdown", help="Formato de saída (padrão: markdown)")
-    parser.add_argument("--salvar", "-s", action="store_true", 
-                       help="Salvar resultado em arquivo")
-    parser.add_argument("--diretorio", "-d", 
-                       help="Diretório para salvar o arquivo (se --salvar for usado)")
-    parser.add_argument("--nocache", action="store_true", 
-                       help="Não usar cache (sempre consultar a API)")
-    
-    args = parser.parse_args()
+    args = _get_parser().parse_args()
     
     try:
-        dados = busca_CNPJ(args.cnpj, not args.nocache)
-        resultado = format_cnpj_info(dados, args.formato)
+        if args.bruto and args.formato == "json" and not args.nocache:
+            # Caminho rápido: bytes do cache direto, sem parse nem projeção
+            resultado = busca_CNPJ_raw(args.cnpj).decode('utf-8')
+        else:
+            dados = busca_CNPJ(args.cnpj, not args.nocache)
+            resultado = format_cnpj_info(dados, args.formato)
         
         if args.salvar:
             filepath = salvar_resultado(resultado, args.cnpj, args.formato, args.diretorio)
@@ -5,6 +5,12 @@ from pathlib import Path
 import logging
 from typing import Dict, Any, Optional, List, Union
 import threading
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele, usa o json da stdlib
+    orjson = None
 
 logger = logging.getLogger("ConfigManager")
 
@@ -72,13 +78,16 @@ class ConfigManager:
             return
             
         self._configs = {}
+        self._snapshot = MappingProxyType(self._configs)
         self._initialized = True
         self._load_config()
         
         # Inicializa com valores padrão se não existirem
+        configs = dict(self._configs)
         for key, config in EDITABLE_CONFIGS.items():
-            if key not in self._configs:
-                self._configs[key] = config["default"]
+            if key not in configs:
+                configs[key] = config["default"]
+        self._publicar(configs)
         
         # Salva para garantir que temos um arquivo atualizado
         self._save_config()
@@ -88,19 +97,34 @@ class ConfigManager:
         """Carrega configurações do arquivo"""
         try:
             if CONFIG_FILE.exists():
-                with open(CONFIG_FILE, "r") as f:
-                    self._configs = json.load(f)
+                with open(CONFIG_FILE, "rb") as f:
+                    conteudo = f.read()
+                self._publicar(orjson.loads(conteudo) if orjson else json.loads(conteudo))
                 logger.info(f"Configurações carregadas de {CONFIG_FILE}")
             else:
                 logger.info("Arquivo de configuração não encontrado, usando valores padrão")
         except Exception as e:
             logger.error(f"Erro ao carregar configurações: {e}")
     
+    def _publicar(self, configs: Dict[str, Any]):
+        """
+        Troca o dicionário de configurações por um novo, sem mutar o atual.
+        
+        Leitores usam o snapshot imutável sem lock; a troca de referência
+        é atômica, então nunca veem um dicionário pela metade.
+        """
+        self._configs = configs
+        self._snapshot = MappingProxyType(configs)
+    
     def _save_config(self):
         """Salva configurações para o arquivo"""
         try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(self._configs, f, indent=2)
+            if orjson:
+                conteudo = orjson.dumps(self._configs, option=orjson.OPT_INDENT_2)
+            else:
+                conteudo = json.dumps(self._configs, indent=2).encode("utf-8")
+            with open(CONFIG_FILE, "wb") as f:
+                f.write(conteudo)
             logger.info(f"Configurações salvas em {CONFIG_FILE}")
             return True
         except Exception as e:
@@ -109,7 +133,7 @@ class ConfigManager:
     
     def get(self, key: str, default=None):
         """Obtém uma configuração pelo nome"""
-        return self._configs.get(key, default)
+        return self._snapshot.get(key, default)
     
     def set(self, key: str, value: Any) -> bool:
         """Define uma configuração e salva"""
@@ -148,21 +172,21 @@ class ConfigManager:
             return False
             
         # Salva o valor
-        self._configs[key] = value
+        self._publicar({**self._configs, key: value})
         return self._save_config()
     
     def get_all(self) -> Dict[str, Any]:
         """Retorna todas as configurações"""
-        return self._configs.copy()
+        return dict(self._snapshot)
     
     def reset(self, key: Optional[str] = None) -> bool:
         """Reseta uma ou todas as configurações para os valores padrão"""
         if key is None:
             # Reset all
-            self._configs = {k: cfg["default"] for k, cfg in EDITABLE_CONFIGS.items()}
+            self._publicar({k: cfg["default"] for k, cfg in EDITABLE_CONFIGS.items()})
         elif key in EDITABLE_CONFIGS:
             # Reset specific key
-            self._configs[key] = EDITABLE_CONFIGS[key]["default"]
+            self._publicar({**self._configs, key: EDITABLE_CONFIGS[key]["default"]})
         else:
             return False
             
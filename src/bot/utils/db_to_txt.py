@@ -17,30 +17,61 @@ import sqlite3
 import sys
 import os
 import datetime
+import itertools
 from pathlib import Path
 
+# Linhas lidas por vez do cursor durante a exportação
+FETCH_SIZE = 500
+
+# Largura reservada no cabeçalho para o total, preenchido no fim da exportação
+TOTAL_WIDTH = 12
+
+# ORDER BY não aceita parâmetro: só estes valores entram na query
+ORDERS = {"ASC": "ASC", "DESC": "DESC"}
+
 def connect_db(db_name="engenharia_bot.db"):
     """Conecta ao banco de dados SQLite e retorna a conexão."""
     try:
         conn = sqlite3.connect(db_name)
         conn.row_factory = sqlite3.Row  # Para acessar colunas pelo nome
+        
+        # WAL deixa ler enquanto o bot escreve; mmap evita cópias na leitura
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        
+        # Mesmo índice criado pelo Database: ORDER BY timestamp + LIMIT
+        # vira uma leitura do índice em vez de varrer e ordenar a tabela
+        try:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp)")
+        except sqlite3.OperationalError:
+            pass  # Banco sem a tabela messages: get_messages reporta o erro
         return conn
     except sqlite3.Error as e:
         print(f"Erro ao conectar ao banco: {e}")
         sys.exit(1)
 
 def get_messages(conn, limit=50, order="DESC"):
-    """Busca mensagens no banco de dados."""
+    """
+    Busca mensagens no banco de dados.
+    
+    Retorna o cursor em vez de uma lista, para que as linhas sejam lidas
+    em lotes durante a exportação. A data já vem formatada pelo SQLite
+    na coluna time_str.
+    """
+    order = ORDERS.get(str(order).upper(), "DESC")
     try:
         cursor = conn.cursor()
+        cursor.arraysize = FETCH_SIZE
         cursor.execute(f"""
             SELECT id, user_id, role, content, chat_id, 
-                  timestamp, category, importance, embedding_id
+                  timestamp, category, importance, embedding_id,
+                  strftime('%d/%m/%Y %H:%M:%S', timestamp) AS time_str
             FROM messages
             ORDER BY timestamp {order}
-            LIMIT {limit}
-        """)
-        return cursor.fetchall()
+            LIMIT ?
+        """, (int(limit),))
+        return cursor
     except sqlite3.Error as e:
         print(f"Erro ao buscar mensagens: {e}")
         return []
@@ -51,12 +82,8 @@ def format_message(message, show_id=True):
     category = message["category"] or "sem categoria"
     importance = message["importance"] or "0"
     
-    # Formata a data/hora
-    try:
-        timestamp = datetime.datetime.fromisoformat(message["timestamp"])
-        time_str = timestamp.strftime("%d/%m/%Y %H:%M:%S")
-    except (ValueError, TypeError):
-        time_str = message["timestamp"] or "desconhecido"
+    # Data/hora formatada pelo SQLite (NULL se o timestamp for inválido)
+    time_str = message["time_str"] or message["timestamp"] or "desconhecido"
     
     # ID da mensagem (opcional)
     id_str = f"[ID: {message['id']}] " if show_id else ""
@@ -71,18 +98,43 @@ def format_message(message, show_id=True):
     return header + content
 
 def save_to_file(messages, filename="db_messages.txt"):
-    """Salva as mensagens em um arquivo de texto."""
+    """
+    Salva as mensagens em um arquivo de texto.
+    
+    Aceita o cursor de get_messages (lido em lotes com fetchmany) ou uma
+    lista. Cada lote é formatado e gravado assim que chega, sem manter a
+    exportação inteira em memória; o total do cabeçalho é preenchido no fim.
+    
+    Returns:
+        int: Número de mensagens exportadas
+    """
+    if hasattr(messages, "fetchmany"):
+        batches = iter(lambda: messages.fetchmany(FETCH_SIZE), [])
+    else:
+        batches = iter([messages])
+    
+    # Sem nenhuma mensagem o arquivo nem é criado
+    first = next((batch for batch in batches if batch), None)
+    if first is None:
+        return 0
+    
+    total = 0
     try:
-        with open(filename, "w", encoding="utf-8") as file:
-            file.write(f"MENSAGENS DO BANCO DE DADOS - {datetime.datetime.now()}\n")
-            file.write(f"Total de registros: {len(messages)}\n\n")
+        with open(filename, "w", encoding="utf-8", buffering=1 << 20) as file:
+            file.write(f"MENSAGENS DO BANCO DE DADOS - {datetime.datetime.now()}\n"
+                       "Total de registros: ")
+            total_pos = file.tell()
+            file.write(" " * TOTAL_WIDTH + "\n\n")
             
-            for msg in messages:
-                file.write(format_message(msg))
-                file.write("\n\n")
+            for batch in itertools.chain([first], batches):
+                file.writelines(format_message(msg) + "\n\n" for msg in batch)
+                total += len(batch)
+            
+            file.seek(total_pos)
+            file.write(f"{total:<{TOTAL_WIDTH}}")
                 
         print(f"✅ Arquivo salvo com sucesso: {filename}")
-        print(f"   {len(messages)} mensagens exportadas.")
+        print(f"   {total} mensagens exportadas.")
         
         # Mostra o caminho completo do arquivo
         abs_path = os.path.abspath(filename)
@@ -90,6 +142,8 @@ def save_to_file(messages, filename="db_messages.txt"):
         
     except Exception as e:
         print(f"❌ Erro ao salvar arquivo: {e}")
+    
+    return total
 
 def parse_args():
     """Processa argumentos da linha de comando."""
@@ -136,15 +190,14 @@ def main():
     print(f"🔍 Buscando mensagens (limit: {args['limit']}, order: {args['order']})")
     messages = get_messages(conn, args["limit"], args["order"])
     
-    if not messages:
-        print("❌ Nenhuma mensagem encontrada no banco de dados.")
-        return
-    
-    print(f"📝 Formatando e salvando {len(messages)} mensagens...")
-    save_to_file(messages, args["output"])
+    print("📝 Formatando e salvando mensagens...")
+    total = save_to_file(messages, args["output"])
     
     # Fecha a conexão
     conn.close()
+    
+    if not total:
+        print("❌ Nenhuma mensagem encontrada no banco de dados.")
 
 if __name__ == "__main__":
     print("\n🤖 DB to TXT - Visualizador de mensagens\n")
@@ -1,10 +1,15 @@
 # utils/image_processor.py
+import os
 import cv2
 import numpy as np
 import logging
 
 logger = logging.getLogger('ImageProcessor')
 
+# Habilita os caminhos otimizados (SIMD/IPP) e usa todos os núcleos
+cv2.setUseOptimized(True)
+cv2.setNumThreads(os.cpu_count() or 1)
+
 def preprocess_image(image_path: str) -> np.ndarray:
     """
     Pré-processa a imagem para melhorar a qualidade do OCR.
@@ -16,11 +21,11 @@ def preprocess_image(image_path: str) -> np.ndarray:
         np.ndarray: Imagem processada
     """
     try:
-        # Lê a imagem
-        image = cv2.imread(image_path)
-        
-        # Converte para escala de cinza
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        # Lê a imagem já em escala de cinza (pula a decodificação colorida)
+        gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            # imread não levanta erro: retorna None se não conseguir ler
+            raise ValueError(f"Não foi possível ler a imagem: {image_path}")
         
         # Aplica threshold adaptativo
         threshold = cv2.adaptiveThreshold(
@@ -29,8 +34,9 @@ def preprocess_image(image_path: str) -> np.ndarray:
             cv2.THRESH_BINARY, 11, 2
         )
         
-        # Remove ruído
-        denoised = cv2.fastNlMeansDenoising(threshold)
+        # Remove ruído: após o threshold a imagem é binária, então um filtro
+        # de mediana 3x3 limpa o sal-e-pimenta bem mais rápido que o NLM
+        denoised = cv2.medianBlur(threshold, 3)
         
         logger.info(f"Imagem {image_path} pré-processada com sucesso")
         return denoised
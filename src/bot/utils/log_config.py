@@ -1,6 +1,9 @@
 # src/bot/utils/log_config.py
+import atexit
 import logging
+import logging.handlers
 import os
+import re
 from datetime import datetime
 from pathlib import Path
 from rich.logging import RichHandler
@@ -32,12 +35,23 @@ custom_theme = Theme({
 
 console = Console(theme=custom_theme)
 
+# Registros do arquivo de log são acumulados e gravados em lote; ERROR ou
+# acima força a gravação imediata
+LOG_BUFFER_CAPACITY = 1024
+_file_buffer = None
+
+# Ping de getUpdates sem novidades (uma única busca em vez de dois "in")
+_PING_RE = re.compile(r"getUpdates.*HTTP/1\.1 200 OK")
+
 class CustomFilter(logging.Filter):
     """Filtra mensagens de ping de atualização."""
     
     def filter(self, record):
-        # Se for um ping de GetUpdates sem novas mensagens, filtra
-        if "getUpdates" in getattr(record, 'msg', '') and "HTTP/1.1 200 OK" in getattr(record, 'msg', ''):
+        msg = record.msg
+        if not isinstance(msg, str) or "HTTP" not in msg:
+            return True
+        # O httpx loga a URL e o status nos args; só formata quem pode ser ping
+        if _PING_RE.search(record.getMessage() if record.args else msg):
             return False
         return True
 
@@ -79,65 +93,86 @@ def setup_logging():
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(CustomFormatter())
     
+    # Buffer na frente do arquivo: um write por lote em vez de um por registro
+    global _file_buffer
+    _file_buffer = logging.handlers.MemoryHandler(
+        capacity=LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=file_handler
+    )
+    _file_buffer.setLevel(logging.DEBUG)
+    atexit.register(_file_buffer.flush)
+    
     # Configura o logger raiz
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
     root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(_file_buffer)
     
     # Registra início da sessão
-    logging.info(f"Sessão iniciada: {current_time}", extra={"category": "SYSTEM"})
-    logging.info(f"Log sendo salvo em: {LOG_FILE}", extra={"category": "SYSTEM"})
+    logging.info("Sessão iniciada: %s", current_time, extra={"category": "SYSTEM"})
+    logging.info("Log sendo salvo em: %s", LOG_FILE, extra={"category": "SYSTEM"})
+
+# Loggers já configurados por get_logger e a categoria de cada um
+_logger_cache = {}
+_name_to_category = {}
+
+_base_record_factory = logging.getLogRecordFactory()
+
+def _record_factory(*args, **kwargs):
+    """Adiciona a categoria do logger (se registrada via get_logger) ao record."""
+    record = _base_record_factory(*args, **kwargs)
+    category = _name_to_category.get(record.name)
+    if category is not None:
+        record.category = category
+    return record
+
+# Instalada uma única vez; a categoria é resolvida pelo nome do logger
+logging.setLogRecordFactory(_record_factory)
 
 def get_logger(name, category=None):
     """Obtém um logger com categoria personalizada."""
-    logger = logging.getLogger(name)
+    logger = _logger_cache.get(name)
+    if logger is not None and category is None:
+        return logger
     
     # Define a categoria padrão baseada no nome se não fornecida
     if category is None:
-        if "db" in name.lower():
+        lowered = name.lower()
+        if "db" in lowered:
             category = "DB"
-        elif "memory" in name.lower():
+        elif "memory" in lowered:
             category = "MEMORY"
-        elif "api" in name.lower() or "http" in name.lower():
+        elif "api" in lowered or "http" in lowered:
             category = "API"
-        elif "auth" in name.lower():
+        elif "auth" in lowered:
             category = "AUTH"
-        elif "handler" in name.lower() or "telegram" in name.lower():
+        elif "handler" in lowered or "telegram" in lowered:
             category = "MSG"
         else:
             category = "SYSTEM"
     
-    # Customiza o logger para incluir a categoria
-    old_factory = logging.getLogRecordFactory()
-    
-    def record_factory(*args, **kwargs):
-        record = old_factory(*args, **kwargs)
-        record.category = category
-        return record
-    
-    logging.setLogRecordFactory(record_factory)
+    _name_to_category[name] = category
+    logger = _logger_cache[name] = logging.getLogger(name)
     return logger
 
 def export_log_summary():
     """Exporta um resumo do log atual, pronto para enviar no Telegram."""
     
-    # Lê o log completo
-    with open(LOG_FILE, "r") as f:
-        log_lines = f.readlines()
-    
-    # Filtra os pings e outros logs menos importantes
-    filtered_lines = []
-    for line in log_lines:
-        if "getUpdates" in line and "HTTP/1.1 200 OK" in line:
-            continue
-        if "[SYSTEM]" in line and "Log sendo salvo" in line:
-            continue
-        filtered_lines.append(line)
+    # Grava o que ainda está no buffer antes de ler o arquivo
+    if _file_buffer is not None:
+        _file_buffer.flush()
     
-    # Cria um arquivo resumido
+    # Filtra os pings e outros logs menos importantes, linha a linha:
+    # a memória usada não depende do tamanho do log
     summary_file = LOG_DIR / f"summary_{current_time}.txt"
-    with open(summary_file, "w") as f:
-        f.write("".join(filtered_lines))
-    
-    return str(summary_file)
\ No newline at end of file
+    with open(LOG_FILE, "r", buffering=1 << 16) as src, \
+         open(summary_file, "w", buffering=1 << 16) as dst:
+        for line in src:
+            if "getUpdates" in line and "HTTP/1.1 200 OK" in line:
+                continue
+            if "[SYSTEM]" in line and "Log sendo salvo" in line:
+                continue
+            dst.write(line)
+    
+    return str(summary_file)
@@ -1,5 +1,9 @@
 # notion_sync.py
 import logging
+import threading
+import httpx
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bot.database.db_init import Database
 from config.config import Config
 from notion_client import Client
@@ -7,6 +11,49 @@ from bot.utils.data_utils import normalize_message  # Importe a função
 
 logger = logging.getLogger('NotionSync')
 
+# Limite da API do Notion: ~3 requisições por segundo por integração
+NOTION_REQUESTS_PER_SECOND = 3
+NOTION_MAX_WORKERS = 3
+NOTION_MAX_RETRIES = 3
+
+
+class _RateLimiter:
+    """Espaça as chamadas (de qualquer thread) para no máximo `rate` por segundo."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _number_property(value):
+    return {"number": value}
+
+
+def _rich_text_property(value):
+    return {"rich_text": [{"text": {"content": value}}]}
+
+
+def _title_property(value):
+    return {"title": [{"text": {"content": value}}]}
+
+
+def _property_builder(value_type):
+    """Escolhe o builder de propriedade do Notion para um tipo Python."""
+    if issubclass(value_type, int):
+        return _number_property
+    if issubclass(value_type, str):
+        return _rich_text_property
+    return _title_property
+
 
 class NotionClient:
     """
@@ -15,15 +62,37 @@ class NotionClient:
 
     def __init__(self, notion_token, database_id):
         self.notion_token = notion_token
-        self.client = Client(auth=self.notion_token)
+        # Um único pool HTTP com keep-alive para todo o sync (as threads do
+        # sync_all compartilham as conexões já abertas)
+        self._http = httpx.Client(
+            timeout=30,
+            limits=httpx.Limits(max_connections=NOTION_MAX_WORKERS * 2, max_keepalive_connections=8)
+        )
+        self.client = Client(auth=self.notion_token, client=self._http)
         self.database_id = database_id
+        # Nomes das propriedades do database; buscado uma vez por sync
+        self._schema_cache = None
+        # Conjuntos de chaves de mensagem já conferidos contra o schema
+        self._validated_keysets = set()
+        self._rate_limiter = _RateLimiter(NOTION_REQUESTS_PER_SECOND)
+        # (campo, tipo) de cada mensagem -> lista de (campo, builder)
+        self._page_builders = {}
         self.base_url = "https://api.notion.com/v1/pages"
         self.headers = {
             "Authorization": f"Bearer {self.notion_token}",
             "Notion-Version": "2022-06-28",
             "Content-Type": "application/json"
         }
-        logger.info(f"Inicializando NotionClient com database_id: {database_id}")
+        logger.info("Inicializando NotionClient com database_id: %s", database_id)
+
+    def close(self):
+        """Fecha o pool de conexões HTTP."""
+        self._http.close()
+
+    def __del__(self):
+        http = getattr(self, "_http", None)
+        if http is not None:
+            http.close()
 
     def _create_notion_property(self, property_name: str, property_type: str):
       """
@@ -37,7 +106,7 @@ class NotionClient:
          bool: True se a propriedade foi criada com sucesso, False caso contrário.
       """
       try:
-          logger.info(f"Criando propriedade: {property_name} ({property_type})")
+          logger.info("Criando propriedade: %s (%s)", property_name, property_type)
           payload = {
               "properties": {
                   property_name: {
@@ -50,34 +119,50 @@ class NotionClient:
               **payload
           )
           if response:
-            logger.debug(f"Propriedade {property_name} do tipo {property_type} criada com sucesso!")
+            logger.debug("Propriedade %s do tipo %s criada com sucesso!", property_name, property_type)
             return True
           else:
-              logger.error(f"Erro ao criar propriedade: {property_name}")
+              logger.error("Erro ao criar propriedade: %s", property_name)
               return False
       except Exception as e:
-          logger.error(f"Erro ao criar propriedade {property_name}: {e}", exc_info=True)
+          logger.error("Erro ao criar propriedade %s: %s", property_name, e, exc_info=True)
           return False
 
     def create_properties(self, message: dict):
         """
         Cria as propriedades de uma mensagem no Notion database caso elas não existam.
 
+        O schema do database é consultado só na primeira chamada e mantido
+        em cache; propriedades criadas depois são adicionadas ao cache.
+        Mensagens com o mesmo conjunto de chaves de uma já conferida saem
+        direto, sem nenhuma verificação.
+
         Args:
             message (dict): Dicionário contendo os dados da mensagem (ex.: user_id, role, content, etc).
         """
+        keys = frozenset(message)
+        if keys in self._validated_keysets:
+            return
         try:
-            logger.info(f"Verificando propriedades do database: {self.database_id}")
-            database_properties = self.client.databases.retrieve(database_id=self.database_id).get("properties")
+            if self._schema_cache is None:
+                logger.info("Verificando propriedades do database: %s", self.database_id)
+                database_properties = self.client.databases.retrieve(database_id=self.database_id).get("properties")
+                self._schema_cache = set(database_properties)
             for property_name, value in message.items():
-                if property_name not in database_properties:
+                if property_name not in self._schema_cache:
                     if isinstance(value, (int, float)):
-                        self._create_notion_property(property_name, "number")
+                        created = self._create_notion_property(property_name, "number")
                     elif isinstance(value, str):
-                        self._create_notion_property(property_name, "rich_text")
+                        created = self._create_notion_property(property_name, "rich_text")
+                    else:
+                        created = False
+                    if created:
+                        self._schema_cache.add(property_name)
+            if keys <= self._schema_cache:
+                self._validated_keysets.add(keys)
             logger.debug("Propriedades verificadas e criadas com sucesso!")
         except Exception as e:
-            logger.error(f"Erro ao verificar propriedades do database: {e}", exc_info=True)
+            logger.error("Erro ao verificar propriedades do database: %s", e, exc_info=True)
 
 
     def create_page(self, message: dict):
@@ -88,27 +173,40 @@ class NotionClient:
             message (dict): Dicionário contendo os dados da mensagem (ex.: user_id, role, content, etc).
         """
         try:
-            logger.info(f"Criando página no Notion com mensagem: {message}")
-            properties = {}
-            for key, value in message.items():
-                if isinstance(value, int):
-                    properties[key] = {"number": value}
-                elif isinstance(value, str):
-                   properties[key] = {"rich_text": [{"text": {"content": value}}]}
-                else:
-                    properties[key] = {"title": [{"text": {"content": value}}]}
+            logger.info("Criando página no Notion com mensagem: %s", message)
+            # Os builders são montados uma vez por formato de mensagem; um
+            # tipo diferente em algum campo gera outra chave e outro plano
+            schema = tuple((key, type(value)) for key, value in message.items())
+            builders = self._page_builders.get(schema)
+            if builders is None:
+                builders = [(key, _property_builder(value_type)) for key, value_type in schema]
+                self._page_builders[schema] = builders
+            properties = {key: build(message[key]) for key, build in builders}
             
             new_page = {
                 "parent": {"database_id": self.database_id},
                 "properties": properties
             }
-            response = self.client.pages.create(**new_page)
+            for attempt in range(NOTION_MAX_RETRIES + 1):
+                self._rate_limiter.wait()
+                try:
+                    response = self.client.pages.create(**new_page)
+                    break
+                except Exception as e:
+                    # 429 = rate limit: espera com backoff exponencial e tenta de novo
+                    if getattr(e, "status", None) != 429 or attempt == NOTION_MAX_RETRIES:
+                        raise
+                    logger.warning("Rate limit do Notion, tentando de novo em %ss", 2 ** attempt)
+                    time.sleep(2 ** attempt)
             if response:
-                logger.info(f"Página no Notion criada com sucesso: {response}")
+                logger.info("Página no Notion criada com sucesso: %s", response)
             else:
-                logger.error(f"Falha ao criar página no Notion com mensagem {message}")
+                logger.error("Falha ao criar página no Notion com mensagem %s", message)
         except Exception as e:
-            logger.error(f"Falha ao criar página no Notion com mensagem {message}: {e}", exc_info=True)
+            # O schema pode ter mudado (propriedade removida): busca de novo na próxima
+            self._schema_cache = None
+            self._validated_keysets.clear()
+            logger.error("Falha ao criar página no Notion com mensagem %s: %s", message, e, exc_info=True)
 
 class NotionSync:
     """
@@ -133,15 +231,31 @@ class NotionSync:
             self.notion_client.create_page(message)
             logger.info("Mensagem sincronizada com sucesso")
         except Exception as e:
-            logger.error(f"Falha ao sincronizar mensagem: {message}: {e}", exc_info=True)
+            logger.error("Falha ao sincronizar mensagem: %s: %s", message, e, exc_info=True)
 
     def sync_all(self, messages: list):
-        """Sincroniza todas as mensagens."""
+        """
+        Sincroniza todas as mensagens.
+
+        As propriedades são verificadas antes, em série (o schema fica em
+        cache). As páginas são criadas em paralelo, respeitando o rate
+        limit do Notion.
+        """
         for msg in messages:
             try:
-                self.sync_message(msg)
+                self.notion_client.create_properties(msg)
             except Exception as e:
-                logger.error(f"Falha ao sincronizar mensagem {msg}: {e}")
+                logger.error("Falha ao verificar propriedades da mensagem %s: %s", msg, e)
+
+        with ThreadPoolExecutor(max_workers=NOTION_MAX_WORKERS) as executor:
+            futures = {executor.submit(self.notion_client.create_page, msg): msg for msg in messages}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error("Falha ao sincronizar mensagem %s: %s", futures[future], e)
+
+        logger.info("%s mensagens sincronizadas", len(messages))
 
 
 def main():
@@ -156,10 +270,13 @@ def main():
         messages_raw = database.execute_query("SELECT user_id, role, content FROM messages")
         messages = [normalize_message(row) for row in messages_raw]
         notion_sync = NotionSync(notion_token=notion_token, database_id=database_id)
-        notion_sync.sync_all(messages)
+        try:
+            notion_sync.sync_all(messages)
+        finally:
+            notion_sync.notion_client.close()
         logger.info("Sincronização concluída com sucesso")
     except Exception as e:
-        logger.error(f"Erro durante sincronização: {e}", exc_info=True)
+        logger.error("Erro durante sincronização: %s", e, exc_info=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
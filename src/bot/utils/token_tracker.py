@@ -1,13 +1,30 @@
 # src/bot/utils/token_tracker.py
+import io
 import json
+import os
+import atexit
+import time
 from pathlib import Path
 import threading
 import datetime
 from typing import Dict, List, Tuple, Optional
 import logging
 
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele, usa o json da stdlib
+    orjson = None
+
 logger = logging.getLogger("TokenTracker")
 
+# Gravação em disco: no máximo uma a cada FLUSH_INTERVAL segundos durante o
+# track; um timer em segundo plano grava o que sobrar a cada FLUSH_PERIOD
+FLUSH_INTERVAL = 5.0
+FLUSH_PERIOD = 10.0
+
+# Tamanho máximo da prévia da query guardada em cada request
+QUERY_PREVIEW_CHARS = 100
+
 # Custos aproximados (por 1000 tokens)
 TOKEN_COSTS = {
     "openai": {
@@ -21,6 +38,22 @@ TOKEN_COSTS = {
     }
 }
 
+# Custo por token (já dividido por 1000), indexado por (provedor, modelo)
+_RATE_TABLE = {
+    (provider, model): (rates["input"] / 1000, rates["output"] / 1000)
+    for provider, models in TOKEN_COSTS.items()
+    for model, rates in models.items()
+}
+
+# Estimativa genérica para modelos sem preço conhecido
+_DEFAULT_RATES = (0.001 / 1000, 0.002 / 1000)
+
+def _iso(timestamp) -> str:
+    """Formata um timestamp (epoch ou ISO já pronto, de arquivos antigos) em ISO."""
+    if isinstance(timestamp, str):
+        return timestamp
+    return datetime.datetime.fromtimestamp(timestamp).isoformat()
+
 class TokenTracker:
     """Rastreia o uso de tokens e custos estimados"""
     
@@ -43,29 +76,47 @@ class TokenTracker:
         self.data_dir = Path("data/usage")
         self.data_dir.mkdir(exist_ok=True, parents=True)
         
-        # Formato: YYYY-MM-DD.json
+        # Formato: YYYY-MM-DD.json (agregado) + YYYY-MM-DD.jsonl (eventos)
         today = datetime.datetime.now().strftime("%Y-%m-%d")
         self.current_file = self.data_dir / f"{today}.json"
+        self.events_file = self.data_dir / f"{today}.jsonl"
+        self._tmp_file = self.current_file.with_suffix(".json.tmp")
         
         self.usage = {
             "total_tokens": {"input": 0, "output": 0},
             "total_cost": 0.0,
             "providers": {},
-            "sessions": []
+            "sessions": [],
+            "events_offset": 0
         }
         
         self._load_usage()
+        # Índice id -> sessão (evita varrer a lista a cada track)
+        self._sessions_by_id = {s["id"]: s for s in self.usage["sessions"]}
+        self._replay_events()
+        
+        # Log de eventos só-acréscimo: cada track grava uma linha pequena
+        # (newline="\n": sem tradução de fim de linha, o offset em bytes bate)
+        self._events = open(self.events_file, "a", encoding="utf-8", newline="\n", buffering=1 << 16)
+        self._dirty = False
+        self._last_flush = time.monotonic()
         self._initialized = True
         
         # Cria uma nova sessão
         self._session_id = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        self.usage["sessions"].append({
+        self._current_session = {
             "id": self._session_id,
             "start_time": datetime.datetime.now().isoformat(),
             "tokens": {"input": 0, "output": 0},
             "cost": 0.0,
             "requests": []
-        })
+        }
+        self.usage["sessions"].append(self._current_session)
+        self._sessions_by_id[self._session_id] = self._current_session
+        
+        # Garante que nada fique só em memória: timer periódico + saída do processo
+        atexit.register(self.flush)
+        self._schedule_flush()
         
         logger.info("TokenTracker inicializado")
     
@@ -73,89 +124,173 @@ class TokenTracker:
         """Carrega dados de uso do arquivo atual"""
         try:
             if self.current_file.exists():
-                with open(self.current_file, "r") as f:
-                    self.usage = json.load(f)
-                logger.info(f"Dados de uso carregados de {self.current_file}")
+                content = self.current_file.read_bytes()
+                self.usage = orjson.loads(content) if orjson else json.loads(content)
+                logger.info("Dados de uso carregados de %s", self.current_file)
         except Exception as e:
-            logger.error(f"Erro ao carregar dados de uso: {e}")
+            logger.error("Erro ao carregar dados de uso: %s", e)
+    
+    def _replay_events(self):
+        """
+        Reaplica eventos do log que ainda não entraram no agregado.
+        
+        O agregado é gravado periodicamente; se o processo cair entre dois
+        flushes, os eventos que faltam são recuperados do arquivo .jsonl.
+        A posição é guardada em bytes (``events_offset``): linhas corrompidas
+        no meio do log são puladas e uma última linha incompleta (queda no
+        meio da escrita) é cortada do arquivo antes de novos acréscimos.
+        """
+        if not self.events_file.exists():
+            return
+        
+        replayed = 0
+        with open(self.events_file, "r+b") as f:
+            if "events_offset" in self.usage:
+                f.seek(self.usage["events_offset"])
+            else:
+                # Agregado antigo: contava linhas (events_applied)
+                for _ in range(self.usage.pop("events_applied", 0)):
+                    f.readline()
+            
+            offset = f.tell()
+            for line in iter(f.readline, b""):
+                if not line.endswith(b"\n"):
+                    logger.warning("Linha incompleta no fim de %s descartada", self.events_file)
+                    f.truncate(offset)
+                    break
+                try:
+                    event = orjson.loads(line) if orjson else json.loads(line)
+                except (ValueError, TypeError):  # orjson.JSONDecodeError herda de ValueError
+                    logger.warning("Linha corrompida em %s (byte %s) ignorada", self.events_file, offset)
+                else:
+                    self._apply_event(event)
+                    replayed += 1
+                offset += len(line)
+            self.usage["events_offset"] = offset
+        
+        if replayed:
+            logger.info("%s eventos de uso recuperados de %s", replayed, self.events_file)
+    
+    def _apply_event(self, event: Dict):
+        """Soma um evento de uso aos totais, ao provedor, ao modelo e à sessão"""
+        provider, model = event["provider"], event["model"]
+        input_tokens, output_tokens = event["tokens"]["input"], event["tokens"]["output"]
+        cost = event["cost"]
+        
+        # Atualiza totais
+        self.usage["total_tokens"]["input"] += input_tokens
+        self.usage["total_tokens"]["output"] += output_tokens
+        self.usage["total_cost"] += cost
+        
+        # Atualiza por provedor
+        if provider not in self.usage["providers"]:
+            self.usage["providers"][provider] = {
+                "total_tokens": {"input": 0, "output": 0},
+                "total_cost": 0.0,
+                "models": {}
+            }
+        
+        provider_data = self.usage["providers"][provider]
+        provider_data["total_tokens"]["input"] += input_tokens
+        provider_data["total_tokens"]["output"] += output_tokens
+        provider_data["total_cost"] += cost
+        
+        # Atualiza por modelo
+        if model not in provider_data["models"]:
+            provider_data["models"][model] = {
+                "total_tokens": {"input": 0, "output": 0},
+                "total_cost": 0.0
+            }
+        
+        model_data = provider_data["models"][model]
+        model_data["total_tokens"]["input"] += input_tokens
+        model_data["total_tokens"]["output"] += output_tokens
+        model_data["total_cost"] += cost
+        
+        # Atualiza a sessão do evento (criada se o agregado não a tiver)
+        session = self._sessions_by_id.get(event["session"])
+        if session is None:
+            session = {
+                "id": event["session"],
+                "start_time": _iso(event["timestamp"]),
+                "tokens": {"input": 0, "output": 0},
+                "cost": 0.0,
+                "requests": []
+            }
+            self.usage["sessions"].append(session)
+            self._sessions_by_id[session["id"]] = session
+        session["tokens"]["input"] += input_tokens
+        session["tokens"]["output"] += output_tokens
+        session["cost"] += cost
+        session["requests"].append({
+            "timestamp": event["timestamp"],
+            "query": event["query"],
+            "tokens": event["tokens"],
+            "cost": cost
+        })
     
     def _save_usage(self):
-        """Salva dados de uso para o arquivo atual"""
+        """Salva dados de uso para o arquivo atual (chamar com _lock adquirido)"""
         try:
-            with open(self.current_file, "w") as f:
-                json.dump(self.usage, f, indent=2)
+            # O agregado nunca pode contar eventos que ainda estão no buffer
+            self._events.flush()
+            # Grava em arquivo temporário com buffer grande e troca de forma
+            # atômica: um leitor nunca vê o JSON pela metade
+            with io.BufferedWriter(io.FileIO(self._tmp_file, "w"), buffer_size=1 << 16) as f:
+                if orjson:
+                    f.write(orjson.dumps(self.usage, option=orjson.OPT_INDENT_2))
+                else:
+                    f.write(json.dumps(self.usage, indent=2).encode("utf-8"))
+            os.replace(self._tmp_file, self.current_file)
+            self._dirty = False
+            self._last_flush = time.monotonic()
         except Exception as e:
-            logger.error(f"Erro ao salvar dados de uso: {e}")
+            logger.error("Erro ao salvar dados de uso: %s", e)
+    
+    def flush(self):
+        """Grava os dados de uso se houver alterações pendentes"""
+        with self._lock:
+            if self._dirty:
+                self._save_usage()
+    
+    def _schedule_flush(self):
+        """Agenda o próximo flush periódico em uma thread daemon"""
+        timer = threading.Timer(FLUSH_PERIOD, self._periodic_flush)
+        timer.daemon = True
+        timer.start()
+    
+    def _periodic_flush(self):
+        self.flush()
+        self._schedule_flush()
     
     def track(self, provider: str, model: str, input_tokens: int, output_tokens: int, query: str):
         """Rastreia uso de tokens e calcula custos"""
         with self._lock:
-            # Atualiza totais
-            self.usage["total_tokens"]["input"] += input_tokens
-            self.usage["total_tokens"]["output"] += output_tokens
-            
-            # Atualiza por provedor
-            if provider not in self.usage["providers"]:
-                self.usage["providers"][provider] = {
-                    "total_tokens": {"input": 0, "output": 0},
-                    "total_cost": 0.0,
-                    "models": {}
-                }
-            
-            provider_data = self.usage["providers"][provider]
-            provider_data["total_tokens"]["input"] += input_tokens
-            provider_data["total_tokens"]["output"] += output_tokens
-            
-            # Atualiza por modelo
-            if model not in provider_data["models"]:
-                provider_data["models"][model] = {
-                    "total_tokens": {"input": 0, "output": 0},
-                    "total_cost": 0.0
-                }
-            
-            model_data = provider_data["models"][model]
-            model_data["total_tokens"]["input"] += input_tokens
-            model_data["total_tokens"]["output"] += output_tokens
-            
             # Calcula custos
-            input_cost = 0
-            output_cost = 0
-            
-            try:
-                if provider in TOKEN_COSTS and model in TOKEN_COSTS[provider]:
-                    rates = TOKEN_COSTS[provider][model]
-                    input_cost = (input_tokens / 1000) * rates["input"]
-                    output_cost = (output_tokens / 1000) * rates["output"]
-                else:
-                    # Fallback para estimativa genérica
-                    input_cost = (input_tokens / 1000) * 0.001
-                    output_cost = (output_tokens / 1000) * 0.002
-            except Exception as e:
-                logger.error(f"Erro ao calcular custos: {e}")
-            
-            total_cost = input_cost + output_cost
-            
-            # Atualiza custos
-            self.usage["total_cost"] += total_cost
-            provider_data["total_cost"] += total_cost
-            model_data["total_cost"] += total_cost
-            
-            # Atualiza sessão atual
-            current_session = next(s for s in self.usage["sessions"] if s["id"] == self._session_id)
-            current_session["tokens"]["input"] += input_tokens
-            current_session["tokens"]["output"] += output_tokens
-            current_session["cost"] += total_cost
+            input_rate, output_rate = _RATE_TABLE.get((provider, model), _DEFAULT_RATES)
+            total_cost = input_tokens * input_rate + output_tokens * output_rate
             
-            # Adiciona o request
-            current_session["requests"].append({
-                "timestamp": datetime.datetime.now().isoformat(),
-                "query": query[:100] + "..." if len(query) > 100 else query,
+            event = {
+                "session": self._session_id,
+                # Epoch cru; formatado em ISO só quando for exibido
+                "timestamp": time.time(),
+                "provider": provider,
+                "model": model,
+                "query": query if len(query) <= QUERY_PREVIEW_CHARS else f"{query[:QUERY_PREVIEW_CHARS]}...",
                 "tokens": {"input": input_tokens, "output": output_tokens},
                 "cost": total_cost
-            })
+            }
+            
+            # Registra o evento no log (O(tamanho do evento)) e no agregado
+            line = json.dumps(event) + "\n"
+            self._events.write(line)
+            self._apply_event(event)
+            self.usage["events_offset"] = self.usage.get("events_offset", 0) + len(line.encode("utf-8"))
             
-            # Salva os dados
-            self._save_usage()
+            # Marca como alterado; grava só se o último flush for antigo
+            self._dirty = True
+            if time.monotonic() - self._last_flush > FLUSH_INTERVAL:
+                self._save_usage()
             
             return {
                 "input_tokens": input_tokens,
@@ -166,6 +301,7 @@ class TokenTracker:
     
     def get_daily_stats(self) -> Dict:
         """Retorna estatísticas do dia atual"""
+        self.flush()
         return {
             "total_tokens": self.usage["total_tokens"]["input"] + self.usage["total_tokens"]["output"],
             "input_tokens": self.usage["total_tokens"]["input"],
@@ -179,16 +315,15 @@ class TokenTracker:
         if session_id is None:
             session_id = self._session_id
             
-        try:
-            session = next(s for s in self.usage["sessions"] if s["id"] == session_id)
-            return {
-                "id": session["id"],
-                "start_time": session["start_time"],
-                "total_tokens": session["tokens"]["input"] + session["tokens"]["output"],
-                "input_tokens": session["tokens"]["input"],
-                "output_tokens": session["tokens"]["output"],
-                "cost": session["cost"],
-                "requests": len(session["requests"])
-            }
-        except StopIteration:
-            return {}
\ No newline at end of file
+        session = self._sessions_by_id.get(session_id)
+        if session is None:
+            return {}
+        return {
+            "id": session["id"],
+            "start_time": session["start_time"],
+            "total_tokens": session["tokens"]["input"] + session["tokens"]["output"],
+            "input_tokens": session["tokens"]["input"],
+            "output_tokens": session["tokens"]["output"],
+            "cost": session["cost"],
+            "requests": len(session["requests"])
+        }
\ No newline at end of file
@@ -0,0 +1,78 @@
+# config/_fastenv.py
+"""
+Leitor mínimo de arquivos .env.
+
+Substitui o python-dotenv no caminho de inicialização: uma única passada
+pelas linhas, só com operações de string. Cobre o formato usado no projeto:
+
+    # comentário
+    CHAVE=valor
+    export CHAVE=valor
+    CHAVE="valor com espaços"   # comentário
+    CHAVE='valor literal'
+
+Não há interpolação (${VAR}) nem valores com várias linhas; para isso,
+use o python-dotenv.
+"""
+import os
+
+
+def _parse_value(raw):
+    """Remove aspas ou comentário no fim de um valor."""
+    if raw[:1] in ('"', "'"):
+        quote = raw[0]
+        end = raw.find(quote, 1)
+        if end != -1:
+            value = raw[1:end]
+            if quote == '"':
+                value = value.replace("\\n", "\n")
+            return value
+    # Sem aspas: " #" inicia um comentário
+    comment = raw.find(" #")
+    if comment != -1:
+        raw = raw[:comment]
+    return raw.rstrip()
+
+
+def parse(text):
+    """
+    Converte o conteúdo de um .env em dicionário.
+
+    Args:
+        text (str): Conteúdo do arquivo
+
+    Returns:
+        dict: Variáveis na ordem do arquivo
+    """
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("export "):
+            line = line[7:].lstrip()
+        key, sep, raw = line.partition("=")
+        if not sep:
+            continue
+        values[key.rstrip()] = _parse_value(raw.lstrip())
+    return values
+
+
+def load(path=".env"):
+    """
+    Carrega um .env em os.environ sem sobrescrever variáveis já definidas.
+
+    Args:
+        path (str | Path): Caminho do arquivo
+
+    Returns:
+        bool: True se o arquivo existia
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return False
+    for key, value in parse(text).items():
+        os.environ.setdefault(key, value)
+    return True
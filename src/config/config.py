@@ -1,23 +1,180 @@
 # config/config.py
 import os
-from pathlib import Path
-from dotenv import load_dotenv
+import sys
+from functools import lru_cache
 import logging
 
+from . import _fastenv
+
 
 """
 Configuração do projeto.
 Define as configurações globais, incluindo variáveis de ambiente e configurações do sistema.
 """
 
-load_dotenv()
+# Caminhos como str (os.path): montados uma vez, sem objetos Path no import
+_CONFIG_DIR = os.path.dirname(os.path.realpath(__file__))
+BASE_DIR = os.path.dirname(os.path.dirname(_CONFIG_DIR))
+ENV_FILE = os.path.join(BASE_DIR, ".env")
+
+# Gerado por scripts/freeze_config.py: o .env já parseado, como módulo Python
+_FROZEN_FILE = os.path.join(_CONFIG_DIR, "_configdata.py")
+
+
+def _load_frozen():
+    """
+    Retorna as variáveis congeladas, ou None se não houver congelamento válido.
+
+    O congelamento só vale se for mais novo que o .env; um .env editado depois
+    volta a ser lido até o script de congelamento ser rodado de novo.
+    """
+    try:
+        frozen_mtime = os.stat(_FROZEN_FILE).st_mtime
+    except FileNotFoundError:
+        return None
+    try:
+        if os.stat(ENV_FILE).st_mtime > frozen_mtime:
+            return None
+    except FileNotFoundError:
+        pass
+    try:
+        from ._configdata import build_time_vars
+    except ImportError:
+        return None
+    return build_time_vars
+
+
+# Marca de "já carregado" compartilhada por todas as cópias deste módulo
+_LOADED_FLAG = "_CLEYTON_ENV_LOADED"
+
+
+@lru_cache(maxsize=1)
+def load_env():
+    """
+    Carrega o .env uma única vez por processo; chamadas seguintes não fazem nada.
+
+    Não roda no import: é chamado pelo primeiro atributo do Config lido (ou
+    explicitamente por quem lê os.environ direto, como o main).
 
-BASE_DIR = Path(__file__).parent.parent.parent
+    O lru_cache vale por objeto de módulo; a marca em os.environ cobre o caso
+    do mesmo arquivo importado por dois nomes (src.config.config e
+    config.config, como faz o notion_sync) e processos filhos.
+    """
+    if os.environ.get(_LOADED_FLAG):
+        return True
+    frozen = _load_frozen()
+    if frozen is None:
+        _fastenv.load(ENV_FILE)
+    else:
+        # Mesma regra do load_dotenv: variáveis já definidas no ambiente vencem
+        for key, value in frozen.items():
+            os.environ.setdefault(key, value)
+    os.environ[_LOADED_FLAG] = "1"
+    return True
+
+
+@lru_cache(maxsize=1)
+def _env():
+    """
+    Retrato do ambiente (já com o .env aplicado), tirado no primeiro uso.
 
-class Config:
+    Os atributos do Config são lidos deste dict local em vez de chamar
+    os.getenv para cada um.
+    """
+    load_env()
+    return dict(os.environ)
+
+
+def _get(key, default=None):
+    """Lê uma variável do retrato do ambiente."""
+    return _env().get(key, default)
+
+
+logger = logging.getLogger('Config')
+
+# Prompt padrão do Cleyton (usado quando SYSTEM_PROMPT não está no ambiente)
+DEFAULT_PROMPT_FILE = os.path.join(_CONFIG_DIR, "prompts", "cleyton.txt")
+
+
+@lru_cache(maxsize=1)
+def _default_prompt():
+    """Lê o prompt padrão do arquivo uma única vez (só se ele for usado)."""
+    with open(DEFAULT_PROMPT_FILE, encoding="utf-8") as f:
+        return sys.intern(f.read().rstrip("\n"))
+
+
+CREDENTIALS_DIR = os.path.join(BASE_DIR, "credentials")
+CLIENT_SECRETS_DEFAULT = os.path.join(CREDENTIALS_DIR, "client_secrets.json")
+SERVICE_ACCOUNT_DEFAULT = os.path.join(CREDENTIALS_DIR, "service_account.json")
+
+# Atributo do Config -> função que calcula o valor. Nada é lido do ambiente
+# na criação da classe: cada atributo é calculado no primeiro acesso e então
+# gravado na própria classe (os acessos seguintes nem passam pelo metaclass)
+_LOADERS = {
+    # OpenAI
+    "OPENAI_API_KEY": lambda: _get('OPENAI_API_KEY'),
+    "MODEL_NAME": lambda: _get('MODEL_NAME', 'gemini-2.0-flash'),
+    "SYSTEM_PROMPT": lambda: _get('SYSTEM_PROMPT'),
+    # ------------MODELOS OPENAI--------------
+    # https://platform.openai.com/docs/pricing
+
+    # Contexto
+    "CONTEXT_TIME_WINDOW": lambda: int(_get('CONTEXT_TIME_WINDOW', 30)),
+    "MAX_CONTEXT_MESSAGES": lambda: int(_get('MAX_CONTEXT_MESSAGES', 20)),
+    "MAX_TOKENS": lambda: int(_get('MAX_TOKENS', 20000)),
+
+    # Banco de dados
+    "DB_NAME": lambda: _get('DB_NAME', 'engenharia_bot.db'),
+    # Cache de embeddings em disco (desligado se não definido)
+    "EMBEDDING_CACHE_PATH": lambda: _get('EMBEDDING_CACHE_PATH'),
+    # Busca vetorial em memória (NumPy) em vez do índice do ChromaDB; para testes
+    "MEMORY_MANAGER_INMEMORY": lambda: _get('MEMORY_MANAGER_INMEMORY', '').lower() in ("true", "1", "t", "yes", "y"),
+    # Guarda o índice em memória quantizado em int8 (1/4 da RAM do float32)
+    "MEMORY_MANAGER_INMEMORY_INT8": lambda: _get('MEMORY_MANAGER_INMEMORY_INT8', '').lower() in ("true", "1", "t", "yes", "y"),
+
+    # Logging
+    "LOG_LEVEL": lambda: _get('LOG_LEVEL', 'INFO'),
+    "LOG_FILE": lambda: _get('LOG_FILE', 'bot.log'),
+
+    #------------------- GOOGLE -------------------------------
+    # -------------MODELOS GEMINI DISPONÍVEIS -----------------
+    # https://ai.google.dev/gemini-api/docs/models?hl=pt-br
+    "CLIENT_SECRETS_PATH": lambda: _get("GOOGLE_CLIENT_SECRETS", CLIENT_SECRETS_DEFAULT),
+    "SERVICE_ACCOUNT_PATH": lambda: _get("GOOGLE_APPLICATION_CREDENTIALS", SERVICE_ACCOUNT_DEFAULT),
+    "GOOGLE_SHEET_ID": lambda: _get("GOOGLE_SHEET_ID"),
+    "GOOGLE_SHEET_NAME": lambda: _get("GOOGLE_SHEET_NAME"),
+    "GOOGLE_DRIVE_ID": lambda: _get("GOOGLE_DRIVE_ID"),
+    "GEMINI_MODEL_NAME": lambda: _get("GEMINI_MODEL_NAME", "gemini-2.0-flash"),
+    #----------------------------------------------------------
+
+    "LLM_PROVIDER": lambda: Config.get_llm_provider(),
+    "SYSTEM_PROMPT_CLEYTON": lambda: _get('SYSTEM_PROMPT') if 'SYSTEM_PROMPT' in _env() else _default_prompt(),
+}
+
+
+class _ConfigMeta(type):
+    """Metaclasse que calcula os atributos do Config sob demanda."""
+
+    def __getattr__(cls, name):
+        # Só é chamado quando o atributo ainda não existe na classe
+        try:
+            loader = _LOADERS[name]
+        except KeyError:
+            raise AttributeError(f"type object 'Config' has no attribute '{name}'") from None
+        value = loader()
+        setattr(cls, name, value)
+        return value
+
+    def __dir__(cls):
+        return sorted(set(super().__dir__()) | _LOADERS.keys())
+
+
+class Config(metaclass=_ConfigMeta):
     """
     Configurações do projeto.
     
+    Os atributos são lidos do ambiente no primeiro acesso (ver _LOADERS).
+    
     Attributes:
         OPENAI_API_KEY: Chave da API do OpenAI
         MODEL_NAME: Nome do modelo LLM
@@ -32,53 +189,32 @@ class Config:
     """
 
     @staticmethod  # Isso funciona melhor do que remover completamente o decorador
+    @lru_cache(maxsize=1)
     def get_llm_provider():
-        """Método para obter o provedor LLM."""
-        provider = os.getenv('LLM_PROVIDER', 'gemini')
-        print(f"LLM_PROVIDER: {provider}")
+        """Método para obter o provedor LLM (lido do ambiente uma única vez)."""
+        provider = _get('LLM_PROVIDER', 'gemini')
+        logger.debug(f"LLM_PROVIDER: {provider}")
         return provider
     
-    # OpenAI
-    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-    MODEL_NAME = os.getenv('MODEL_NAME', 'gemini-2.0-flash')
-    SYSTEM_PROMPT = os.getenv('SYSTEM_PROMPT')
-    # ------------MODELOS OPENAI--------------
-    # https://platform.openai.com/docs/pricing
-    
-    # Contexto
-    CONTEXT_TIME_WINDOW = int(os.getenv('CONTEXT_TIME_WINDOW', 30))
-    MAX_CONTEXT_MESSAGES = int(os.getenv('MAX_CONTEXT_MESSAGES', 20))
-    MAX_TOKENS = int(os.getenv('MAX_TOKENS', 20000))
-    
-    # Banco de dados
-    DB_NAME = os.getenv('DB_NAME', 'engenharia_bot.db')
-    
-    # Logging
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    # Constantes (sem leitura do ambiente)
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    LOG_FILE = os.getenv('LOG_FILE', 'bot.log')
-    
-    #------------------- GOOGLE -------------------------------
-    # -------------MODELOS GEMINI DISPONÍVEIS -----------------
-    # https://ai.google.dev/gemini-api/docs/models?hl=pt-br
+    CREDENTIALS_DIR = CREDENTIALS_DIR
 
-    CREDENTIALS_DIR = BASE_DIR / "credentials"
-    CLIENT_SECRETS_PATH = os.getenv("GOOGLE_CLIENT_SECRETS", str(CREDENTIALS_DIR / "client_secrets.json"))
-    SERVICE_ACCOUNT_PATH = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", str(CREDENTIALS_DIR / "service_account.json"))
-    GOOGLE_SHEET_ID = os.getenv("GOOGLE_SHEET_ID")
-    GOOGLE_SHEET_NAME = os.getenv("GOOGLE_SHEET_NAME")
-    GOOGLE_DRIVE_ID = os.getenv("GOOGLE_DRIVE_ID")
-    GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-2.0-flash")
-    #----------------------------------------------------------
-    
-    
-    # config/config.py
-    LLM_PROVIDER = get_llm_provider()
 
+def reload_env():
+    """
+    Descarta o retrato do ambiente e os atributos já calculados do Config.
 
-    print(f"LLM_PROVIDER: {LLM_PROVIDER}")
-    
-    SYSTEM_PROMPT_CLEYTON = os.getenv('SYSTEM_PROMPT', """Você é o Cleyton, amigo do Daniel. Vc ajuda ele e faz tudo que ele manda. Você não enrola ele, fala a verdade por mais dura que seja. Você tem memória infinita usando sqlite e banco de dados veotorial. Use para ajudar Daniel nas tarefas diárias. Use mensagens concisas e diretas. Responda usando markdown compatível com telegram ou html básico.""")
+    Para testes que mudam os.environ depois do import: a próxima leitura de
+    cada atributo volta a consultar o ambiente. Mantém o mesmo objeto Config
+    (ao contrário de importlib.reload), então quem já o importou enxerga os
+    valores novos.
+    """
+    _env.cache_clear()
+    Config.get_llm_provider.cache_clear()
+    for name in _LOADERS:
+        if name in Config.__dict__:
+            delattr(Config, name)
 
 
 
@@ -0,0 +1,72 @@
+# tests/conftest.py
+"""
+Configuração compartilhada do pytest.
+
+Põe a raiz do projeto (imports `src.*`) e o diretório src (imports `bot.*`,
+`config.*`) no sys.path uma única vez por sessão, no lugar do sys.path.append
+que cada arquivo de teste fazia. Rodando os scripts com `python -m tests.<nome>`,
+a raiz já entra no path e o `pip install -e .` cobre o resto.
+
+Também carrega o .env uma única vez para a sessão inteira: os load_env() dos
+arquivos de teste (necessários quando rodam como script) viram no-op.
+
+Com pytest-xdist (`pytest -n auto --dist=loadfile`), cada worker
+usa o próprio diretório do ChromaDB (TEST_CHROMA_DIR) e o próprio SQLite
+(DB_NAME), então os arquivos de teste rodam em paralelo sem disputar os bancos.
+
+Fixtures:
+    persist_dir: Diretório do ChromaDB deste worker
+    shared_memory: Um único MemoryManager (ChromaDB em memória) para a sessão
+    user_id: user_id aleatório por teste; as mensagens dele são apagadas no fim
+    inmemory_search: Liga a busca por varredura em memória (MEMORY_MANAGER_INMEMORY)
+        só no teste que pedir; os demais passam pela consulta real do ChromaDB
+"""
+import os
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+for path in (str(ROOT_DIR), str(ROOT_DIR / "src")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Bancos por worker do xdist; definidos antes do .env para que ele não os sobrescreva
+WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+os.environ.setdefault("TEST_CHROMA_DIR", f"./test_chroma_db_{WORKER}")
+os.environ.setdefault("DB_NAME", f"test_{WORKER}.db")
+
+from src.config.config import load_env  # noqa: E402  (depende do sys.path acima)
+
+load_env()
+
+
+@pytest.fixture(scope="session")
+def shared_memory():
+    """MemoryManager criado uma vez e compartilhado por todos os testes."""
+    from src.bot.memory.memory_manager import MemoryManager
+    return MemoryManager(test_mode=True)
+
+
+@pytest.fixture
+def user_id(shared_memory):
+    """Isola cada teste num user_id próprio dentro do MemoryManager compartilhado."""
+    uid = random.randint(100000, 999999)
+    yield uid
+    shared_memory.delete_user_messages(uid)
+
+
+@pytest.fixture
+def inmemory_search(monkeypatch):
+    """Busca vetorial por varredura NumPy (mais rápida que o ChromaDB para poucas mensagens)."""
+    from src.config.config import Config
+    monkeypatch.setattr(Config, "MEMORY_MANAGER_INMEMORY", True)
+
+
+@pytest.fixture(scope="session")
+def persist_dir():
+    """Diretório do ChromaDB exclusivo deste worker do pytest-xdist."""
+    return os.environ["TEST_CHROMA_DIR"]
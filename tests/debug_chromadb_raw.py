@@ -1,4 +1,6 @@
 # python -m tests.debug_chromadb_raw
+import sys
+
 from src.bot.memory.chroma_manager import ChromaManager
 
 client = ChromaManager.get_client()
@@ -12,20 +14,24 @@ print(f"Total de documentos no ChromaDB: {count}")
 peek = collection.peek(limit=5)
 print("\nÚltimos 5 documentos salvos:")
 if peek['ids']:
-    for i, id_ in enumerate(peek['ids']):
-        print(f"ID: {id_}")
-        print(f"Metadata: {peek['metadatas'][i]}")
-        print(f"Conteúdo: {peek['documents'][i][:50]}...")
-        print("-" * 50)
+    # Monta todas as linhas e escreve de uma vez
+    separador = "-" * 50
+    sys.stdout.write("".join(
+        f"ID: {id_}\nMetadata: {meta}\nConteúdo: {doc[:50]}...\n{separador}\n"
+        for id_, meta, doc in zip(peek['ids'], peek['metadatas'], peek['documents'])
+    ))
+
+# O texto de busca é o mesmo nas duas consultas: gera o embedding uma vez só
+query_embeddings = collection._embedding_function(["TESTE_UNICO"])
 
 # 3. Tenta buscar sem nenhum filtro
-results = collection.query(query_texts=["TESTE_UNICO"], n_results=5)
+results = collection.query(query_embeddings=query_embeddings, n_results=5)
 print(f"\nBusca sem filtro: {len(results['ids'][0]) if results['ids'] else 0} resultados")
 
 # 4. Tenta buscar com apenas um filtro
 results = collection.query(
-    query_texts=["TESTE_UNICO"],
-    where={"user_id": {"$eq": "999888"}},
+    query_embeddings=query_embeddings,
+    where={"user_id": {"$eq": 999888}},
     n_results=5
 )
 print(f"Busca com 1 filtro: {len(results['ids'][0]) if results['ids'] else 0} resultados")
\ No newline at end of file
@@ -1,25 +1,30 @@
 # python -m tests.test_bot
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import (
-    Application, CommandHandler, ContextTypes, ConversationHandler,
-    MessageHandler, filters, CallbackQueryHandler
-)
-from dotenv import load_dotenv
-import os
+# Anotações como texto: telegram só é importado quando um handler ou o
+# main() rodam, não na coleta dos testes
+from __future__ import annotations
 
-load_dotenv()
+from io import BytesIO
+import os
+import re
+from typing import TYPE_CHECKING
 
-TOKEN = os.getenv("TELEGRAM_BOT_TEST_SERCH")
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import Application, ContextTypes
 
 # Estados para o ConversationHandler
 ESPERANDO_CNPJ = 0
 
+# callback_data dos botões de CNPJ: cnpj_formato_<14 dígitos>_<formato> ou cnpj_detalhe_<14 dígitos>
+_CB_CNPJ = re.compile(r'^cnpj_(formato|detalhe)_(\d{14})(?:_(\w+))?$')
+
 # Importar as funções que criamos
-from src.bot.utils.cnpj import busca_CNPJ, format_cnpj_info, CNPJError, validar_cnpj
+from src.bot.utils.cnpj import lookup_cnpj, format_cnpj_info, CNPJError, validar_cnpj
 
 async def cnpj_comando(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Manipula o comando /cnpj."""
+    from telegram.ext import ConversationHandler
     args = context.args
     
     # Se o usuário já forneceu o CNPJ como argumento (/cnpj 12345678901234)
@@ -36,12 +41,14 @@ async def cnpj_comando(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
 
 async def receber_cnpj(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Recebe o CNPJ enviado pelo usuário após o pedido."""
+    from telegram.ext import ConversationHandler
     cnpj_texto = update.message.text
     await processar_cnpj(update, context, cnpj_texto)
     return ConversationHandler.END
 
 async def processar_cnpj(update: Update, context: ContextTypes.DEFAULT_TYPE, cnpj_texto: str) -> None:
     """Processa o CNPJ fornecido, faz a consulta e envia a resposta."""
+    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
     message = update.effective_message
     
     # Mostra "digitando..." enquanto processa
@@ -55,7 +62,7 @@ async def processar_cnpj(update: Update, context: ContextTypes.DEFAULT_TYPE, cnp
         cnpj_limpo = validar_cnpj(cnpj_texto)
         
         # Faz a busca
-        dados = busca_CNPJ(cnpj_limpo)
+        dados = await lookup_cnpj(cnpj_limpo)
         
         # Formatar para o Telegram (modifiquei o formato HTML para funcionar bem no Telegram)
         texto = format_cnpj_info(dados, formato="markdown")
@@ -86,18 +93,15 @@ async def botao_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await query.answer()
     
     # Exemplo: cnpj_formato_43836352000194_text
-    dados = query.data.split('_')
-    
-    if len(dados) < 4:
+    m = _CB_CNPJ.match(query.data)
+    if not m:
         return
     
-    tipo = dados[1]  # formato ou detalhe
-    cnpj = dados[2]  # o CNPJ
+    tipo, cnpj, formato = m.groups()  # formato: text, html, etc (só em "formato")
     
     try:
         if tipo == "formato":
-            formato = dados[3]  # text, html, etc
-            resultado = busca_CNPJ(cnpj)
+            resultado = await lookup_cnpj(cnpj)
             texto = format_cnpj_info(resultado, formato=formato)
             
             # Para texto, não usamos parse_mode
@@ -131,6 +135,7 @@ async def botao_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 # Funções adicionais para exportação em outros formatos (opcional)
 async def cnpj_html(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Envia os dados do CNPJ no formato HTML como arquivo."""
+    from telegram import InputFile
     args = context.args
     
     if not args or len(args) == 0:
@@ -139,32 +144,22 @@ async def cnpj_html(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     
     try:
         cnpj = validar_cnpj(args[0])
-        dados = busca_CNPJ(cnpj)
+        dados = await lookup_cnpj(cnpj)
         html = format_cnpj_info(dados, formato="html")
         
-        # Criar arquivo temporário
-        import tempfile
-        temp = tempfile.NamedTemporaryFile(delete=False, suffix='.html', mode='w', encoding='utf-8')
-        temp.write(html)
-        temp.close()
-        
-        # Enviar o arquivo
+        # Enviar o arquivo direto da memória (sem arquivo temporário em disco)
         await context.bot.send_document(
             chat_id=update.effective_chat.id,
-            document=open(temp.name, 'rb'),
-            filename=f"cnpj_{cnpj}.html",
+            document=InputFile(BytesIO(html.encode('utf-8')), filename=f"cnpj_{cnpj}.html"),
             caption=f"Dados do CNPJ {cnpj} em formato HTML"
         )
         
-        # Limpar
-        import os
-        os.unlink(temp.name)
-        
     except Exception as e:
         await update.message.reply_text(f"❌ Erro: {str(e)}")
 
 async def cnpj_json(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Envia os dados do CNPJ no formato JSON como arquivo."""
+    from telegram import InputFile
     args = context.args
     
     if not args or len(args) == 0:
@@ -173,33 +168,25 @@ async def cnpj_json(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     
     try:
         cnpj = validar_cnpj(args[0])
-        dados = busca_CNPJ(cnpj)
+        dados = await lookup_cnpj(cnpj)
         json_str = format_cnpj_info(dados, formato="json")
         
-        # Criar arquivo temporário
-        import tempfile
-        temp = tempfile.NamedTemporaryFile(delete=False, suffix='.json', mode='w', encoding='utf-8')
-        temp.write(json_str)
-        temp.close()
-        
-        # Enviar o arquivo
+        # Enviar o arquivo direto da memória (sem arquivo temporário em disco)
         await context.bot.send_document(
             chat_id=update.effective_chat.id,
-            document=open(temp.name, 'rb'),
-            filename=f"cnpj_{cnpj}.json",
+            document=InputFile(BytesIO(json_str.encode('utf-8')), filename=f"cnpj_{cnpj}.json"),
             caption=f"Dados do CNPJ {cnpj} em formato JSON"
         )
         
-        # Limpar
-        import os
-        os.unlink(temp.name)
-        
     except Exception as e:
         await update.message.reply_text(f"❌ Erro: {str(e)}")
 
 # Para registrar no bot:
 def registrar_cnpj_handlers(application: Application) -> None:
     """Registra os handlers relacionados ao CNPJ."""
+    from telegram.ext import (
+        CommandHandler, ConversationHandler, MessageHandler, filters, CallbackQueryHandler
+    )
     
     # Handler para conversa quando usuário digita apenas /cnpj
     conv_handler = ConversationHandler(
@@ -220,7 +207,13 @@ def registrar_cnpj_handlers(application: Application) -> None:
     application.add_handler(CommandHandler("cnpj_json", cnpj_json))
     
 def main():
-    application = Application.builder().token(TOKEN).build()
+    from src.config.config import load_env
+    from telegram.ext import Application
+
+    load_env()
+    token = os.getenv("TELEGRAM_BOT_TEST_SERCH")
+
+    application = Application.builder().token(token).build()
     registrar_cnpj_handlers(application)
     application.run_polling()
 
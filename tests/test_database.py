@@ -3,10 +3,10 @@ import sqlite3
 import datetime
 import os
 import logging
-from dotenv import load_dotenv
 
 # Importa a classe Database para inicializar as tabelas
 from src.bot.database.db_init import Database
+from src.config.config import load_env
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,43 +20,43 @@ def test_database():
         db = Database(db_name=test_db)
         print("✓ Banco de dados inicializado")
         
-        # Agora conecta para os testes
-        conn = sqlite3.connect(test_db)
+        # Agora conecta para os testes; transações controladas à mão
+        # (isolation_level=None) para agrupar as inserções em um único commit
+        conn = sqlite3.connect(test_db, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
         cursor = conn.cursor()
         
+        conn.execute("BEGIN")
+        
         # 1. Testa inserção na tabela messages
         print("\n1️⃣ Testando mensagens...")
-        cursor.execute('''
+        messages_rows = [
+            (123456, 'user', 'Teste de mensagem', 789, 'diario_obra', 3),
+        ]
+        cursor.executemany('''
             INSERT INTO messages 
             (user_id, role, content, chat_id, category, importance) 
             VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            123456,
-            'user',
-            'Teste de mensagem',
-            789,
-            'diario_obra',
-            3
-        ))
+        ''', messages_rows)
         print("✓ Mensagem inserida")
         
         # 2. Testa inserção na tabela documents
         print("\n2️⃣ Testando documentos...")
-        cursor.execute('''
+        documents_rows = [
+            ('doc_123', 'Documento de Teste', 'text', 3, '{"author": "Test User"}'),
+        ]
+        cursor.executemany('''
             INSERT INTO documents 
             (doc_id, title, doc_type, total_chunks, metadata) 
             VALUES (?, ?, ?, ?, ?)
-        ''', (
-            'doc_123',
-            'Documento de Teste',
-            'text',
-            3,
-            '{"author": "Test User"}'
-        ))
+        ''', documents_rows)
         print("✓ Documento inserido")
         
-        # Commit das alterações
-        conn.commit()
+        # Commit das alterações (uma única transação para todas as inserções)
+        conn.execute("COMMIT")
         
         # 3. Testa consultas
         print("\n📊 Testando consultas...")
@@ -73,6 +73,7 @@ def test_database():
         
         # 4. Testa atualizações
         print("\n🔄 Testando atualizações...")
+        conn.execute("BEGIN")
         cursor.execute('''
             UPDATE messages 
             SET content = 'Mensagem atualizada'
@@ -84,7 +85,7 @@ def test_database():
         content_updated = cursor.fetchone()[0]
         print(f"Conteúdo atualizado: {content_updated}")
         
-        conn.commit()
+        conn.execute("COMMIT")
         print("\n✅ Todos os testes concluídos com sucesso!")
         
     except Exception as e:
@@ -94,6 +95,8 @@ def test_database():
         # Fecha conexão se estiver aberta
         if 'conn' in locals():
             conn.close()
+        if 'db' in locals():
+            db.close()
             
         # Remove banco de teste
         if os.path.exists(test_db):
@@ -101,5 +104,5 @@ def test_database():
             print("\n🧹 Banco de teste removido")
 
 if __name__ == "__main__":
-    load_dotenv()
+    load_env()
     test_database()
\ No newline at end of file
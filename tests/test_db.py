@@ -2,21 +2,49 @@
 
 import sqlite3
 
-# Conecta ao banco de dados
-conn = sqlite3.connect('engenharia_bot.db')
-conn.row_factory = sqlite3.Row
-
-# Busca as mensagens
-cursor = conn.cursor()
-cursor.execute('SELECT * FROM messages ORDER BY timestamp DESC LIMIT 10')
-rows = cursor.fetchall()
-
-# Mostra as mensagens encontradas
-if rows:
-    print(f"✅ Encontradas {len(rows)} mensagens:")
-    for row in rows:
-        print(f"- User {row['user_id']}: {row['content'][:30]}...")
-else:
-    print("❌ Nenhuma mensagem encontrada no banco de dados!")
-
-conn.close()
\ No newline at end of file
+from src.bot.database.db_init import Database
+from src.config.config import Config
+
+LIMIT = 10
+FETCH_SIZE = 1000
+
+QUERY = 'SELECT user_id, content FROM messages ORDER BY timestamp DESC LIMIT ?'
+
+
+def test_latest_messages_use_timestamp_index(tmp_path):
+    """O ORDER BY ... LIMIT deve percorrer o índice de timestamp (criado pelo
+    Database) em vez de ordenar a tabela inteira"""
+    db = Database(str(tmp_path / "test_db.db"))
+    try:
+        with db.connect() as conn:
+            plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {QUERY}", (LIMIT,)))
+        assert "USING INDEX idx_messages_timestamp" in plan, f"Consulta sem índice: {plan}"
+    finally:
+        db.close()
+
+
+def main():
+    """Lista as últimas mensagens do banco configurado (Config.DB_NAME)"""
+    # Só leitura: não cria nem altera o arquivo; linhas como tuplas (sem
+    # sqlite3.Row). Os PRAGMAs ficam com o Database, que já os aplica em cada
+    # conexão (e o journal_mode=WAL no initialize_db)
+    conn = sqlite3.connect(f'file:{Config.DB_NAME}?mode=ro', uri=True)
+
+    # Busca as mensagens
+    cursor = conn.cursor()
+    cursor.execute(QUERY, (LIMIT,))
+    rows = cursor.fetchmany(FETCH_SIZE)
+
+    # Mostra as mensagens encontradas
+    if rows:
+        print(f"✅ Encontradas {len(rows)} mensagens:")
+        for user_id, content in rows:
+            print(f"- User {user_id}: {content[:30]}...")
+    else:
+        print("❌ Nenhuma mensagem encontrada no banco de dados!")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,23 @@
 # python -m tests.test_document_manager
-import sys
-import os
+import math
 import logging
 from datetime import datetime
-import tempfile
-import uuid
-import shutil
 import asyncio
+from unittest.mock import patch
 
 # Configuração do logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Adiciona o diretório src ao path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-
 from src.bot.memory.memory_manager import MemoryManager
 from src.bot.memory.document_manager import DocumentManager
 
 async def test_document_processing():
     """Teste das funcionalidades do DocumentManager"""
-    # Cria um diretório temporário único
-    test_dir = os.path.join(tempfile.gettempdir(), f"test_chroma_{uuid.uuid4().hex}")
-    
     try:
-        # Inicializa os gerenciadores
-        logger.info(f"Iniciando teste do DocumentManager em {test_dir}...")
-        memory = MemoryManager(persist_directory=test_dir)
+        # Inicializa os gerenciadores (ChromaDB em memória: nada para limpar no fim)
+        logger.info("Iniciando teste do DocumentManager...")
+        memory = MemoryManager(test_mode=True)
         doc_manager = DocumentManager(memory)
         
         # Documento de teste
@@ -55,15 +46,30 @@ async def test_document_processing():
         
         # Teste 1: Adicionar documento
         logger.info("Teste 1: Adicionando documento...")
-        doc_id = await doc_manager.add_document(
-            content=test_document,
-            metadata=metadata,
-            chunk_size=100,  # Tamanho menor para teste
-            chunk_overlap=20
-        )
+        collection = doc_manager.documents_collection
+        with patch.object(collection, "add", wraps=collection.add) as add_spy, \
+             patch.object(collection, "_embedding_function",
+                          wraps=collection._embedding_function) as embed_spy:
+            doc_id = await doc_manager.add_document(
+                content=test_document,
+                metadata=metadata,
+                chunk_size=100,  # Tamanho menor para teste
+                chunk_overlap=25
+            )
         
         # Verifica se o documento foi adicionado
         assert doc_id is not None, "Documento não foi adicionado corretamente"
+        # Todos os chunks devem ir ao Chroma numa única chamada
+        assert add_spy.call_count == 1, f"collection.add chamado {add_spy.call_count} vezes"
+        # E o modelo de embedding deve rodar uma única vez para todos eles
+        assert embed_spy.call_count == 1, f"Embedding calculado {embed_spy.call_count} vezes"
+        
+        # Janela deslizante: ceil((N - K) / S) + 1 chunks, com S = K - sobreposição
+        n_words, window, stride = len(test_document.split()), 100, 100 - 25
+        expected_chunks = 1 if n_words <= window else math.ceil((n_words - window) / stride) + 1
+        chunks = doc_manager._split_text(test_document, window, 25)
+        assert len(chunks) == expected_chunks, f"{len(chunks)} chunks, esperado {expected_chunks}"
+        assert chunks[-1].split()[-1] == test_document.split()[-1], "Último chunk não chega ao fim do texto"
         
         # Teste 2: Buscar sem filtros
         logger.info("Teste 2: Buscando conteúdo...")
@@ -100,37 +106,17 @@ async def test_document_processing():
         assert len(filtered_results) > 0, "Busca filtrada não retornou resultados"
         assert filtered_results[0]['metadata']['type'] == 'text', "Filtro de tipo não funcionou"
         
+        # Teste 4: Query repetida usa o embedding em cache
+        logger.info("Teste 4: Repetindo a busca...")
+        await doc_manager.search_documents(query="chunks diferentes", limit=5)
+        cache_info = doc_manager._embed_query.cache_info()
+        assert cache_info.hits >= 1, f"Embedding da query não veio do cache: {cache_info}"
+        
         return "Testes do DocumentManager concluídos com sucesso!"
         
     except Exception as e:
         logger.error(f"Erro durante os testes: {str(e)}")
         raise
-        
-    finally:
-        # Aguarda um momento antes de tentar limpar
-        await asyncio.sleep(1)
-        
-        # Tenta limpar o diretório de teste
-        try:
-            # Força o garbage collector para liberar recursos
-            import gc
-            gc.collect()
-            
-            if os.path.exists(test_dir):
-                # Em Windows, às vezes precisamos de múltiplas tentativas
-                for _ in range(3):
-                    try:
-                        shutil.rmtree(test_dir, ignore_errors=True)
-                        if not os.path.exists(test_dir):
-                            logger.info("Diretório de teste removido com sucesso")
-                            break
-                        await asyncio.sleep(1)
-                    except Exception:
-                        continue
-                else:
-                    logger.warning(f"Não foi possível remover o diretório de teste: {test_dir}")
-        except Exception as e:
-            logger.error(f"Erro ao limpar diretório de teste: {e}")
 
 if __name__ == "__main__":
     result = asyncio.run(test_document_processing())
@@ -1,20 +1,16 @@
 # tests/test_gemini.py
 import sys
-from pathlib import Path
+import asyncio
 import os
-from dotenv import load_dotenv
-
-# Adiciona o diretório raiz ao PYTHONPATH
-root_dir = Path(__file__).parent.parent
-sys.path.append(str(root_dir))
 
 from src.bot.agents.gemini import GeminiClient, GeminiConfig
+from src.config.config import load_env
 
 def test_gemini():
     """Testa a funcionalidade básica do cliente Gemini."""
     
     # Carrega variáveis de ambiente
-    load_dotenv()
+    load_env()
     
     # Debug: mostra a API key (com ****)
     api_key = os.getenv("GEMINI_API_KEY")
@@ -72,9 +68,40 @@ def test_gemini():
         print(traceback.format_exc())
         return False
 
+async def test_gemini_async():
+    """Envia várias mensagens independentes ao mesmo tempo (API async)."""
+    
+    load_env()
+    
+    test_messages = [
+        "Responda apenas 'ok'.",
+        "Quanto é 2 + 2? Responda só o número.",
+        "Diga uma cor em uma palavra.",
+    ]
+    
+    try:
+        client = GeminiClient(config=GeminiConfig(temperature=0.7, max_output_tokens=200))
+        
+        # Uma sessão por mensagem: as requisições são independentes e
+        # o tempo total vira o da mais lenta
+        print(f"\n6. Enviando {len(test_messages)} mensagens em paralelo...")
+        responses = await asyncio.gather(*[
+            client.send_message_async(client.start_chat_session(), message)
+            for message in test_messages
+        ])
+        
+        for message, response in zip(test_messages, responses):
+            print(f"- {message} -> {response.text.strip()}")
+        print("✅ Respostas paralelas recebidas!")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Erro no teste assíncrono: {str(e)}")
+        return False
+
 if __name__ == "__main__":
     print("🚀 Iniciando teste do cliente Gemini...")
-    success = test_gemini()
+    success = test_gemini() and asyncio.run(test_gemini_async())
     if success:
         print("\n✅ Teste concluído com sucesso!")
     else:
@@ -6,23 +6,24 @@ Inclui processamento de arquivos e configurações dinâmicas.
 """
 
 import os
-from pathlib import Path
+import asyncio
+import shlex
 import sys
 import mimetypes
-
-# Adiciona o diretório raiz ao PYTHONPATH
-root_dir = Path(__file__).parent.parent
-sys.path.append(str(root_dir))
+from functools import lru_cache
 
 from src.bot.agents.gemini import GeminiClient, GeminiConfig
-from dotenv import load_dotenv
+from src.config.config import load_env
+
+# Carrega a tabela de tipos MIME do sistema uma única vez, no import
+mimetypes.init()
 
 def print_help():
     """Exibe ajuda com os comandos disponíveis."""
     print("\nComandos disponíveis:")
     print("  config                             - Mostra configuração atual")
     print("  set [param] [valor]                - Altera um parâmetro")
-    print("  file [caminho]                     - Processa um arquivo")
+    print("  file [caminho] [caminho...]        - Processa um ou mais arquivos")
     print("  help                               - Mostra esta ajuda")
     print("  sair                               - Encerra o programa")
     print("="*100)
@@ -35,51 +36,65 @@ def print_help():
     print("\nExemplos de uso do comando file:")
     print("  file docs/exemplo.txt")
     print("  file data/documento.pdf")
+    print("  file a.pdf b.pdf c.pdf")
 
 
 
 
-def get_mime_type(file_path):
-    """Determina o tipo MIME do arquivo."""
-    mime_type, _ = mimetypes.guess_type(file_path)
+@lru_cache(maxsize=256)
+def get_mime_type(ext):
+    """Determina o tipo MIME a partir da extensão (ex: '.pdf'), com cache."""
+    mime_type, _ = mimetypes.guess_type(f"arquivo{ext}")
     if mime_type is None:
         # Fallback para text/plain se não conseguir determinar
         mime_type = "text/plain"
     return mime_type
 
-def process_file(client, file_path, system_prompt=None):
+async def upload_file(client, file_path):
     """
-    Processa um arquivo usando o cliente Gemini.
+    Faz upload do arquivo e aguarda até ele ficar ativo no Gemini.
+    
+    Returns:
+        O arquivo ativo, ou None se o caminho não existir
+    """
+    # Verifica se arquivo existe
+    if not os.path.exists(file_path):
+        print(f"Erro: Arquivo não encontrado: {file_path}")
+        return None
+        
+    # Determina tipo MIME
+    mime_type = get_mime_type(os.path.splitext(file_path)[1].lower())
+    print(f"\nProcessando arquivo: {file_path}")
+    print(f"Tipo MIME: {mime_type}")
+    
+    # Upload do arquivo
+    print("\nFazendo upload...")
+    file = await asyncio.to_thread(client.upload_file, file_path, mime_type=mime_type)
+    
+    # Aguarda processamento
+    print("Aguardando processamento do arquivo...")
+    return await client.wait_for_file_active_async(file)
+
+async def ask_instruction(plural=False):
+    """Pede a instrução ao usuário sem travar o loop (uploads seguem rodando)."""
+    print(f"\nQual instrução você quer dar para o processamento {'dos arquivos' if plural else 'do arquivo'}?")
+    print("(Ex: 'Faça um resumo', 'Extraia os principais pontos', etc)")
+    return (await asyncio.to_thread(input, "Instrução: ")).strip()
+
+async def analyze_file(client, file_path, upload, system_prompt):
+    """
+    Analisa um arquivo já enviado com a instrução dada.
     
     Args:
         client: Instância do GeminiClient
-        file_path: Caminho do arquivo a ser processado
-        system_prompt: Instrução opcional para processamento
+        file_path: Caminho do arquivo (só para exibição)
+        upload: Task de upload_file do arquivo
+        system_prompt: Instrução para processamento
     """
     try:
-        # Verifica se arquivo existe
-        if not os.path.exists(file_path):
-            print(f"Erro: Arquivo não encontrado: {file_path}")
+        active_file = await upload
+        if active_file is None:
             return False
-            
-        # Determina tipo MIME
-        mime_type = get_mime_type(file_path)
-        print(f"\nProcessando arquivo: {file_path}")
-        print(f"Tipo MIME: {mime_type}")
-        
-        # Upload do arquivo
-        print("\nFazendo upload...")
-        file = client.upload_file(file_path, mime_type=mime_type)
-        
-        # Aguarda processamento
-        print("Aguardando processamento do arquivo...")
-        active_file = client.wait_for_file_active(file)
-        
-        # Se não foi fornecido system_prompt, pede ao usuário
-        if system_prompt is None:
-            print("\nQual instrução você quer dar para o processamento do arquivo?")
-            print("(Ex: 'Faça um resumo', 'Extraia os principais pontos', etc)")
-            system_prompt = input("Instrução: ").strip()
         
         # Inicia chat com o arquivo
         print("\nIniciando análise...")
@@ -89,10 +104,10 @@ def process_file(client, file_path, system_prompt=None):
         }])
         
         # Envia instrução
-        response = client.send_message(chat, system_prompt)
+        response = await asyncio.to_thread(client.send_message, chat, system_prompt)
         
         # Exibe resultado
-        print("\nResultado da análise:")
+        print(f"\nResultado da análise ({file_path}):")
         print("-" * 100)
         print(response.text)
         print("-" * 100)
@@ -104,11 +119,43 @@ def process_file(client, file_path, system_prompt=None):
         print(f"\nErro ao processar arquivo: {str(e)}")
         return False
 
+async def process_file(client, file_path, system_prompt=None):
+    """
+    Processa um arquivo usando o cliente Gemini.
+    
+    O upload começa antes de pedir a instrução: o usuário digita enquanto
+    o arquivo sobe e é processado.
+    
+    Args:
+        client: Instância do GeminiClient
+        file_path: Caminho do arquivo a ser processado
+        system_prompt: Instrução opcional para processamento
+    """
+    return (await process_files(client, [file_path], system_prompt))[0]
+
+async def process_files(client, file_paths, system_prompt=None):
+    """
+    Processa vários arquivos ao mesmo tempo com a mesma instrução.
+    
+    Todos os uploads começam antes de pedir a instrução (uma única vez),
+    e uploads, esperas de processamento e análises se sobrepõem.
+    """
+    uploads = [asyncio.create_task(upload_file(client, path)) for path in file_paths]
+    
+    # Se não foi fornecido system_prompt, pede ao usuário
+    if system_prompt is None:
+        system_prompt = await ask_instruction(plural=len(file_paths) > 1)
+    
+    return await asyncio.gather(*[
+        analyze_file(client, path, upload, system_prompt)
+        for path, upload in zip(file_paths, uploads)
+    ])
+
 def test_client_interactive():
     """Teste interativo do cliente Gemini via linha de comando."""
     print("\n=== Teste Interativo do Cliente Gemini ===\n")
     
-    load_dotenv()
+    load_env()
     
     try:
         print("Inicializando cliente Gemini...")
@@ -148,14 +195,13 @@ def test_client_interactive():
                     continue
                 
                 elif user_input.lower().startswith('file '):
-                    # Processa comando de arquivo
-                    parts = user_input.split(maxsplit=1)
-                    if len(parts) != 2:
-                        print("Uso: file [caminho_do_arquivo]")
+                    # Processa comando de arquivo (caminhos com espaço entre aspas)
+                    file_paths = shlex.split(user_input)[1:]
+                    if not file_paths:
+                        print("Uso: file [caminho_do_arquivo] [caminho...]")
                         continue
                     
-                    file_path = parts[1]
-                    process_file(client, file_path)
+                    asyncio.run(process_files(client, file_paths))
                     continue
                 
                 elif user_input.lower().startswith('set '):
@@ -177,10 +223,8 @@ def test_client_interactive():
                             print(f"Parâmetro desconhecido: {param}")
                             continue
                         
-                        # Cria nova configuração
-                        new_config_dict = client.get_current_config().to_dict()
-                        new_config_dict[param] = value
-                        new_config = GeminiConfig(**new_config_dict)
+                        # Cria nova configuração (cópia só com o parâmetro alterado)
+                        new_config = client.get_current_config().with_changes(**{param: value})
                         
                         # Atualiza cliente
                         client.update_config(new_config)
@@ -1,6 +1,5 @@
 # test_integrations.py
 import os
-from dotenv import load_dotenv
 import openai
 from telegram import Bot
 import asyncio
@@ -9,9 +8,12 @@ from google.oauth2 import service_account
 from googleapiclient.discovery import build
 # from notion_client import Client
 import sqlite3
+import tempfile
 import json
 
-load_dotenv()
+from src.config.config import load_env
+
+load_env()
 
 async def test_telegram():
     """
@@ -95,9 +97,15 @@ def test_sqlite():
     Testa a conexão com o SQLite e a criação do banco de dados
     """
     try:
-        conn = sqlite3.connect('engenharia_bot.db')
+        # Banco temporário: o teste não mexe no arquivo de produção (os PRAGMAs
+        # de lá são aplicados pelo próprio Database). Transação controlada à
+        # mão: CREATE + DROP num único commit
+        tmp_dir = tempfile.TemporaryDirectory()
+        conn = sqlite3.connect(os.path.join(tmp_dir.name, 'test_connection.db'), isolation_level=None)
         cursor = conn.cursor()
         
+        cursor.execute("BEGIN")
+        
         # Testa criando uma tabela temporária
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS test_connection (
@@ -108,7 +116,9 @@ def test_sqlite():
         # Remove a tabela de teste
         cursor.execute('DROP TABLE test_connection')
         
+        cursor.execute("COMMIT")
         conn.close()
+        tmp_dir.cleanup()
         print("✅ SQLite: Conexão e operações testadas com sucesso")
         return True
     except Exception as e:
@@ -121,12 +131,20 @@ async def run_all_tests():
     """
     print("\n🔄 Iniciando testes de integração...\n")
     
+    # Os serviços são independentes: roda tudo ao mesmo tempo (os testes
+    # síncronos em threads) e o tempo total vira o do mais lento
+    services = ("Telegram", "OpenAI", "Google Sheets", "Notion", "SQLite")
+    outcomes = await asyncio.gather(
+        test_telegram(),
+        asyncio.to_thread(test_openai),
+        asyncio.to_thread(test_google_sheets),
+        asyncio.to_thread(test_notion),
+        asyncio.to_thread(test_sqlite),
+        return_exceptions=True
+    )
     results = {
-        "Telegram": await test_telegram(),
-        "OpenAI": test_openai(),
-        "Google Sheets": test_google_sheets(),
-        "Notion": test_notion(),
-        "SQLite": test_sqlite()
+        service: outcome is True
+        for service, outcome in zip(services, outcomes)
     }
     
     print("\n📊 Resumo dos testes:")
@@ -1,17 +1,11 @@
 # python -m tests.test_llm_agent
 import sys
-import os
 import asyncio
-from pathlib import Path
 import logging
 
 # Configura logging
 logging.basicConfig(level=logging.INFO)
 
-# Adiciona o diretório src ao PATH
-src_path = Path(__file__).parent.parent / 'src'
-sys.path.append(str(src_path))
-
 from src.bot.agents.llm_agent import LLMAgent
 
 async def test_llm_agent():
@@ -1,16 +1,15 @@
 # python -m tests.test_llm_agent_clean
-import sys
 import os
 import asyncio
-import importlib
 
-# Força recarregamento dos módulos de configuração
-if 'src.config.config' in sys.modules:
-    importlib.reload(sys.modules['src.config.config'])
+from src.config.config import reload_env
 
 # Configura o provider via variável de ambiente para o teste específico
 os.environ['LLM_PROVIDER'] = 'gemini'  # ou 'openai'
 
+# Descarta valores já lidos do ambiente (sem recarregar o módulo de configuração)
+reload_env()
+
 # Importações após configuração do ambiente
 from src.bot.agents.llm_agent import LLMAgent
 
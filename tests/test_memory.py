@@ -1,83 +1,78 @@
 # python -m tests.test_memory
 import asyncio
 import pytest
-from datetime import datetime
-from src.bot.memory.memory_manager import MemoryManager
-from src.config.config import Config
 
-@pytest.fixture
-async def memory_manager():
-    manager = MemoryManager(persist_directory="./test_chroma_db")
-    yield manager
-    # Limpa a coleção após os testes
-    manager.messages_collection.delete(where={})
+# MemoryManager compartilhado pela sessão inteira (fixture shared_memory do
+# conftest); cada teste usa um user_id próprio, limpo ao final (fixture user_id)
 
-async def test_add_message(memory_manager):
-    user_id = 123
+CHAT_ID = 456
+
+async def test_add_message(shared_memory, user_id):
     content = "Teste de mensagem"
-    metadata = {"chat_id": 456, "role": "user"}
-    
-    await memory_manager.add_message(user_id, content, metadata)
-    
+
+    embedding_id = await shared_memory.add_message(user_id, CHAT_ID, content, "user")
+    assert embedding_id is not None
+
     # Verifica se a mensagem foi adicionada
-    results = memory_manager.messages_collection.get(
-        where={"user_id": user_id}
+    # limit=2 basta para detectar duplicata; só os documentos vêm do Chroma
+    results = shared_memory.messages_collection.get(
+        where={"user_id": user_id},
+        limit=2,
+        include=["documents"]
     )
-    
+
     assert len(results['documents']) == 1
     assert results['documents'][0] == content
 
-async def test_search_similar_messages(memory_manager):
+async def test_get_relevant_context(shared_memory, user_id):
     # Adiciona algumas mensagens
     messages = [
         "Como faço um cronograma de obra?",
         "Qual o melhor método para controle financeiro?",
         "Preciso de ajuda com o diário de obra"
     ]
-    
-    for i, msg in enumerate(messages):
-        await memory_manager.add_message(
-            user_id=123,
-            content=msg,
-            metadata={"chat_id": 456, "role": "user"}
-        )
-    
+
+    batch = [
+        {"user_id": user_id, "chat_id": CHAT_ID, "content": msg, "role": "user"}
+        for msg in messages
+    ]
+    await shared_memory.add_messages_batch(batch)
+    # A categorização do lote não altera os dicionários de quem chamou
+    assert all("category" not in msg for msg in batch)
+
     # Busca mensagens similares
     query = "Me ajude com o cronograma da obra"
-    results = await memory_manager.search_similar_messages(
+    results = await shared_memory.get_relevant_context(
         query=query,
-        user_id=123,
-        limit=2
+        user_id=user_id,
+        chat_id=CHAT_ID,
+        limit=2,
+        min_relevance_score=0.0
     )
-    
-    assert len(results) > 0
-    assert "cronograma" in results[0].lower()
 
-async def test_clear_old_messages(memory_manager):
-    # Adiciona mensagens
-    await memory_manager.add_message(
-        user_id=123,
-        content="Mensagem antiga",
-        metadata={
-            "timestamp": (datetime.now().timestamp() - 40*24*60*60),
-            "chat_id": 456,
-            "role": "user"
-        }
-    )
-    
-    await memory_manager.add_message(
-        user_id=123,
-        content="Mensagem recente",
-        metadata={"chat_id": 456, "role": "user"}
+    assert 0 < len(results) <= 2
+    assert any("cronograma" in msg['content'].lower() for msg in results)
+
+async def test_delete_user_messages(shared_memory, user_id, inmemory_search):
+    await shared_memory.add_message(user_id, CHAT_ID, "Mensagem que será apagada", "user")
+
+    # A busca monta o índice em memória (fixture inmemory_search)
+    query = "mensagem apagada"
+    assert await shared_memory.get_relevant_context(query, user_id, CHAT_ID, min_relevance_score=0.0)
+
+    shared_memory.delete_user_messages(user_id)
+
+    # Nada sobra no ChromaDB, no SQLite nem nas buscas seguintes
+    results = shared_memory.messages_collection.get(
+        where={"user_id": user_id},
+        limit=1,
+        include=[]
     )
-    
-    # Limpa mensagens antigas
-    await memory_manager.clear_old_messages(days=30)
-    
-    # Verifica resultados
-    results = memory_manager.messages_collection.get()
-    assert len(results['documents']) == 1
-    assert results['documents'][0] == "Mensagem recente"
+    assert results['ids'] == []
+    assert shared_memory.db.execute_query(
+        "SELECT id FROM messages WHERE user_id = ?", (user_id,)
+    ) == []
+    assert await shared_memory.get_relevant_context(query, user_id, CHAT_ID, min_relevance_score=0.0) == []
 
 if __name__ == "__main__":
-    asyncio.run(pytest.main(["-v", __file__]))
\ No newline at end of file
+    asyncio.run(pytest.main(["-v", __file__]))
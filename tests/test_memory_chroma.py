@@ -1,5 +1,4 @@
 # tests/test_memory_chroma.py
-import sys
 import os
 import logging
 from datetime import datetime
@@ -8,17 +7,17 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Adiciona o diretório src ao path para importar os módulos
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-
 from src.bot.memory.memory_manager import MemoryManager
 
+# Diretório do ChromaDB do teste (o conftest define um por worker do pytest-xdist)
+PERSIST_DIR = os.environ.get("TEST_CHROMA_DIR", "./test_chroma_db")
+
 async def test_chroma_basic():
     """Teste básico das funcionalidades do ChromaDB"""
     try:
         # Inicializa o MemoryManager com um diretório de teste
         logger.info("Iniciando teste do ChromaDB...")
-        memory = MemoryManager(persist_directory="./test_chroma_db")
+        memory = MemoryManager(persist_directory=PERSIST_DIR)
         
         # Dados de teste
         user_id = 12345
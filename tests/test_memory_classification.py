@@ -1,9 +1,13 @@
 # tests/test_categorization.py
+import os
 import asyncio
 from src.bot.memory.memory_manager import MemoryManager
 
+# Diretório do ChromaDB do teste (o conftest define um por worker do pytest-xdist)
+PERSIST_DIR = os.environ.get("TEST_CHROMA_DIR", "./data/chroma_db")
+
 async def test_categorization():
-    memory = MemoryManager()
+    memory = MemoryManager(PERSIST_DIR)
     
     test_messages = [
         "Me lembre de comprar café amanhã",
@@ -1,18 +1,22 @@
 # python -m tests.test_memory_fix
+import os
 import asyncio
 import pytest
 from src.bot.memory.memory_manager import MemoryManager
 
+# Diretório do ChromaDB do teste (o conftest define um por worker do pytest-xdist)
+PERSIST_DIR = os.environ.get("TEST_CHROMA_DIR", "./data/chroma_db")
+
 async def test_memory_persistence():
     """Testa se a memória tá persistindo mesmo"""
-    memory = MemoryManager()
+    memory = MemoryManager(PERSIST_DIR)
     
     # Adiciona uma mensagem
     test_msg = "Essa mensagem tem que ficar salva, porra!"
     await memory.add_message(123, 456, test_msg, "user")
     
     # Cria uma nova instância (simula reinício)
-    memory2 = MemoryManager()
+    memory2 = MemoryManager(PERSIST_DIR)
     
     # Busca a mensagem
     results = await memory2.get_relevant_context(
@@ -1,27 +1,25 @@
 # tests/test_memory_manager.py 
 # python -m tests.test_memory_manager
-import sys
 import os
+import sys
 import asyncio
-from pathlib import Path
 import logging
 
 
 # Configura logging
 logging.basicConfig(level=logging.INFO)
 
-# Adiciona o diretório src ao PATH
-src_path = Path(__file__).parent.parent / 'src'
-sys.path.append(str(src_path))
-
 from src.bot.memory.memory_manager import MemoryManager
 
+# Diretório do ChromaDB do teste (o conftest define um por worker do pytest-xdist)
+PERSIST_DIR = os.environ.get("TEST_CHROMA_DIR", "./test_chroma_db")
+
 async def test_memory_manager():
     """Testa as funcionalidades básicas do MemoryManager"""
     memory = None
     try:
         # Inicializa com diretório de teste
-        memory = MemoryManager("./test_chroma_db")
+        memory = MemoryManager(PERSIST_DIR)
         
         # Dados de teste
         user_id = 123
@@ -33,8 +31,12 @@ async def test_memory_manager():
         ]
         
         print("🔄 Testando adição de mensagens...")
-        for content, role in messages:
-            await memory.add_message(user_id, chat_id, content, role)
+        ids = await memory.add_messages_batch([
+            {"user_id": user_id, "chat_id": chat_id, "content": content, "role": role}
+            for content, role in messages
+        ])
+        assert len(ids) == len(messages), f"{len(ids)} de {len(messages)} mensagens adicionadas"
+        for content, _ in messages:
             print(f"✓ Mensagem adicionada: {content[:30]}...")
         
         print("\n🔍 Testando busca de contexto...")
@@ -66,7 +68,7 @@ async def test_memory_manager():
             try:
                 # Apaga todos os documentos do teste usando o user_id específico
                 memory.messages_collection.delete(
-                    where={"user_id": {"$eq": "123"}}  # 123 é o user_id usado no teste
+                    where={"user_id": {"$eq": 123}}  # 123 é o user_id usado no teste
                 )
                 print("✓ Dados limpos com sucesso")
             except Exception as e:
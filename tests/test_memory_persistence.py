@@ -1,15 +1,13 @@
 # python -m tests.test_memory_persistence
-import sys
 import os
-from pathlib import Path
 import asyncio
 import uuid
 
-# Adiciona o diretório raiz ao PATH
-sys.path.append(str(Path(__file__).parent.parent))
-
 from src.bot.memory.memory_manager import MemoryManager
 
+# Diretório do ChromaDB do teste (o conftest define um por worker do pytest-xdist)
+PERSIST_DIR = os.environ.get("TEST_CHROMA_DIR", "./data/chroma_db")
+
 async def test_persistence():
     """Testa se os dados estão persistindo no ChromaDB"""
     try:
@@ -22,7 +20,7 @@ async def test_persistence():
         
         # Inicializa o MemoryManager com o diretório padrão
         print("\n1. Inicializando MemoryManager...")
-        memory = MemoryManager()
+        memory = MemoryManager(PERSIST_DIR)
         
         # Adiciona uma mensagem
         print("\n2. Adicionando mensagem de teste...")
@@ -36,7 +34,7 @@ async def test_persistence():
         
         # Reinicializa o MemoryManager para simular reinício do bot
         print("\n3. Reinicializando MemoryManager para simular reinício...")
-        memory = MemoryManager()
+        memory = MemoryManager(PERSIST_DIR)
         
         # Busca a mensagem usando o conteúdo exato
         print("\n4. Buscando mensagem após reinicialização...")
@@ -8,17 +8,13 @@ garantindo que o sistema está funcionando corretamente.
 Uso:
     python -m tests.test_memory_refactor
 """
-import sys
 import os
+import sys
 import asyncio
 import logging
-from pathlib import Path
 import random
 import string
-
-# Adiciona o diretório src ao PATH
-src_path = Path(__file__).parent.parent / 'src'
-sys.path.append(str(src_path))
+from functools import lru_cache
 
 # Configura logging
 logging.basicConfig(level=logging.INFO)
@@ -29,10 +25,18 @@ from src.bot.memory.memory_manager import MemoryManager
 from src.bot.memory.chroma_manager import ChromaManager
 from src.bot.database.db_init import Database
 
+# Diretório do ChromaDB do teste (o conftest define um por worker do pytest-xdist)
+PERSIST_DIR = os.environ.get("TEST_CHROMA_DIR", "./data/chroma_db")
+
 # IDs de teste aleatórios para evitar conflitos
 TEST_USER_ID = random.randint(100000, 999999)
 TEST_CHAT_ID = random.randint(100000, 999999)
 
+@lru_cache(maxsize=None)
+def get_db() -> Database:
+    """Database do teste, criado (e com o schema verificado) uma única vez."""
+    return Database()
+
 async def test_memory_roundtrip():
     """Testa o ciclo completo de escrita e leitura na memória."""
     print(f"\n🧪 Teste de ciclo escrita/leitura (user_id={TEST_USER_ID}, chat_id={TEST_CHAT_ID})")
@@ -41,7 +45,7 @@ async def test_memory_roundtrip():
     test_category = "teste"
     test_importance = 3
     
-    memory = MemoryManager()
+    memory = MemoryManager(PERSIST_DIR)
     
     # Adiciona uma mensagem
     print("▶️ Adicionando mensagem à memória...")
@@ -72,7 +76,7 @@ async def test_memory_roundtrip():
         print("❌ Falha ao recuperar mensagens recentes!")
         return False
     
-    found_recent = any(test_content == msg['content'] for msg in recent_msgs)
+    found_recent = test_content in {msg['content'] for msg in recent_msgs}
     print(f"✅ Mensagem encontrada em mensagens recentes: {found_recent}")
     
     # Busca semântica
@@ -84,7 +88,7 @@ async def test_memory_roundtrip():
         limit=5
     )
     
-    found_semantic = any(test_content == msg['content'] for msg in results)
+    found_semantic = test_content in {msg['content'] for msg in results}
     print(f"✅ Mensagem encontrada em busca semântica: {found_semantic}")
     
     # Obtém contexto completo
@@ -95,7 +99,7 @@ async def test_memory_roundtrip():
         query=test_content.split()[0]  # Usa primeira palavra como query
     )
     
-    found_context = any(test_content == msg['content'] for msg in context)
+    found_context = test_content in {msg['content'] for msg in context}
     print(f"✅ Mensagem encontrada em contexto: {found_context}")
     
     return found_recent and found_context
@@ -104,8 +108,8 @@ async def test_memory_integrity():
     """Testa a integridade entre SQLite e ChromaDB."""
     print("\n🧪 Teste de integridade SQLite-ChromaDB")
     
-    # Conecta ao banco SQLite
-    db = Database()
+    # Reaproveita o Database do módulo
+    db = get_db()
     
     # Conta no SQLite
     try:
@@ -121,21 +125,21 @@ async def test_memory_integrity():
     
     # Conecta ao ChromaDB
     try:
-        cm = ChromaManager()
+        cm = ChromaManager(PERSIST_DIR)
         collection = cm.get_or_create_collection("messages")
         
-        # Conta no ChromaDB
-        results = collection.query(
-            query_texts=[""],
+        # Conta no ChromaDB só pelos metadados (sem busca vetorial nem payload)
+        results = collection.get(
             where={
-                "user_id": {"$eq": str(TEST_USER_ID)},
-                "chat_id": {"$eq": str(TEST_CHAT_ID)}
+                "$and": [
+                    {"user_id": {"$eq": TEST_USER_ID}},
+                    {"chat_id": {"$eq": TEST_CHAT_ID}}
+                ]
             },
-            include=["metadatas"],
-            n_results=999
+            include=[]
         )
         
-        chroma_count = len(results['ids'][0]) if results['ids'] else 0
+        chroma_count = len(results['ids'])
         print(f"✅ ChromaDB: {chroma_count} documentos")
     except Exception as e:
         print(f"❌ Erro ao contar no ChromaDB: {e}")
@@ -154,7 +158,7 @@ async def test_error_handling():
     print("\n🧪 Teste de tratamento de erros")
     
     try:
-        memory = MemoryManager()
+        memory = MemoryManager(PERSIST_DIR)
         
         # Tenta adicionar mensagem com conteúdo inválido
         print("▶️ Testando tratamento com mensagem vazia...")
@@ -188,7 +192,7 @@ async def test_error_handling():
             
         # Testa debug_memory_state
         print("▶️ Testando diagnóstico de memória...")
-        state = memory.debug_memory_state(TEST_USER_ID, TEST_CHAT_ID)
+        state = memory.debug_memory_state(TEST_USER_ID, TEST_CHAT_ID, quick=True)
         
         if isinstance(state, dict) and "health" in state:
             print(f"✅ Diagnóstico retornado: status='{state['health']}'")
@@ -201,30 +205,34 @@ async def test_error_handling():
         print(f"❌ Erro não tratado: {e}")
         return False
 
+async def _run_test(name, test_func):
+    """Roda um teste, convertendo exceções não tratadas em falha."""
+    print(f"\n[TESTE] {name}")
+    print("-" * 40)
+    
+    try:
+        return name, await test_func()
+    except Exception as e:
+        print(f"❌ Exceção não tratada ({name}): {e}")
+        return name, False
+
 async def run_tests():
-    """Executa todos os testes em sequência."""
+    """Executa todos os testes (os independentes ao mesmo tempo)."""
     print("\n" + "="*80)
     print("🧪 INICIANDO TESTES DO SISTEMA DE MEMÓRIA REFATORADO 🧪")
     print("="*80)
     
-    tests = [
+    # Escrita/leitura e tratamento de erros são independentes: rodam juntos
+    concurrent_tests = [
         ("Ciclo escrita/leitura", test_memory_roundtrip),
-        ("Integridade SQLite-ChromaDB", test_memory_integrity),
         ("Tratamento de erros", test_error_handling)
     ]
+    results = list(await asyncio.gather(
+        *[_run_test(name, test_func) for name, test_func in concurrent_tests]
+    ))
     
-    results = []
-    
-    for name, test_func in tests:
-        print(f"\n[TESTE] {name}")
-        print("-" * 40)
-        
-        try:
-            result = await test_func()
-            results.append((name, result))
-        except Exception as e:
-            print(f"❌ Exceção não tratada: {e}")
-            results.append((name, False))
+    # A integridade compara o que os testes acima gravaram: roda por último
+    results.append(await _run_test("Integridade SQLite-ChromaDB", test_memory_integrity))
     
     # Resumo dos resultados
     print("\n" + "="*40)
@@ -2,52 +2,121 @@
 import pytesseract
 from PIL import Image
 import re
+import hashlib
+from pathlib import Path
+import numpy as np
 from datetime import datetime
 
+try:
+    import re2
+except ImportError:  # google-re2 é opcional: sem ele, usa o re da stdlib
+    re2 = None
+
 # Define o caminho do Tesseract
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
+_ESPACOS = re.compile(r'\s+')
+
+# Cache do texto do OCR por conteúdo da imagem (sha256 dos bytes + idioma)
+_ocr_cache_path = Path(".cache/ocr")
+
+def cached_image_to_string(image_path: str, lang: str = 'por') -> str:
+    """
+    pytesseract.image_to_string com cache em disco.
+    
+    O OCR só depende dos bytes da imagem e do idioma: rodando de novo sobre a
+    mesma imagem, o texto vem do cache e o Tesseract nem é chamado.
+    """
+    with open(image_path, 'rb') as f:
+        h = hashlib.sha256(f.read()).hexdigest()
+    cache_file = _ocr_cache_path / f"{h}_{lang}.txt"
+    if cache_file.exists():
+        return cache_file.read_text(encoding='utf-8')
+    
+    text = pytesseract.image_to_string(Image.open(image_path), lang=lang)
+    _ocr_cache_path.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(text, encoding='utf-8')
+    return text
+
+# Padrões de regex melhorados
+PATTERNS = {
+    'numero': r'[Nn][úu]mero\s*(?:da\s*)?[Nn]ota\s*:?\s*(\d+)',
+    'data_emissao': r'(?:Data/Hora\s*(?:de|da)\s*emiss[ãa]o|emiss[ãa]o)\s*:?\s*(\d{2}/\d{2}/\d{4})',
+    'codigo_verificacao': r'[Cc][óo]digo\s*(?:de)?\s*verifica[çc][ãa]o\s*:?\s*([A-Za-z0-9.-]+)',
+    'valor_servico': r'Valor\s*(?:do)?\s*Servi[çc]o\s*(?:\(R\$\)|\(?R\$\)?)\s*([\d.,]+)',
+    'codigo_obra': r'(?:CENTRO\s*DE\s*CUSTO|[Cc]entro\s*[Cc]usto)\s*:?\s*(\d{2}\.\d{2}\.\d{2})',
+    'prestador_nome': r'B\s*ROSA\s*LTDA',
+    'prestador_cnpj': r'(?:CPF/CNPJ|CNPJ)\s*:?\s*(\d{2}\.?\d{3}\.?\d{3}/\d{4}-\d{2})',
+    'tomador_nome': r'CONSTRUTORA\s*HOSS\s*LTDA',
+    'tomador_cnpj': r'43\.836\.352/\d{4}-\d{2}',
+    'valor_total': r'VALOR\s*TOTAL\s*DA\s*NOTA\s*=\s*R\$\s*([\d.,]+)',
+    'retencoes_iss': r'ISS[QN]?\(R\$\)\s*([\d.,]+)',
+    'retencoes_inss': r'(?:INSS|Retenção\s*Previdenciária)\s*\(R\$\)\s*([\d.,]+)',
+    'valor_liquido': r'[Vv]alor\s*[Ll][íi]quido\s*(?:da\s*[Nn]ota)?\s*\(R\$\)\s*([\d.,]+)'
+}
+
+def _compile(pattern: str):
+    """
+    Compila um padrão sem diferenciar maiúsculas.
+    
+    Com o google-re2 instalado usa o RE2 (autômato, tempo linear no tamanho do
+    texto): lixo do OCR não provoca backtracking catastrófico. Os padrões acima
+    não usam recursos que o RE2 não tem (lookaround, backreference).
+    """
+    if re2 is not None:
+        return re2.compile(f"(?i){pattern}")
+    return re.compile(pattern, re.IGNORECASE)
+
+# Compilados uma vez no import (cada campo continua com a sua própria busca:
+# juntar tudo numa alternação faria um campo "consumir" o texto de outro,
+# ex.: prestador_cnpj engolindo o CNPJ do tomador)
+COMPILED = [(key, _compile(pattern)) for key, pattern in PATTERNS.items()]
+
 def clean_text(text: str) -> str:
     """Limpa o texto removendo caracteres problemáticos"""
     text = text.replace('„', ',')  # Corrige vírgulas especiais
     text = text.replace('"', "'")  # Corrige apóstrofos
-    text = re.sub(r'\s+', ' ', text)  # Remove espaços múltiplos
+    text = _ESPACOS.sub(' ', text)  # Remove espaços múltiplos
     return text
 
+def _to_float(valor: str) -> float:
+    """float() que devolve NaN para valores inválidos."""
+    try:
+        return float(valor)
+    except ValueError:
+        return np.nan
+
+def parse_brl_amounts(valores) -> np.ndarray:
+    """
+    Converte valores em reais ('1.234,56') para float, todos de uma vez.
+    
+    Aceita uma lista (campos de uma nota) ou uma matriz (n_notas, n_campos)
+    de strings; valores que não forem números viram NaN.
+    """
+    valores = np.asarray(valores, dtype=str)
+    if valores.size == 0:
+        return np.empty(valores.shape, dtype=np.float64)
+    normalizados = np.char.replace(np.char.replace(valores, '.', ''), ',', '.')
+    try:
+        return normalizados.astype(np.float64)
+    except ValueError:
+        # Algum valor inválido: converte um a um só neste caso
+        return np.vectorize(_to_float, otypes=[np.float64])(normalizados)
+
 def extract_nfse_info(image_path: str) -> dict:
     """Extrai informações relevantes da NFSe"""
-    # Abre a imagem
-    image = Image.open(image_path)
-    
-    # Extrai texto com OCR
+    # Extrai texto com OCR (ou do cache, se a imagem já foi lida)
     print("Iniciando extração de texto...")
-    text = pytesseract.image_to_string(image, lang='por')
+    text = cached_image_to_string(image_path, lang='por')
     text = clean_text(text)
     
-    # Padrões de regex melhorados
-    patterns = {
-        'numero': r'[Nn][úu]mero\s*(?:da\s*)?[Nn]ota\s*:?\s*(\d+)',
-        'data_emissao': r'(?:Data/Hora\s*(?:de|da)\s*emiss[ãa]o|emiss[ãa]o)\s*:?\s*(\d{2}/\d{2}/\d{4})',
-        'codigo_verificacao': r'[Cc][óo]digo\s*(?:de)?\s*verifica[çc][ãa]o\s*:?\s*([A-Za-z0-9.-]+)',
-        'valor_servico': r'Valor\s*(?:do)?\s*Servi[çc]o\s*(?:\(R\$\)|\(?R\$\)?)\s*([\d.,]+)',
-        'codigo_obra': r'(?:CENTRO\s*DE\s*CUSTO|[Cc]entro\s*[Cc]usto)\s*:?\s*(\d{2}\.\d{2}\.\d{2})',
-        'prestador_nome': r'B\s*ROSA\s*LTDA',
-        'prestador_cnpj': r'(?:CPF/CNPJ|CNPJ)\s*:?\s*(\d{2}\.?\d{3}\.?\d{3}/\d{4}-\d{2})',
-        'tomador_nome': r'CONSTRUTORA\s*HOSS\s*LTDA',
-        'tomador_cnpj': r'43\.836\.352/\d{4}-\d{2}',
-        'valor_total': r'VALOR\s*TOTAL\s*DA\s*NOTA\s*=\s*R\$\s*([\d.,]+)',
-        'retencoes_iss': r'ISS[QN]?\(R\$\)\s*([\d.,]+)',
-        'retencoes_inss': r'(?:INSS|Retenção\s*Previdenciária)\s*\(R\$\)\s*([\d.,]+)',
-        'valor_liquido': r'[Vv]alor\s*[Ll][íi]quido\s*(?:da\s*[Nn]ota)?\s*\(R\$\)\s*([\d.,]+)'
-    }
-    
     # Dicionário para armazenar os resultados
     results = {}
     
     # Extrai cada informação usando os padrões
     print("\nExtraindo informações...")
-    for key, pattern in patterns.items():
-        match = re.search(pattern, text, re.IGNORECASE)
+    for key, pattern in COMPILED:
+        match = pattern.search(text)
         if match:
             value = match.group(1).strip() if match.groups() else match.group(0).strip()
             results[key] = value
@@ -58,14 +127,13 @@ def extract_nfse_info(image_path: str) -> dict:
     
     # Converte valores monetários
     monetary_fields = ['valor_servico', 'valor_total', 'retencoes_iss', 'retencoes_inss', 'valor_liquido']
-    for field in monetary_fields:
-        if results.get(field):
-            try:
-                valor = results[field].replace('.', '').replace(',', '.')
-                results[field] = float(valor)
-                print(f"✓ Conversão de {field}: {results[field]}")
-            except ValueError:
-                print(f"✗ Erro ao converter {field}: {results[field]}")
+    found = [field for field in monetary_fields if results.get(field)]
+    for field, valor in zip(found, parse_brl_amounts([results[field] for field in found])):
+        if np.isnan(valor):
+            print(f"✗ Erro ao converter {field}: {results[field]}")
+        else:
+            results[field] = float(valor)
+            print(f"✓ Conversão de {field}: {results[field]}")
     
     print("\nTexto completo extraído para debug:")
     print("-" * 50)
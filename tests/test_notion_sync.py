@@ -3,8 +3,6 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import logging
-import sys
-sys.path.append('.')
 from src.bot.utils.notion_sync import NotionSync
 from src.config.config import Config
 
@@ -15,36 +13,44 @@ logger = logging.getLogger(__name__)
 test_token = Config.NOTION_TOKEN
 test_database_id = Config.NOTION_DATABASE_ID
 
+# Resposta padrão do databases.retrieve: database sem propriedades (só leitura)
+EMPTY_DATABASE = {"properties": {}}
+
 class TestNotionSync(unittest.TestCase):
 
     """
     Classe de testes para NotionSync
     """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Cria o mock do Client do Notion uma vez para a classe toda
+        """
+        cls.client_patcher = patch('notion_client.Client')
+        cls.mock_client = cls.client_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove o mock do Client ao fim da classe"""
+        cls.client_patcher.stop()
+
     def setUp(self):
         """
-        Configura os mocks antes de cada teste
+        Zera as chamadas do mock e configura as respostas antes de cada teste
         """
         self.notion_token = "test_token"
         self.database_id = "test_db_id"
         
-        # Mock do Client do Notion
-        self.client_patcher = patch('notion_client.Client')
-        self.mock_client = self.client_patcher.start()
+        self.mock_client.reset_mock()
         
         # Configura os mocks dos métodos
-        self.mock_client.return_value.databases.retrieve.return_value = {
-            "properties": {}
-        }
+        self.mock_client.return_value.databases.retrieve.return_value = EMPTY_DATABASE
         self.mock_client.return_value.databases.update.return_value = True
         self.mock_client.return_value.pages.create.return_value = {"id": "test_page_id"}
         
         # Cria instância do NotionSync com o client mockado
         self.notion_sync = NotionSync(self.notion_token, self.database_id)
 
-    def tearDown(self):
-        """Limpa os mocks após cada teste"""
-        self.client_patcher.stop()
-
     def test_sync_single_message(self):
         """Testa sincronização de mensagem única"""
         test_message = {
@@ -82,9 +88,7 @@ class TestNotionSync(unittest.TestCase):
         }
         
         # Simula que o database não tem propriedades
-        self.mock_client.return_value.databases.retrieve.return_value = {
-            "properties": {}
-        }
+        self.mock_client.return_value.databases.retrieve.return_value = EMPTY_DATABASE
         
         self.notion_sync.notion_client.create_properties(test_message)
         
@@ -2,10 +2,11 @@
 #----------CÓDIGO ESCRITO PELO DANIEL-------------#
 #------- POSSIVELMENTE, NÃO VAI RODAR ------------#
 
-import dotenv
 import os
 
-dotenv.load_dotenv()
+from src.config.config import load_env
+
+load_env()
 
 LLM_PROVIDER = os.getenv("LLM_PROVIDER")
 
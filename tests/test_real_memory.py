@@ -1,101 +1,130 @@
 # python -m tests.test_real_memory
+import os
 import asyncio
+import time
 import uuid
 from src.bot.memory.memory_manager import MemoryManager
+from src.bot.memory.chroma_manager import ChromaManager
+
+# Diretório do ChromaDB do teste (o conftest define um por worker do pytest-xdist)
+PERSIST_DIR = os.environ.get("TEST_CHROMA_DIR", "./data/chroma_db")
+
+# Mensagens gravadas de uma vez (a única + enchimento), pelo caminho em lote
+N_MESSAGES = 1000
 
 async def test_real_persistence():
     """Teste pesado que nem sua sogra"""
-    memory = MemoryManager()
+    memory = MemoryManager(PERSIST_DIR)
+    memory2 = None
     
     # ID único pra não confundir com lixo anterior
     test_user = 999888
     test_chat = 777666
     
-    # Mensagem única identificável
-    unique_id = str(uuid.uuid4())[:8]
-    test_message = f"TESTE_UNICO_{unique_id}_DEVE_PERSISTIR"
-    
-    print(f"Salvando mensagem: {test_message}")
+    try:
+        # Mensagem única identificável
+        unique_id = str(uuid.uuid4())[:8]
+        test_message = f"TESTE_UNICO_{unique_id}_DEVE_PERSISTIR"
     
-    # Salva a mensagem
-    await memory.add_message(test_user, test_chat, test_message, "user")
+        print(f"Salvando mensagem: {test_message} (+{N_MESSAGES - 1} de enchimento)")
     
-    # Aguarda um pouco (pq pode ter delay no ChromaDB)
-    await asyncio.sleep(2)
+        # Salva tudo em lotes: uma transação no SQLite e um add no ChromaDB por lote
+        messages = [
+            {"user_id": test_user, "chat_id": test_chat, "content": f"Mensagem de enchimento #{i}", "role": "user"}
+            for i in range(N_MESSAGES - 1)
+        ]
+        messages.append({"user_id": test_user, "chat_id": test_chat, "content": test_message, "role": "user"})
     
-    # CRIAR NOVA INSTÂNCIA (simula reinício total)
-    memory2 = MemoryManager()
+        inicio = time.perf_counter()
+        ids = await memory.add_messages_batch(messages)
+        elapsed = time.perf_counter() - inicio
+        print(f"{len(ids)} mensagens gravadas em {elapsed:.2f}s ({len(ids) / elapsed:.0f} msg/s)")
     
-    # Busca de várias formas
-    print("Testando buscas...")
+        # Espera a mensagem única aparecer no ChromaDB (a cada 50 ms, no máximo 2 s)
+        # em vez de dormir 2 s fixos; get por ID não precisa calcular embedding
+        deadline = time.monotonic() + 2.0
+        while ids and time.monotonic() < deadline:
+            found = await asyncio.to_thread(memory.messages_collection.get, ids=[ids[-1]], include=[])
+            if found["ids"]:
+                break
+            await asyncio.sleep(0.05)
     
-    # 1. Busca por texto exato
-    results = await memory2.get_relevant_context(
-        query=test_message,
-        user_id=test_user,  # Os mesmos que salvou!
-        chat_id=test_chat,   # Os mesmos que salvou!
-    )
+        # CRIAR NOVA INSTÂNCIA (simula reinício total): descarta os clientes em
+        # cache para reabrir o ChromaDB do disco (o modelo de embedding continua carregado)
+        ChromaManager.reset_cache()
+        memory2 = MemoryManager(PERSIST_DIR)
     
-    # 2. Busca por parte do texto   
-    results2 = await memory2.get_relevant_context(
-        query=unique_id,
-        user_id=test_user,
-        chat_id=test_chat,
-        limit=10
-    )
+        # Busca de várias formas
+        print("Testando buscas...")
     
-    # 3. Busca no SQLite direto
-    sql_results = memory2.db.execute_query(
-        "SELECT * FROM messages WHERE user_id=? AND chat_id=? AND content LIKE ?",
-        (test_user, test_chat, f"%{unique_id}%")
-    )
+        where = {
+            "$and": [
+                {"user_id": {"$eq": int(test_user)}},
+                {"chat_id": {"$eq": int(test_chat)}}
+            ]
+        }
     
-    # 4. Busca no ChromaDB direto
-    try:
-        chroma_results = memory2.messages_collection.query(
-            query_texts=[unique_id],
-            where={
-                "$and": [
-                    {"user_id": {"$eq": str(test_user)}},
-                    {"chat_id": {"$eq": str(test_chat)}}
-                ]
-            },
-            n_results=10
+        # As buscas são independentes: rodam juntas (SQLite e ChromaDB direto
+        # em threads, para não travar o loop)
+        contexts, sql_results, chroma_results = await asyncio.gather(
+            # 1. Busca por texto exato e 2. por parte do texto, numa única consulta
+            memory2.get_relevant_context_batch(
+                [test_message, unique_id],
+                user_id=test_user,  # Os mesmos que salvou!
+                chat_id=test_chat,   # Os mesmos que salvou!
+                limit=10
+            ),
+            # 3. Busca no SQLite direto (índice FTS5 em vez de LIKE '%...%')
+            asyncio.to_thread(
+                memory2.db.execute_query,
+                "SELECT m.* FROM messages m JOIN messages_fts f ON f.rowid = m.id "
+                "WHERE messages_fts MATCH ? AND m.user_id=? AND m.chat_id=?",
+                (f'"{unique_id}"', test_user, test_chat)
+            ),
+            # 4. Busca no ChromaDB direto
+            asyncio.to_thread(
+                memory2.messages_collection.query,
+                query_texts=[unique_id],
+                where=where,
+                n_results=10
+            ),
+            return_exceptions=True
         )
-    except Exception as e:
-        print(f"ChromaDB deu pau: {e}")
-        chroma_results = None
     
-    # Debug
-    print(f"\nResultados:")
-    print(f"- get_relevant_context (texto completo): {len(results1) if results1 else 0}")
-    print(f"- get_relevant_context (ID): {len(results2) if results2 else 0}")
-    print(f"- SQLite direto: {len(sql_results)}")
-    print(f"- ChromaDB direto: {len(chroma_results['ids'][0]) if chroma_results and chroma_results['ids'] else 0}")
+        if isinstance(chroma_results, Exception):
+            print(f"ChromaDB deu pau: {chroma_results}")
+            chroma_results = None
+        if isinstance(sql_results, Exception):
+            print(f"SQLite deu pau: {sql_results}")
+            sql_results = []
+        results1, results2 = ([], []) if isinstance(contexts, Exception) else contexts
     
-    # Mostra conteúdo
-    if results1:
-        print(f"\nPrimeiro resultado: {results1[0]}")
-    if sql_results:
-        print(f"\nSQLite encontrou: {sql_results[0]}")
+        # Debug
+        print(f"\nResultados:")
+        print(f"- get_relevant_context (texto completo): {len(results1) if results1 else 0}")
+        print(f"- get_relevant_context (ID): {len(results2) if results2 else 0}")
+        print(f"- SQLite direto: {len(sql_results)}")
+        print(f"- ChromaDB direto: {len(chroma_results['ids'][0]) if chroma_results and chroma_results['ids'] else 0}")
     
-    # Verifica se achou em pelo menos um
-    found_in_context = any(unique_id in str(r) for r in (results1 + results2))
-    found_in_sql = any(unique_id in str(r) for r in sql_results)
-    found_in_chroma = chroma_results and len(chroma_results['ids'][0]) > 0
+        # Mostra conteúdo
+        if results1:
+            print(f"\nPrimeiro resultado: {results1[0]}")
+        if sql_results:
+            print(f"\nSQLite encontrou: {sql_results[0]}")
     
-    if found_in_context and found_in_sql and found_in_chroma:
-        print("\n✅ SUCESSO TOTAL! Encontrado em todos os lugares!")
-    else:
-        print(f"\n❌ FODEU! found_in_context={found_in_context}, found_in_sql={found_in_sql}, found_in_chroma={found_in_chroma}")
+        # Verifica se achou em todos os lugares
+        # Busca de substring no C: um único `in` sobre os conteúdos juntados, sem str() de cada registro
+        found_in_context = unique_id in "\x1f".join(r['content'] or '' for r in (*results1, *results2))
+        found_in_sql = unique_id in "\x1f".join(row['content'] or '' for row in sql_results)
+        found_in_chroma = bool(chroma_results and len(chroma_results['ids'][0]) > 0)
         
-        # Se não achou, vamo ver onde tá o problema
-        if not found_in_sql:
-            print("🔥 PROBLEMA: Nem no SQLite salvou!")
-        elif not found_in_chroma:
-            print("🔥 PROBLEMA: SQLite tem, mas ChromaDB não!")
-        elif not found_in_context:
-            print("🔥 PROBLEMA: Tá salvo, mas get_relevant_context não acha!")
+        assert found_in_context and found_in_sql and found_in_chroma, (
+            f"found_in_context={found_in_context}, found_in_sql={found_in_sql}, "
+            f"found_in_chroma={found_in_chroma}"
+        )
+    finally:
+        # Não deixa as N_MESSAGES mensagens do teste no banco (nem no de produção, rodando como script)
+        (memory2 or memory).delete_user_messages(test_user)
 
 if __name__ == "__main__":
     asyncio.run(test_real_persistence())
\ No newline at end of file
@@ -1,27 +1,26 @@
 # python -m tests.teste_database
 import sys
-import os
 import sqlite3
 import logging
-from pathlib import Path
-
-# Adiciona o diretório src ao PATH para importar os módulos
-src_path = Path(__file__).parent.parent / 'src'
-sys.path.append(str(src_path))
+import time
 
 from src.bot.database.db_init import Database
 
 def test_database_migration():
     """Testa se a migração do banco de dados foi bem sucedida"""
+    test_db = None
     try:
-        # Usa um banco de teste
-        test_db = Database('test_database.db')
+        # Banco de teste só em memória: sem arquivo, fsync nem limpeza. Funciona
+        # porque o Database reaproveita a conexão da thread (o schema criado no
+        # initialize_db continua visível no connect abaixo)
+        inicio = time.perf_counter()
+        test_db = Database(':memory:')
         
         # Verifica se as novas colunas existem
         with test_db.connect() as conn:
             cursor = conn.cursor()
-            cursor.execute("PRAGMA table_info(messages)")
-            columns = {col['name'] for col in cursor.fetchall()}
+            cursor.execute("SELECT name FROM pragma_table_info('messages')")
+            columns = {row[0] for row in cursor}
             
             # Verifica cada coluna
             expected_columns = {
@@ -31,6 +30,7 @@ def test_database_migration():
             }
             
             missing_columns = expected_columns - columns
+            print(f"⏱️ Criação do banco + verificação das colunas: {(time.perf_counter() - inicio) * 1000:.1f} ms")
             if missing_columns:
                 print(f"❌ Erro: Colunas faltando: {missing_columns}")
                 return False
@@ -42,10 +42,9 @@ def test_database_migration():
         print(f"❌ Erro durante o teste: {e}")
         return False
     finally:
-        # Limpa o banco de teste
-        if os.path.exists('test_database.db'):
-            os.remove('test_database.db')
-            print("🧹 Banco de teste removido")
+        # Fechar a conexão descarta o banco em memória
+        if test_db:
+            test_db.close()
 
 if __name__ == "__main__":
     # Configura logging básico